@@ -3,7 +3,7 @@ Flask Backend API for Meeting Transcriber
 Handles user authentication, recording sessions, and file management
 """
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, g, request, jsonify, send_file
 from flask_cors import CORS
 from flask_jwt_extended import (
     JWTManager,
@@ -12,16 +12,22 @@ from flask_jwt_extended import (
     get_jwt_identity,
 )
 from werkzeug.security import generate_password_hash, check_password_hash
+import json
 import os
+import queue
 import sys
+import time
 from datetime import datetime, timedelta
 
 # Add parent directory to path to import modules from iot-meeting-minutes
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "iot-meeting-minutes"))
 
-from database import db, User, Recording
+from database import db, User, Recording, ensure_columns
 from recording_service import RecordingService
 from pdf_generator import PDFGenerator
+from transcript_sidecar import load_sidecar
+from metrics import PipelineMetrics
+from tracing import traced
 
 # -----------------------------------------------------------------------------
 # Flask & Config
@@ -36,6 +42,8 @@ app.config["JWT_SECRET_KEY"] = os.environ.get(
     "JWT_SECRET_KEY", "jwt-secret-key-change-in-production"
 )
 app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=24)
+# Tokens come from headers only; the live transcript stream route also takes ?jwt=
+app.config["JWT_TOKEN_LOCATION"] = ["headers"]
 
 # Uploaded files
 app.config["UPLOAD_FOLDER"] = os.path.join(os.path.dirname(__file__), "uploads")
@@ -65,10 +73,21 @@ CORS(
 # Create tables on startup
 with app.app_context():
     db.create_all()
+    ensure_columns()
 
 # Services
-recording_service = RecordingService()
 pdf_generator = PDFGenerator()
+recording_service = RecordingService(
+    database_uri=app.config["SQLALCHEMY_DATABASE_URI"],
+    pdf_generator=pdf_generator,
+)
+
+pipeline_metrics = PipelineMetrics(recording_service)
+recording_service.start_memory_watchdog(app)
+
+# Resume queued decodes and salvage transcripts of sessions interrupted by a crash or restart
+with app.app_context():
+    recording_service.recover_interrupted_sessions(app)
 
 # Ensure upload folder exists
 os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
@@ -90,6 +109,15 @@ def get_current_user_id():
         return None
 
 
+def get_current_admin():
+    """Return the current user if they are an admin, else None"""
+    user_id = get_current_user_id()
+    if not user_id:
+        return None
+    user = User.query.get(user_id)
+    return user if user and user.is_admin else None
+
+
 # -----------------------------------------------------------------------------
 # JWT Error Handlers + Debug Logging
 # -----------------------------------------------------------------------------
@@ -141,6 +169,23 @@ def log_request_info():
             print("Authorization header: NOT FOUND")
 
 
+@app.before_request
+def start_request_timer():
+    g.request_started = time.monotonic()
+
+
+@app.after_request
+def record_request_metrics(response):
+    """Per-route latency for /api/metrics (labelled by URL rule, not raw path)"""
+    started = g.get("request_started")
+    if started is not None and request.path.startswith("/api/"):
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        pipeline_metrics.observe_request(
+            request.method, route, response.status_code, time.monotonic() - started
+        )
+    return response
+
+
 # -----------------------------------------------------------------------------
 # Health Check
 # -----------------------------------------------------------------------------
@@ -149,6 +194,29 @@ def health_check():
     return jsonify({"status": "healthy", "message": "API is running"}), 200
 
 
+@app.route("/api/metrics", methods=["GET"])
+def metrics():
+    """
+    Prometheus metrics (text exposition format) for local scraping.
+    Unauthenticated like /api/health: counts and timings only, no user data.
+    """
+    return Response(
+        pipeline_metrics.render(),
+        mimetype="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@app.route("/api/pool/status", methods=["GET"])
+@jwt_required()
+def pool_status():
+    """Recognizer pool occupancy (running/queued decode jobs)"""
+    try:
+        return jsonify({"pool": recording_service.get_pool_status()}), 200
+    except Exception as e:
+        print("[POOL STATUS ERROR]", e)
+        return jsonify({"error": str(e)}), 500
+
+
 # Simple endpoint to test token manually if needed
 @app.route("/api/debug/token", methods=["GET"])
 @jwt_required()
@@ -271,6 +339,7 @@ def get_current_user():
                     "id": user.id,
                     "username": user.username,
                     "email": user.email,
+                    "is_admin": bool(user.is_admin),
                     "created_at": user.created_at.isoformat(),
                 }
             ),
@@ -316,6 +385,7 @@ def start_recording():
 
 @app.route("/api/recordings/<session_id>/upload", methods=["POST", "OPTIONS"])
 @jwt_required(optional=True)  # Make JWT optional for OPTIONS
+@traced("http.upload")
 def upload_audio(session_id):
     """Receive audio file from laptop and process it"""
     # Handle OPTIONS request for CORS
@@ -363,17 +433,65 @@ def upload_audio(session_id):
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/api/recordings/<session_id>/chunk", methods=["POST", "OPTIONS"])
+@jwt_required(optional=True)  # Make JWT optional for OPTIONS
+def upload_audio_chunk(session_id):
+    """
+    Receive one timesliced MediaRecorder chunk while recording is running.
+    Body is the raw chunk; ?seq= is its 0-based position in the stream.
+    """
+    if request.method == "OPTIONS":
+        return jsonify({"status": "ok"}), 200
+
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"error": "Invalid token"}), 401
+
+        sequence = request.args.get("seq", type=int)
+        if sequence is None:
+            return jsonify({"error": "Missing chunk sequence number"}), 400
+
+        data = request.get_data(cache=False)
+        if not data:
+            return jsonify({"error": "Empty chunk"}), 400
+
+        try:
+            status = recording_service.append_audio_chunk(session_id, user_id, data, sequence)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 409
+        except RuntimeError as e:
+            # Live decoding unavailable - client falls back to full upload
+            print("[UPLOAD CHUNK UNAVAILABLE]", e)
+            return jsonify({"error": str(e)}), 503
+
+        if status is None:
+            return jsonify({"error": "Session not found or unauthorized"}), 404
+
+        return jsonify({"session_id": session_id, "stream": status}), 200
+
+    except Exception as e:
+        import traceback
+        print("[UPLOAD CHUNK ERROR]", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route("/api/recordings/<session_id>/stop", methods=["POST"])
 @jwt_required()
+@traced("http.stop")
 def stop_recording(session_id):
-    """Stop recording and process transcription + summary + PDFs"""
+    """
+    Stop recording. Transcript, summary and PDFs are produced in the
+    background; poll the returned status_url for progress.
+    """
     try:
         user_id = get_current_user_id()
         if not user_id:
             return jsonify({"error": "Invalid token"}), 401
 
         try:
-            result = recording_service.stop_session(session_id, user_id)
+            status = recording_service.stop_session(session_id, user_id, app)
         except Exception as e:
             import traceback
 
@@ -381,58 +499,26 @@ def stop_recording(session_id):
             traceback.print_exc()
             return jsonify({"error": f"Error stopping recording: {e}"}), 500
 
-        if not result:
+        if not status:
             return jsonify(
                 {
                     "error": "Session not found, already stopped, or unauthorized",
                 }
             ), 404
 
-        transcript_pdf = None
-        summary_pdf = None
-
-        # Create transcript PDF if transcript file exists
-        if result.get("transcript_file") and os.path.exists(result["transcript_file"]):
-            try:
-                transcript_pdf = pdf_generator.create_transcript_pdf(
-                    result["transcript_file"], result["session_name"]
-                )
-            except Exception as e:
-                print("[TRANSCRIPT PDF ERROR]", e)
-
-        # Create summary PDF if summary file exists
-        if result.get("summary_file") and os.path.exists(result["summary_file"]):
-            try:
-                summary_pdf = pdf_generator.create_summary_pdf(
-                    result["summary_file"], result["session_name"]
-                )
-            except Exception as e:
-                print("[SUMMARY PDF ERROR]", e)
-
-        # Update DB with PDF paths
-        recording = Recording.query.filter_by(session_id=session_id).first()
-        if recording:
-            if transcript_pdf:
-                recording.transcript_pdf_path = transcript_pdf
-            if summary_pdf:
-                recording.summary_pdf_path = summary_pdf
-            db.session.commit()
-
         return (
             jsonify(
                 {
-                    "message": "Recording stopped and processed",
+                    "message": "Recording stopped, processing in background",
+                    "job": status,
+                    "status_url": f"/api/recordings/{session_id}/status",
                     "recording": {
-                        "id": recording.id if recording else None,
+                        "id": status["recording_id"],
                         "session_id": session_id,
-                        "transcript_pdf": transcript_pdf,
-                        "summary_pdf": summary_pdf,
-                        "has_transcript": result.get("transcript_file") is not None,
-                        "has_summary": result.get("summary_file") is not None,
                     },
                 }
             ),
-            200,
+            202,
         )
 
     except Exception as e:
@@ -443,19 +529,84 @@ def stop_recording(session_id):
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/api/recordings/<session_id>/status", methods=["GET"])
+@jwt_required()
+def get_recording_status(session_id):
+    """
+    Progress of a recording: decode percent / ETA while audio is being
+    transcribed, and the finalization pipeline's stages once stopped.
+    poll_after_seconds suggests when to ask again.
+    """
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"error": "Invalid token"}), 401
+
+        status = recording_service.get_finalization_status(
+            session_id, user_id
+        ) or recording_service.get_session_status(session_id, user_id)
+        if status:
+            return jsonify({"job": status}), 200
+
+        # Not tracked in memory (finished long ago, or lost in a restart)
+        recording = Recording.query.filter_by(
+            session_id=session_id, user_id=user_id
+        ).first()
+        if not recording:
+            return jsonify({"error": "Recording not found"}), 404
+
+        job_status = recording.status
+        error = None
+        if recording.status == "processing":
+            # Finalization was lost, e.g. the backend restarted mid-pipeline
+            job_status = "failed"
+            error = "Processing was interrupted"
+
+        return (
+            jsonify(
+                {
+                    "job": {
+                        "session_id": session_id,
+                        "recording_id": recording.id,
+                        "status": job_status,
+                        "stage": None,
+                        "stages": [],
+                        "error": error,
+                        "result": {
+                            "transcript_pdf": recording.transcript_pdf_path,
+                            "summary_pdf": recording.summary_pdf_path,
+                            "has_transcript": recording.transcript_file_path is not None,
+                            "has_summary": recording.summary_file_path is not None,
+                            "duration": recording.duration,
+                        },
+                        "progress": None,
+                        "poll_after_seconds": None,
+                    }
+                }
+            ),
+            200,
+        )
+
+    except Exception as e:
+        print("[RECORDING STATUS ERROR]", e)
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route("/api/recordings/<session_id>/transcript", methods=["GET"])
 @jwt_required()
 def get_transcript(session_id):
     """
     Get real-time transcript for an active session.
     This reads from RecordingService.active_sessions aggregator.
+    Pass ?since=<cursor> (from a previous response) to get only new segments.
     """
     try:
         user_id = get_current_user_id()
         if not user_id:
             return jsonify({"error": "Invalid token"}), 401
 
-        transcript = recording_service.get_transcript(session_id, user_id)
+        since = request.args.get("since", type=int)
+        transcript = recording_service.get_transcript(session_id, user_id, since=since)
         if transcript is None:
             return jsonify({"error": "Session not found or unauthorized"}), 404
 
@@ -466,6 +617,72 @@ def get_transcript(session_id):
         return jsonify({"error": str(e)}), 500
 
 
+def _sse(event, data):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.route("/api/recordings/<session_id>/events", methods=["GET"])
+@jwt_required(locations=["headers", "query_string"])
+def transcript_events(session_id):
+    """
+    Server-Sent Events stream of the live transcript.
+    Sends a snapshot on connect, then only new segments and partial text.
+    EventSource cannot send headers, so only this route accepts ?jwt=.
+    """
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"error": "Invalid token"}), 401
+
+        subscription = recording_service.subscribe_transcript(session_id, user_id)
+        if subscription is None:
+            return jsonify({"error": "Session not found or unauthorized"}), 404
+
+        aggregator, listener = subscription
+
+        def snapshot():
+            return _sse(
+                "snapshot",
+                {
+                    "segments": aggregator.get_segment_events(),
+                    "partial": aggregator.partial_text,
+                },
+            )
+
+        def generate():
+            try:
+                yield snapshot()
+                while True:
+                    try:
+                        item = listener.get(timeout=15)
+                    except queue.Empty:
+                        yield ": keepalive\n\n"
+                        continue
+
+                    if item is None:
+                        yield _sse("end", {})
+                        break
+
+                    event, data = item
+                    if event == "resync":
+                        yield snapshot()
+                    else:
+                        yield _sse(event, data)
+            finally:
+                aggregator.unsubscribe(listener)
+
+        return Response(
+            generate(),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    except Exception as e:
+        print("[TRANSCRIPT EVENTS ERROR]", e)
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route("/api/recordings", methods=["GET"])
 @jwt_required()
 def get_recordings():
@@ -521,6 +738,7 @@ def get_recording(recording_id):
             return jsonify({"error": "Recording not found"}), 404
 
         transcript_text = None
+        transcript_segments = None
         summary_text = None
 
         if recording.transcript_file_path and os.path.exists(
@@ -529,6 +747,11 @@ def get_recording(recording_id):
             with open(recording.transcript_file_path, "r", encoding="utf-8") as f:
                 transcript_text = f.read()
 
+            # Structured segments come from the sidecar (no word timings here)
+            sidecar = load_sidecar(recording.transcript_file_path)
+            if sidecar is not None:
+                transcript_segments = list(sidecar.segments(words=False))
+
         if recording.summary_file_path and os.path.exists(recording.summary_file_path):
             with open(recording.summary_file_path, "r", encoding="utf-8") as f:
                 summary_text = f.read()
@@ -544,6 +767,7 @@ def get_recording(recording_id):
                         "duration": recording.duration,
                         "status": recording.status,
                         "transcript": transcript_text,
+                        "segments": transcript_segments,
                         "summary": summary_text,
                         "transcript_pdf_path": recording.transcript_pdf_path,
                         "summary_pdf_path": recording.summary_pdf_path,
@@ -680,6 +904,122 @@ def delete_recording(recording_id):
         return jsonify({"error": str(e)}), 500
 
 
+# -----------------------------------------------------------------------------
+# Admin: on-demand profiling
+# -----------------------------------------------------------------------------
+@app.route("/api/admin/profiling", methods=["GET", "POST", "DELETE"])
+@jwt_required()
+def admin_profiling():
+    """
+    GET: pending profiling requests.
+    POST {"session_id": ...} profiles that (active) session's next decode job,
+    including its live stream decode if none has started yet;
+    POST {"next_jobs": N} profiles the next N decode jobs of any session.
+    DELETE cancels pending requests.
+    """
+    try:
+        if not get_current_admin():
+            return jsonify({"error": "Admin access required"}), 403
+
+        pending = recording_service.profile_requests
+
+        if request.method == "POST":
+            data = request.get_json() or {}
+            session_id = data.get("session_id")
+            next_jobs = data.get("next_jobs")
+
+            if session_id:
+                try:
+                    recording_service.request_profile(session_id)
+                except ValueError as e:
+                    return jsonify({"error": str(e)}), 409
+            elif next_jobs is not None:
+                try:
+                    pending.request_next(int(next_jobs))
+                except (TypeError, ValueError):
+                    return jsonify({"error": "next_jobs must be an integer"}), 400
+            else:
+                return jsonify({"error": "Provide session_id or next_jobs"}), 400
+        elif request.method == "DELETE":
+            pending.cancel()
+
+        return jsonify({"profiling": pending.get_status()}), 200
+
+    except Exception as e:
+        print("[ADMIN PROFILING ERROR]", e)
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/admin/recordings/<session_id>/profiles", methods=["GET"])
+@jwt_required()
+def admin_list_profiles(session_id):
+    """List cProfile dumps captured for a session"""
+    try:
+        if not get_current_admin():
+            return jsonify({"error": "Admin access required"}), 403
+
+        recording = Recording.query.filter_by(session_id=session_id).first()
+        if not recording:
+            return jsonify({"error": "Recording not found"}), 404
+
+        _, profiles = recording_service.get_profiles(recording)
+        return jsonify({"session_id": session_id, "profiles": profiles}), 200
+
+    except Exception as e:
+        print("[ADMIN LIST PROFILES ERROR]", e)
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/admin/recordings/<session_id>/profiles/<filename>", methods=["GET"])
+@jwt_required()
+def admin_download_profile(session_id, filename):
+    """Download a .prof dump (load with pstats/snakeviz) or its .prof.txt report"""
+    try:
+        if not get_current_admin():
+            return jsonify({"error": "Admin access required"}), 403
+
+        recording = Recording.query.filter_by(session_id=session_id).first()
+        if not recording:
+            return jsonify({"error": "Recording not found"}), 404
+
+        session_folder, profiles = recording_service.get_profiles(recording)
+        if filename not in {p["filename"] for p in profiles}:
+            return jsonify({"error": "Profile not found"}), 404
+
+        return send_file(
+            os.path.join(session_folder, filename),
+            as_attachment=True,
+            download_name=filename,
+        )
+
+    except Exception as e:
+        print("[ADMIN DOWNLOAD PROFILE ERROR]", e)
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/admin/memory", methods=["GET"])
+@jwt_required()
+def admin_memory():
+    """
+    Process RSS and estimated memory per active session.
+    ?growth=1 adds tracemalloc growth since the previous call (when enabled).
+    """
+    try:
+        if not get_current_admin():
+            return jsonify({"error": "Admin access required"}), 403
+
+        include_growth = request.args.get("growth") in ("1", "true")
+        report = recording_service.get_memory_report(include_growth)
+        if report is None:
+            return jsonify({"error": "Memory watchdog is disabled"}), 404
+
+        return jsonify({"memory": report}), 200
+
+    except Exception as e:
+        print("[ADMIN MEMORY ERROR]", e)
+        return jsonify({"error": str(e)}), 500
+
+
 # -----------------------------------------------------------------------------
 # Main
 # -----------------------------------------------------------------------------
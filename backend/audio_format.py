@@ -0,0 +1,247 @@
+"""
+Audio Format Utilities
+Probes uploaded audio headers and converts PCM WAV files in-process
+(downmix + polyphase resampling) so compatible uploads skip ffmpeg
+"""
+
+import io
+import subprocess
+import wave
+from math import gcd
+
+import numpy as np
+
+
+def is_wav_header(header):
+    """
+    Check the RIFF/WAVE magic at the start of a file
+
+    Args:
+        header: First bytes of the file (at least 12)
+
+    Returns:
+        bool: True if the bytes start a WAV file
+    """
+    return len(header) >= 12 and header[:4] == b'RIFF' and header[8:12] == b'WAVE'
+
+
+def probe_wav(source):
+    """
+    Read the format of an uncompressed PCM WAV file
+
+    Args:
+        source: Path, file object, or leading bytes of the file
+                (only the header needs to be present)
+
+    Returns:
+        dict: sample_rate, channels, sample_width and frames,
+              or None if the data is not PCM WAV
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    try:
+        with wave.open(source, 'rb') as wf:
+            return {
+                'sample_rate': wf.getframerate(),
+                'channels': wf.getnchannels(),
+                'sample_width': wf.getsampwidth(),
+                'frames': wf.getnframes()
+            }
+    except (wave.Error, EOFError):
+        return None
+
+
+class PolyphaseResampler:
+    """Streaming rational-ratio resampler (windowed-sinc polyphase FIR)"""
+
+    def __init__(self, in_rate, out_rate, taps_per_phase=24):
+        """
+        Initialize resampler
+
+        Args:
+            in_rate: Input sample rate
+            out_rate: Output sample rate
+            taps_per_phase: FIR length per polyphase branch (quality vs. speed)
+        """
+        g = gcd(in_rate, out_rate)
+        self.up = out_rate // g
+        self.down = in_rate // g
+
+        # Low-pass at the lower of the two Nyquist rates (in upsampled domain)
+        length = taps_per_phase * self.up
+        cutoff = 1.0 / max(self.up, self.down)
+        t = np.arange(length) - (length - 1) / 2.0
+        h = cutoff * np.sinc(cutoff * t) * np.kaiser(length, 8.0)
+        h *= self.up / h.sum()
+
+        # Row p holds the taps used for output phase p
+        self.taps = taps_per_phase
+        self.phases = np.zeros((self.up, taps_per_phase), dtype=np.float32)
+        for p in range(self.up):
+            branch = h[p::self.up]
+            self.phases[p, :len(branch)] = branch
+
+        # Input history, starting with zeros before the first sample
+        self._buffer = np.zeros(self.taps - 1, dtype=np.float32)
+        self._buffer_start = -(self.taps - 1)   # global index of _buffer[0]
+        self._next_output = 0
+        self._total_input = 0
+
+    def process(self, samples):
+        """
+        Resample the next block of a mono signal
+
+        Args:
+            samples: 1-D array of input samples (any numeric dtype)
+
+        Returns:
+            numpy.ndarray: float32 output samples available so far
+        """
+        samples = np.asarray(samples, dtype=np.float32)
+        self._buffer = np.concatenate([self._buffer, samples])
+        self._total_input += len(samples)
+        return self._emit(self._total_input)
+
+    def flush(self):
+        """
+        Produce the remaining output once the input has ended
+
+        Returns:
+            numpy.ndarray: Final float32 output samples
+        """
+        expected = -(-self._total_input * self.up // self.down)  # ceil
+        already = self._next_output
+
+        self._buffer = np.concatenate([self._buffer, np.zeros(self.taps, dtype=np.float32)])
+        out = self._emit(self._total_input + self.taps)
+        return out[:max(0, expected - already)]
+
+    def _emit(self, available):
+        """Compute every output whose newest input sample is available"""
+        last = (available * self.up - 1) // self.down
+        if last < self._next_output:
+            return np.zeros(0, dtype=np.float32)
+
+        n = np.arange(self._next_output, last + 1, dtype=np.int64)
+        positions = n * self.down
+        newest = positions // self.up
+        phase = positions % self.up
+
+        # For each output, the taps_per_phase most recent inputs (newest first)
+        index = newest[:, None] - np.arange(self.taps)[None, :] - self._buffer_start
+        out = np.einsum('ij,ij->i', self._buffer[index], self.phases[phase])
+
+        self._next_output = last + 1
+
+        # Drop history no later output can reach
+        keep_from = (self._next_output * self.down) // self.up - (self.taps - 1)
+        drop = keep_from - self._buffer_start
+        if drop > 0:
+            self._buffer = self._buffer[drop:]
+            self._buffer_start += drop
+
+        return out.astype(np.float32)
+
+
+def convert_pcm_wav(input_path, output_path, sample_rate, channels=1, block_frames=65536):
+    """
+    Downmix and resample a 16-bit PCM WAV without starting a subprocess
+
+    Args:
+        input_path: Source 16-bit PCM WAV
+        output_path: Destination WAV
+        sample_rate: Target sample rate
+        channels: Target channel count (1 = mono downmix)
+        block_frames: Frames processed per block
+    """
+    with wave.open(input_path, 'rb') as src:
+        if src.getsampwidth() != 2:
+            raise ValueError("Only 16-bit PCM WAV can be converted in-process")
+
+        in_channels = src.getnchannels()
+        in_rate = src.getframerate()
+        if channels not in (1, in_channels):
+            raise ValueError(f"Cannot map {in_channels} channels to {channels}")
+
+        resamplers = None
+        if in_rate != sample_rate:
+            resamplers = [PolyphaseResampler(in_rate, sample_rate) for _ in range(channels)]
+
+        with wave.open(output_path, 'wb') as dst:
+            dst.setnchannels(channels)
+            dst.setsampwidth(2)
+            dst.setframerate(sample_rate)
+
+            def write(columns):
+                block = np.stack(columns, axis=1) if len(columns) > 1 else columns[0]
+                block = np.clip(np.round(block), -32768, 32767).astype('<i2')
+                dst.writeframes(block.tobytes())
+
+            while True:
+                data = src.readframes(block_frames)
+                if not data:
+                    break
+
+                samples = np.frombuffer(data, dtype='<i2').reshape(-1, in_channels)
+                if channels == 1 and in_channels > 1:
+                    samples = samples.astype(np.float32).mean(axis=1, keepdims=True)
+
+                columns = [samples[:, c] for c in range(channels)]
+                if resamplers:
+                    columns = [r.process(col) for r, col in zip(resamplers, columns)]
+                write([col.astype(np.float32) for col in columns])
+
+            if resamplers:
+                write([r.flush() for r in resamplers])
+
+
+def convert_to_wav(input_path, output_path, sample_rate=16000):
+    """
+    Convert any uploaded audio to mono 16-bit PCM WAV for Vosk
+
+    16-bit PCM WAV input is resampled in-process; anything else goes
+    through ffmpeg, with pydub as a last resort.
+
+    Args:
+        input_path: Source audio file
+        output_path: Destination WAV
+        sample_rate: Target sample rate
+    """
+    # 16-bit PCM WAV only needs downmixing/resampling, which numpy does in-process
+    wav_format = probe_wav(input_path) if input_path.endswith('.wav') else None
+    if wav_format and wav_format['sample_width'] == 2:
+        try:
+            convert_pcm_wav(input_path, output_path, sample_rate, channels=1)
+            print(f"[AudioFormat] Resampled {input_path} "
+                  f"({wav_format['sample_rate']} Hz, {wav_format['channels']} ch) to {output_path}")
+            return
+        except Exception as e:
+            print(f"[AudioFormat] In-process resampling failed: {e}")
+
+    try:
+        # Use ffmpeg to convert
+        cmd = [
+            'ffmpeg', '-i', input_path,
+            '-ar', str(sample_rate),  # Recognizer sample rate (16kHz)
+            '-ac', '1',       # Mono
+            '-f', 'wav',      # WAV format
+            '-y',             # Overwrite
+            output_path
+        ]
+
+        subprocess.run(cmd, check=True, capture_output=True)
+        print(f"[AudioFormat] Converted {input_path} to {output_path}")
+
+    except Exception as e:
+        print(f"[AudioFormat] FFmpeg conversion failed: {e}")
+        # Fallback: try with pydub
+        try:
+            from pydub import AudioSegment
+            audio = AudioSegment.from_file(input_path)
+            audio = audio.set_frame_rate(sample_rate).set_channels(1)
+            audio.export(output_path, format='wav')
+            print(f"[AudioFormat] Converted using pydub")
+        except Exception as e2:
+            print(f"[AudioFormat] Pydub conversion also failed: {e2}")
+            raise
@@ -0,0 +1,21 @@
+"""
+pytest configuration for the backend tests
+"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, '..', 'iot-meeting-minutes'))
+
+# Manual scripts (need a microphone, a running LLM or write to the cwd on
+# import); run them directly with python instead
+collect_ignore = [
+    'test_jwt.py',
+    'test_mic.py',
+    'test_ollama_summary.py',
+    'test_summarizer.py',
+    'test_transcript.py',
+    'test_vosk.py',
+]
@@ -3,6 +3,8 @@ Database models and initialization
 """
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError
 from datetime import datetime
 import os
 from timezone_utils import now_ist
@@ -18,6 +20,7 @@ class User(db.Model):
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
+    is_admin = db.Column(db.Boolean, default=False)  # may toggle profiling (set directly in the DB)
     created_at = db.Column(db.DateTime, default=now_ist)
     
     # Relationship
@@ -47,14 +50,95 @@ class Recording(db.Model):
     summary_pdf_path = db.Column(db.String(500))
     metadata_file_path = db.Column(db.String(500))
     
+    # Instrumentation (see instrumentation.Timings)
+    stage_timings = db.Column(db.Text)        # JSON: stage name -> seconds
+    real_time_factor = db.Column(db.Float)    # decode seconds per audio second
+    
+    # Relationship
+    jobs = db.relationship('TranscriptionJob', backref='recording', lazy=True, cascade='all, delete-orphan')
+    
     def __repr__(self):
         return f'<Recording {self.session_id}>'
 
 
+class TranscriptionJob(db.Model):
+    """Queued decode of an uploaded recording (claimed by transcription_worker.py)"""
+    __tablename__ = 'transcription_jobs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    recording_id = db.Column(db.Integer, db.ForeignKey('recordings.id'), nullable=False)
+    session_id = db.Column(db.String(100), nullable=False, index=True)
+    status = db.Column(db.String(20), default='queued', index=True)  # queued, running, completed, failed
+    
+    # Input (any format) and the 16 kHz mono WAV the worker decodes
+    audio_path = db.Column(db.String(500), nullable=False)
+    wav_path = db.Column(db.String(500), nullable=False)
+    result_path = db.Column(db.String(500))
+    
+    # Claim / retry bookkeeping (times in epoch seconds)
+    attempts = db.Column(db.Integer, default=0)
+    max_attempts = db.Column(db.Integer, default=3)
+    worker_id = db.Column(db.String(100))
+    claimed_at = db.Column(db.Float)
+    heartbeat_at = db.Column(db.Float)
+    finished_at = db.Column(db.Float)
+    progress = db.Column(db.Text)  # JSON DecodeProgress snapshot, refreshed with the heartbeat
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=now_ist)
+    
+    def __repr__(self):
+        return f'<TranscriptionJob {self.id} {self.status}>'
+
+
+def ensure_table_columns(engine, table):
+    """
+    Add columns of one model table that an existing database lacks
+    
+    Works on any engine, so processes without an application context
+    (transcription workers) can migrate the tables they use.
+    
+    Args:
+        engine: SQLAlchemy engine
+        table: Table object (e.g. TranscriptionJob.__table__)
+    """
+    inspector = inspect(engine)
+    if table.name not in inspector.get_table_names():
+        return
+    
+    existing = {column['name'] for column in inspector.get_columns(table.name)}
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        
+        column_type = column.type.compile(dialect=engine.dialect)
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+        except OperationalError as e:
+            # Another process (web app or worker) added it first
+            if 'duplicate column' not in str(e).lower():
+                raise
+            continue
+        print(f"[Database] Added column {table.name}.{column.name}")
+
+
+def ensure_columns():
+    """
+    Add model columns missing from existing tables
+    
+    create_all() only creates missing tables, so databases from older
+    versions would lack columns added since. New columns must be nullable.
+    Call inside an application context.
+    """
+    for table in db.metadata.sorted_tables:
+        ensure_table_columns(db.engine, table)
+
+
 def init_db(app):
     """Initialize database with Flask app"""
     db.init_app(app)
     with app.app_context():
         db.create_all()
+        ensure_columns()
     return db
 
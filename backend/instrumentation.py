@@ -0,0 +1,193 @@
+"""
+Instrumentation
+Lightweight per-session stage timing: context-manager spans measured with
+a monotonic clock and summed per stage name
+"""
+
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+from tracing import bind, trace_span
+
+
+# Timings that module-level span() records into (set with Timings.activate)
+_active_timings = contextvars.ContextVar('active_timings', default=None)
+
+# Process-wide observers of every span and error (e.g. the metrics registry)
+_listeners = []
+
+
+def add_listener(listener):
+    """
+    Register an observer of spans and errors
+
+    Args:
+        listener: Callable taking (kind, name, value) - ('span', stage,
+                  seconds) for every recorded span, ('error', component, 1)
+                  for every count_error() call, ('value', name, value) for
+                  every observe() call
+    """
+    _listeners.append(listener)
+
+
+def _notify(kind, name, value):
+    """Pass an observation to every listener; instrumentation never raises"""
+    for listener in _listeners:
+        try:
+            listener(kind, name, value)
+        except Exception as e:
+            print(f"[Instrumentation] Listener failed: {e}")
+
+
+def count_error(component):
+    """
+    Report a failure in a pipeline component
+
+    Args:
+        component: Component name (e.g. 'summary', 'pdf', 'transcription')
+    """
+    _notify('error', component, 1)
+
+
+def observe(name, value):
+    """
+    Report a measurement that is not a duration (e.g. a real-time factor)
+
+    Args:
+        name: Measurement name
+        value: Number
+    """
+    _notify('value', name, value)
+
+
+class Timings:
+    """Total seconds spent per named stage of one session"""
+
+    def __init__(self):
+        self._stages = {}   # name -> [seconds, count]
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name):
+        """
+        Time a block (also recorded as a span of the current trace)
+
+        Args:
+            name: Stage name (e.g. 'audio.convert'); repeated spans add up
+        """
+        start = time.monotonic()
+        try:
+            with trace_span(name):
+                yield
+        finally:
+            self.add(name, time.monotonic() - start)
+
+    def add(self, name, seconds, count=1):
+        """
+        Record time measured elsewhere
+
+        Args:
+            name: Stage name
+            seconds: Duration to add
+            count: Number of spans the duration covers
+        """
+        with self._lock:
+            stage = self._stages.setdefault(name, [0.0, 0])
+            stage[0] += seconds
+            stage[1] += count
+        _notify('span', name, seconds)
+
+    def merge(self, stages):
+        """
+        Add the stage totals of another Timings (e.g. from a worker process)
+
+        Merged totals are reported to listeners like local spans, since
+        the worker process has no listeners of its own.
+
+        Args:
+            stages: Dictionary returned by as_dict()
+        """
+        for name, seconds in (stages or {}).items():
+            self.add(name, seconds)
+
+    def as_dict(self):
+        """
+        Get stage totals
+
+        Returns:
+            dict: stage name -> seconds
+        """
+        with self._lock:
+            return {name: round(seconds, 4) for name, (seconds, _) in self._stages.items()}
+
+    def counts(self):
+        """
+        Get how many spans each stage total is made of
+
+        Returns:
+            dict: stage name -> count
+        """
+        with self._lock:
+            return {name: count for name, (_, count) in self._stages.items()}
+
+    @contextmanager
+    def activate(self):
+        """Make span() calls in this thread/context record into these timings"""
+        token = _active_timings.set(self)
+        try:
+            yield self
+        finally:
+            _active_timings.reset(token)
+
+    def wrap(self, fn):
+        """
+        Bind a function to these timings (for work handed to another thread)
+
+        The caller's trace context is carried along as well.
+
+        Args:
+            fn: Callable to run with these timings active
+
+        Returns:
+            callable: Wrapped function
+        """
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self.activate():
+                return fn(*args, **kwargs)
+        return bind(wrapper)
+
+
+def current_timings():
+    """
+    Get the timings active in this context
+
+    Returns:
+        Timings: Active timings, or None
+    """
+    return _active_timings.get()
+
+
+@contextmanager
+def span(name):
+    """
+    Time a block into the active Timings
+
+    Library code (summarizer, PDF rendering, conversion) calls this without
+    knowing which session it works for. Without active timings the block
+    is only traced (a no-op outside a trace).
+
+    Args:
+        name: Stage name
+    """
+    timings = _active_timings.get()
+    if timings is None:
+        with trace_span(name):
+            yield
+        return
+
+    with timings.span(name):
+        yield
@@ -0,0 +1,257 @@
+"""
+Transcription Job Queue
+Durable queue of decode jobs stored in the application's SQLite database,
+shared by the web process (producer) and transcription workers (consumers)
+"""
+
+import json
+import time
+
+from sqlalchemy import create_engine, text
+
+from database import TranscriptionJob, ensure_table_columns
+from timezone_utils import now_ist
+
+
+class JobQueue:
+    def __init__(self, database_uri, stale_seconds=60, max_attempts=3):
+        """
+        Initialize job queue
+
+        Uses its own engine rather than the Flask-SQLAlchemy session so it
+        works from background threads and from worker processes that have
+        no application context.
+
+        Args:
+            database_uri: SQLAlchemy URI of the application database
+            stale_seconds: A running job without a heartbeat for this long
+                           is assumed to belong to a dead worker
+            max_attempts: Claims allowed per job before it is marked failed
+        """
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max_attempts
+
+        # Web process and workers write concurrently - wait for locks
+        self.engine = create_engine(database_uri, connect_args={'timeout': 30})
+        TranscriptionJob.__table__.create(self.engine, checkfirst=True)
+        # Workers never run the web app's migrations, so migrate the queue table here
+        ensure_table_columns(self.engine, TranscriptionJob.__table__)
+
+    def enqueue(self, recording_id, session_id, audio_path, wav_path):
+        """
+        Add a decode job
+
+        Args:
+            recording_id: Recording row the job belongs to
+            session_id: Session identifier
+            audio_path: Uploaded audio (converted by the worker if needed)
+            wav_path: WAV path the worker decodes / writes
+
+        Returns:
+            int: Job id
+        """
+        with self.engine.begin() as conn:
+            result = conn.execute(text(
+                "INSERT INTO transcription_jobs "
+                "(recording_id, session_id, status, audio_path, wav_path, attempts, max_attempts, created_at) "
+                "VALUES (:recording_id, :session_id, 'queued', :audio_path, :wav_path, 0, :max_attempts, :created_at)"
+            ), {
+                'recording_id': recording_id,
+                'session_id': session_id,
+                'audio_path': audio_path,
+                'wav_path': wav_path,
+                'max_attempts': self.max_attempts,
+                'created_at': now_ist().strftime('%Y-%m-%d %H:%M:%S.%f')
+            })
+            return result.lastrowid
+
+    def claim(self, worker_id):
+        """
+        Atomically take the oldest runnable job
+
+        Queued jobs and running jobs whose worker stopped heartbeating are
+        both runnable. The single UPDATE ... WHERE id = (SELECT ...) runs
+        under SQLite's write lock, so two workers can never claim the same
+        job.
+
+        Args:
+            worker_id: Unique id of the claiming worker
+
+        Returns:
+            dict: Claimed job row, or None if nothing is runnable
+        """
+        now = time.time()
+        stale = now - self.stale_seconds
+
+        with self.engine.begin() as conn:
+            # Abandoned jobs that used up their attempts are not retried
+            conn.execute(text(
+                "UPDATE transcription_jobs "
+                "SET status = 'failed', finished_at = :now, "
+                "    error = COALESCE(error, 'Worker stopped responding') "
+                "WHERE status = 'running' AND heartbeat_at < :stale AND attempts >= max_attempts"
+            ), {'now': now, 'stale': stale})
+
+            claimed = conn.execute(text(
+                "UPDATE transcription_jobs "
+                "SET status = 'running', worker_id = :worker_id, attempts = attempts + 1, "
+                "    claimed_at = :now, heartbeat_at = :now "
+                "WHERE id = ("
+                "    SELECT id FROM transcription_jobs "
+                "    WHERE status = 'queued' "
+                "       OR (status = 'running' AND heartbeat_at < :stale) "
+                "    ORDER BY id LIMIT 1"
+                ")"
+            ), {'worker_id': worker_id, 'now': now, 'stale': stale})
+
+            if claimed.rowcount == 0:
+                return None
+
+            row = conn.execute(text(
+                "SELECT * FROM transcription_jobs "
+                "WHERE worker_id = :worker_id AND status = 'running' AND claimed_at = :now"
+            ), {'worker_id': worker_id, 'now': now}).mappings().first()
+
+        return dict(row) if row else None
+
+    def heartbeat(self, job_id, worker_id, progress=None):
+        """
+        Record that a worker is still processing a job
+
+        Args:
+            job_id: Job being processed
+            worker_id: Worker holding the claim
+            progress: Optional DecodeProgress snapshot to publish
+
+        Returns:
+            bool: False if the job was reclaimed by another worker
+        """
+        with self.engine.begin() as conn:
+            result = conn.execute(text(
+                "UPDATE transcription_jobs SET heartbeat_at = :now, progress = COALESCE(:progress, progress) "
+                "WHERE id = :id AND worker_id = :worker_id AND status = 'running'"
+            ), {
+                'now': time.time(),
+                'progress': json.dumps(progress) if progress is not None else None,
+                'id': job_id,
+                'worker_id': worker_id
+            })
+        return result.rowcount == 1
+
+    def complete(self, job_id, worker_id, result_path, progress=None):
+        """
+        Mark a job finished and point it at its results
+
+        Returns:
+            bool: False if the job was reclaimed by another worker
+        """
+        with self.engine.begin() as conn:
+            result = conn.execute(text(
+                "UPDATE transcription_jobs "
+                "SET status = 'completed', result_path = :result_path, finished_at = :now, error = NULL, "
+                "    progress = COALESCE(:progress, progress) "
+                "WHERE id = :id AND worker_id = :worker_id AND status = 'running'"
+            ), {
+                'result_path': result_path,
+                'now': time.time(),
+                'progress': json.dumps(progress) if progress is not None else None,
+                'id': job_id,
+                'worker_id': worker_id
+            })
+        return result.rowcount == 1
+
+    def fail(self, job_id, worker_id, error):
+        """
+        Record a failed attempt; the job is requeued until max_attempts
+
+        Returns:
+            str: New job status ('queued' or 'failed'), or None if the job
+                 was reclaimed by another worker
+        """
+        with self.engine.begin() as conn:
+            result = conn.execute(text(
+                "UPDATE transcription_jobs "
+                "SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END, "
+                "    worker_id = NULL, error = :error, "
+                "    finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE :now END "
+                "WHERE id = :id AND worker_id = :worker_id AND status = 'running'"
+            ), {'error': str(error)[:2000], 'now': time.time(), 'id': job_id, 'worker_id': worker_id})
+            if result.rowcount == 0:
+                return None
+
+            return conn.execute(text(
+                "SELECT status FROM transcription_jobs WHERE id = :id"
+            ), {'id': job_id}).scalar()
+
+    def cancel(self, job_id, error):
+        """
+        Give up on a job that has not finished
+
+        A worker still decoding it has its next heartbeat rejected and stops.
+
+        Returns:
+            bool: False if the job had already finished
+        """
+        with self.engine.begin() as conn:
+            result = conn.execute(text(
+                "UPDATE transcription_jobs SET status = 'failed', error = :error, finished_at = :now "
+                "WHERE id = :id AND status IN ('queued', 'running')"
+            ), {'error': str(error)[:2000], 'now': time.time(), 'id': job_id})
+        return result.rowcount == 1
+
+    def get(self, job_id):
+        """
+        Get a job row
+
+        Returns:
+            dict: Job row, or None if it does not exist
+        """
+        with self.engine.connect() as conn:
+            row = conn.execute(text(
+                "SELECT * FROM transcription_jobs WHERE id = :id"
+            ), {'id': job_id}).mappings().first()
+        return dict(row) if row else None
+
+    def latest_for_session(self, session_id):
+        """
+        Get the most recent job of a session
+
+        Returns:
+            dict: Job row, or None if the session never queued one
+        """
+        with self.engine.connect() as conn:
+            row = conn.execute(text(
+                "SELECT * FROM transcription_jobs WHERE session_id = :session_id "
+                "ORDER BY id DESC LIMIT 1"
+            ), {'session_id': session_id}).mappings().first()
+        return dict(row) if row else None
+
+    def update_recording(self, recording_id, **fields):
+        """
+        Write result paths back to a Recording row
+
+        Args:
+            recording_id: Recording row id
+            **fields: Column values (e.g. transcript_file_path=...)
+        """
+        if not fields:
+            return
+
+        assignments = ', '.join(f"{name} = :{name}" for name in fields)
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                f"UPDATE recordings SET {assignments} WHERE id = :recording_id"
+            ), dict(fields, recording_id=recording_id))
+
+    def get_status(self):
+        """
+        Get job counts by status
+
+        Returns:
+            dict: status -> count
+        """
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT status, COUNT(*) FROM transcription_jobs GROUP BY status"
+            )).all()
+        return {status: count for status, count in rows}
@@ -0,0 +1,312 @@
+"""
+Memory Watchdog
+Per-session memory estimates, optional tracemalloc growth reports, and a
+background thread that alerts on RSS growth and finalizes sessions left
+idle past a TTL
+"""
+
+import io
+import sys
+import threading
+import tracemalloc
+import types
+from array import array
+from collections.abc import Collection, Iterator, Mapping
+
+from instrumentation import count_error
+from metrics import process_rss_bytes
+
+
+# Objects whose memory is not the session's own (shared or OS-level)
+_OPAQUE_TYPES = (
+    type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+    types.MethodType, io.IOBase, threading.Thread
+)
+
+# Counted by sys.getsizeof alone (their contents are not separate objects,
+# or, for range/memoryview, not worth walking)
+_FLAT_TYPES = (str, bytes, bytearray, array, int, float, range, memoryview)
+
+
+def estimate_size(obj, seen=None, max_depth=12):
+    """
+    Approximate the memory held by an object graph
+
+    Follows containers and instance attributes, counting each object
+    once. Native memory (Vosk models, ffmpeg processes) is invisible to
+    this and not included.
+
+    Args:
+        obj: Root object
+        seen: Ids already counted (shared across calls to avoid double counting)
+        max_depth: Recursion limit
+
+    Returns:
+        int: Estimated bytes
+    """
+    if seen is None:
+        seen = set()
+
+    size = 0
+    stack = [(obj, 0)]
+    while stack:
+        current, depth = stack.pop()
+        if id(current) in seen or isinstance(current, _OPAQUE_TYPES):
+            continue
+        seen.add(id(current))
+
+        try:
+            size += sys.getsizeof(current)
+        except TypeError:
+            continue
+
+        if depth >= max_depth or isinstance(current, _FLAT_TYPES):
+            continue
+
+        # Containers of any kind (dicts, lists, deques, ...); iterators are
+        # skipped since walking them would consume them. Other threads may
+        # be mutating a container, in which case its contents are skipped.
+        try:
+            if isinstance(current, Mapping):
+                for key, value in list(current.items()):
+                    stack.append((key, depth + 1))
+                    stack.append((value, depth + 1))
+            elif isinstance(current, Collection) and not isinstance(current, Iterator):
+                stack.extend((item, depth + 1) for item in list(current))
+        except (RuntimeError, TypeError):
+            pass
+
+        attributes = getattr(current, '__dict__', None)
+        if attributes is not None:
+            stack.append((attributes, depth + 1))
+        for slot in getattr(type(current), '__slots__', ()):
+            if hasattr(current, slot):
+                stack.append((getattr(current, slot), depth + 1))
+
+    return size
+
+
+def session_memory(session, shared=()):
+    """
+    Break down a session's estimated memory by component
+
+    Args:
+        session: Session dictionary from RecordingService.active_sessions
+        shared: Objects used by every session (HTTP client, summary cache,
+                recognizer engines, ...); they are not charged to the session
+
+    Returns:
+        dict: component -> bytes, plus 'total'
+    """
+    seen = {id(obj) for obj in shared}
+    breakdown = {}
+    for key in ('aggregator', 'transcript', 'summarizer', 'logger', 'timings', 'progress'):
+        if session.get(key) is not None:
+            breakdown[key] = estimate_size(session[key], seen)
+
+    rest = {k: v for k, v in session.items() if k not in breakdown}
+    breakdown['other'] = estimate_size(rest, seen)
+    breakdown['total'] = sum(breakdown.values())
+    return breakdown
+
+
+class MemoryWatchdog:
+    """Background memory monitor for RecordingService"""
+
+    def __init__(self, service, app, config):
+        """
+        Initialize watchdog
+
+        Args:
+            service: RecordingService to watch
+            app: Flask application (finalizing evicted sessions needs it)
+            config: Recorder configuration dictionary
+        """
+        self.service = service
+        self.app = app
+        self.interval = config.get('memory_watchdog_interval', 60)
+        self.growth_alert_bytes = config.get('memory_growth_alert_mb', 100) * 1024 * 1024
+        self.rss_alert_bytes = (config.get('memory_rss_alert_mb') or 0) * 1024 * 1024
+        self.idle_ttl = config.get('session_idle_ttl', 21600)
+        self.trace_frames = config.get('memory_tracemalloc_frames', 0)
+
+        if self.trace_frames and not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+
+        self.baseline_rss = process_rss_bytes()
+        self.last_rss = self.baseline_rss
+        self.alerts = 0
+        self._snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the background thread"""
+        self._thread = threading.Thread(target=self._run, name='memory-watchdog', daemon=True)
+        self._thread.start()
+        print(f"[MemoryWatchdog] Watching memory every {self.interval}s "
+              f"(idle TTL {self.idle_ttl}s, tracemalloc {'on' if self._snapshot else 'off'})")
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"[MemoryWatchdog] Check failed: {e}")
+
+    def check(self):
+        """Run one round: growth alert, then idle-session eviction"""
+        rss = process_rss_bytes()
+        self.last_rss = rss
+
+        grown = rss - self.baseline_rss
+        if grown >= self.growth_alert_bytes or (self.rss_alert_bytes and rss >= self.rss_alert_bytes):
+            self._alert(rss, grown)
+            # Alert again only after a further growth step
+            self.baseline_rss = rss
+
+        self.evict_idle_sessions()
+
+    def _alert(self, rss, grown):
+        """Log a growth alert with the largest sessions and allocation sites"""
+        self.alerts += 1
+        count_error('memory')
+        print(f"[MemoryWatchdog] ALERT: RSS {rss / 1048576:.0f} MB "
+              f"(+{grown / 1048576:.0f} MB), {len(self.service.active_sessions)} active sessions")
+
+        for entry in self.session_report()[:5]:
+            print(f"[MemoryWatchdog]   {entry['session_id']}: ~{entry['estimated_bytes'] / 1048576:.1f} MB, "
+                  f"idle {entry['idle_seconds']:.0f}s")
+
+        for site in self.allocation_growth(limit=10):
+            print(f"[MemoryWatchdog]   +{site['size_diff'] / 1024:.0f} KB at {site['location']}")
+
+    def evict_idle_sessions(self):
+        """
+        Finalize sessions with no activity for idle_ttl seconds
+
+        A session is busy while its audio is being decoded or a live
+        transcript listener is connected. Evicted sessions go through the
+        normal stop pipeline, so whatever was transcribed is kept.
+
+        Returns:
+            list: Evicted session ids
+        """
+        if not self.idle_ttl:
+            return []
+
+        evicted = []
+        for session_id, session in list(self.service.active_sessions.items()):
+            if not session.get('running', True):
+                continue    # already stopping
+            if self.service.session_idle_seconds(session) < self.idle_ttl:
+                continue
+            if session.get('audio_uploaded') and not session.get('processing_complete'):
+                continue    # still decoding
+            if session['aggregator'].subscriber_count():
+                continue    # someone is watching the live transcript
+
+            print(f"[MemoryWatchdog] Finalizing idle session {session_id} "
+                  f"(idle {self.service.session_idle_seconds(session):.0f}s)")
+            session['logger'].log(f"Session idle for more than {self.idle_ttl}s - finalizing")
+            with self.app.app_context():
+                self.service.stop_session(session_id, session['user_id'], self.app)
+            evicted.append(session_id)
+
+        return evicted
+
+    def session_report(self):
+        """
+        Estimate memory of every active session
+
+        Returns:
+            list: Per-session dictionaries, largest first
+        """
+        report = []
+        shared = self._shared_objects()
+        for session_id, session in list(self.service.active_sessions.items()):
+            breakdown = session_memory(session, shared)
+            report.append({
+                'session_id': session_id,
+                'user_id': session['user_id'],
+                'running': session.get('running', True),
+                'idle_seconds': round(self.service.session_idle_seconds(session), 1),
+                'segments': session['aggregator'].get_segment_count(),
+                'estimated_bytes': breakdown.pop('total'),
+                'breakdown': breakdown
+            })
+        return sorted(report, key=lambda entry: entry['estimated_bytes'], reverse=True)
+
+    def _shared_objects(self):
+        """
+        Objects owned by the service rather than by any one session
+
+        Everything the service itself holds (HTTP client, summary cache,
+        recognizer pool, config, ...), plus recognizer engines checked out
+        from the pool by live streams.
+
+        Returns:
+            list: Objects to exclude from per-session estimates
+        """
+        shared = [value for name, value in vars(self.service).items() if name != 'active_sessions']
+        shared.extend(session['stream_engine'] for session in list(self.service.active_sessions.values())
+                      if session.get('stream_engine') is not None)
+        return shared
+
+    def allocation_growth(self, limit=20):
+        """
+        Compare a fresh tracemalloc snapshot with the previous one
+
+        Args:
+            limit: Allocation sites to return
+
+        Returns:
+            list: Sites with the largest growth (empty when tracemalloc is off)
+        """
+        if self._snapshot is None or not tracemalloc.is_tracing():
+            return []
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        stats = snapshot.compare_to(self._snapshot, 'lineno')
+        self._snapshot = snapshot
+
+        return [{
+            'location': str(stat.traceback[0]),
+            'size': stat.size,
+            'size_diff': stat.size_diff,
+            'count_diff': stat.count_diff
+        } for stat in stats[:limit] if stat.size_diff > 0]
+
+    def get_report(self, include_growth=False):
+        """
+        Full memory report for the admin API
+
+        Args:
+            include_growth: Also diff tracemalloc against the last snapshot
+
+        Returns:
+            dict: Process, tracemalloc and per-session figures
+        """
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (None, None)
+
+        return {
+            'rss_bytes': process_rss_bytes(),
+            'alert_baseline_rss_bytes': self.baseline_rss,
+            'alerts': self.alerts,
+            'idle_ttl_seconds': self.idle_ttl,
+            'tracemalloc': {
+                'enabled': tracing,
+                'traced_bytes': current,
+                'peak_bytes': peak,
+                'growth': self.allocation_growth() if include_growth else None
+            },
+            'sessions': self.session_report(),
+            'finalizations': len(self.service.finalizations)
+        }
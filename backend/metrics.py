@@ -0,0 +1,306 @@
+"""
+Metrics
+Minimal in-process Prometheus registry (counters, gauges, histograms)
+rendered in the text exposition format for /api/metrics
+"""
+
+import math
+import threading
+
+import instrumentation
+
+
+# Latency buckets (seconds): sub-second API calls up to multi-minute decodes
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+# Real-time factor buckets: < 1 keeps up with live audio
+RTF_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0)
+
+
+def _format_labels(names, values):
+    """Render a label set as {a="x",b="y"}"""
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_value(value):
+    """Render a sample value the way Prometheus expects"""
+    if value is None:
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} takes labels {self.label_names}, got {tuple(labels)}")
+        return tuple(labels[name] for name in self.label_names)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labels=()):
+        super().__init__(name, documentation, labels)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+                for key, value in values]
+
+
+class Gauge(_Metric):
+    """Value read from a callback when scraped"""
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, callback, labels=()):
+        """
+        Args:
+            callback: Returns a number (no labels) or a dict of
+                      label-value tuple -> number
+        """
+        super().__init__(name, documentation, labels)
+        self.callback = callback
+
+    def render(self):
+        try:
+            value = self.callback()
+        except Exception as e:
+            print(f"[Metrics] Could not read {self.name}: {e}")
+            return []
+
+        if not self.label_names:
+            return [f"{self.name} {_format_value(value)}"]
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(v)}"
+                for key, v in sorted(value.items())]
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts plus sum and count"""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, buckets=DURATION_BUCKETS, labels=()):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}   # label key -> [bucket counts..., sum, count]
+
+    def observe(self, value, **labels):
+        if value is None:
+            return
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+
+        lines = []
+        for key, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                labels = _format_labels(self.label_names + ('le',), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names + ('le',), key + ('+Inf',))
+            lines.append(f"{self.name}_bucket{labels} {values[-1]}")
+            plain = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{plain} {_format_value(values[-2])}")
+            lines.append(f"{self.name}_count{plain} {values[-1]}")
+        return lines
+
+
+class Registry:
+    """Ordered collection of metrics"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labels=()):
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name, documentation, callback, labels=()):
+        return self.register(Gauge(name, documentation, callback, labels))
+
+    def histogram(self, name, documentation, buckets=DURATION_BUCKETS, labels=()):
+        return self.register(Histogram(name, documentation, buckets, labels))
+
+    def render(self):
+        """
+        Render every metric
+
+        Returns:
+            str: Prometheus text exposition format (version 0.0.4)
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+def process_rss_bytes():
+    """
+    Resident set size of this process
+
+    Returns:
+        int: Bytes (from /proc on Linux, else peak RSS from getrusage)
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    import resource
+    import sys
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class PipelineMetrics:
+    """Metrics for the recording pipeline, fed by instrumentation spans"""
+
+    def __init__(self, recording_service):
+        """
+        Initialize metrics and start observing instrumentation
+
+        Args:
+            recording_service: RecordingService whose state the gauges read
+        """
+        self.service = recording_service
+        self.registry = Registry()
+        r = self.registry
+
+        r.gauge('meeting_active_sessions', 'Sessions started and not yet stopped',
+                lambda: len(self.service.active_sessions))
+        r.gauge('meeting_transcriptions_in_flight', 'Sessions with uploaded audio still being decoded',
+                self._transcriptions_in_flight)
+        r.gauge('meeting_finalizations_in_flight', 'Stopped sessions still being finalized',
+                self._finalizations_in_flight)
+        r.gauge('meeting_decode_pool_jobs', 'Recognizer pool jobs by state',
+                self._pool_jobs, labels=('state',))
+        r.gauge('meeting_decode_pool_engines', 'Recognizer engines by state',
+                self._pool_engines, labels=('state',))
+        r.gauge('meeting_transcription_queue_jobs', 'Durable transcription queue jobs by status',
+                self._queue_jobs, labels=('status',))
+
+        self.decode_rtf = r.histogram(
+            'meeting_decode_real_time_factor',
+            'Decode seconds per second of audio, per finished session',
+            buckets=RTF_BUCKETS
+        )
+        self.stage_seconds = r.histogram(
+            'meeting_stage_duration_seconds',
+            'Time spent per pipeline stage (upload.save, audio.convert, stt.decode, '
+            'summary.request, pdf.transcript, finalize.*, ...)',
+            labels=('stage',)
+        )
+        self.errors = r.counter(
+            'meeting_errors_total', 'Pipeline failures by component', labels=('component',)
+        )
+        self.request_seconds = r.histogram(
+            'http_request_duration_seconds', 'API request latency by route',
+            labels=('method', 'route')
+        )
+        self.requests = r.counter(
+            'http_requests_total', 'API requests by route and status',
+            labels=('method', 'route', 'status')
+        )
+        r.gauge('process_resident_memory_bytes', 'Resident memory of this backend process',
+                process_rss_bytes)
+
+        instrumentation.add_listener(self._observe)
+
+    def _observe(self, kind, name, value):
+        """Instrumentation listener"""
+        if kind == 'span':
+            self.stage_seconds.observe(value, stage=name)
+        elif kind == 'value' and name == 'stt.real_time_factor':
+            self.decode_rtf.observe(value)
+        elif kind == 'error':
+            self.errors.inc(value, component=name)
+
+    def observe_request(self, method, route, status, seconds):
+        """
+        Record a finished API request
+
+        Args:
+            method: HTTP method
+            route: URL rule (e.g. /api/recordings/<session_id>/status), not the raw path
+            status: Response status code
+            seconds: Handler latency
+        """
+        self.request_seconds.observe(seconds, method=method, route=route)
+        self.requests.inc(method=method, route=route, status=status)
+
+    def _transcriptions_in_flight(self):
+        return sum(1 for session in list(self.service.active_sessions.values())
+                   if session.get('audio_uploaded') and not session.get('processing_complete'))
+
+    def _finalizations_in_flight(self):
+        with self.service._finalize_lock:
+            return sum(1 for state in self.service.finalizations.values()
+                       if state['status'] in ('queued', 'running'))
+
+    def _pool_jobs(self):
+        status = self.service.recognizer_pool.get_status()
+        return {('running',): status['running_jobs'], ('queued',): status['queued_jobs']}
+
+    def _pool_engines(self):
+        status = self.service.recognizer_pool.get_status()
+        return {('in_use',): status['engines_in_use'], ('idle',): status['engines_idle']}
+
+    def _queue_jobs(self):
+        if self.service.job_queue is None:
+            return {}
+        return {(status,): count for status, count in self.service.job_queue.get_status().items()}
+
+    def render(self):
+        """
+        Returns:
+            str: All metrics in Prometheus text format
+        """
+        return self.registry.render()
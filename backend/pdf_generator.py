@@ -4,6 +4,7 @@ Creates PDF files from transcripts and summaries
 """
 
 import os
+import sys
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
@@ -13,6 +14,11 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from datetime import datetime
 
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+from transcript_sidecar import load_sidecar
+from instrumentation import span
+
 
 class PDFGenerator:
     def __init__(self):
@@ -35,10 +41,6 @@ class PDFGenerator:
             if not os.path.exists(transcript_file_path):
                 raise FileNotFoundError(f"Transcript file not found: {transcript_file_path}")
             
-            # Read transcript file
-            with open(transcript_file_path, 'r', encoding='utf-8') as f:
-                transcript_content = f.read()
-            
             # Create PDF file path
             pdf_filename = f"{session_name}_transcript.pdf"
             pdf_path = os.path.join(self.output_dir, pdf_filename)
@@ -98,49 +100,20 @@ class PDFGenerator:
             story.append(Spacer(1, 0.3*inch))
             
             # Process transcript content
-            lines = transcript_content.split('\n')
-            in_content = False
-            
-            for line in lines:
-                line = line.strip()
-                
-                if not line:
-                    continue
-                
-                # Skip header/footer markers
-                if line.startswith('=') or line.startswith('Transcript:'):
-                    if 'Transcript:' in line:
-                        in_content = True
-                    continue
-                
-                if not in_content:
-                    continue
-                
-                # Check if line is a timestamp segment
-                if line.startswith('[') and ']' in line:
-                    # Extract timestamp and text
-                    parts = line.split(']', 1)
-                    if len(parts) == 2:
-                        timestamp = parts[0] + ']'
-                        text = parts[1].strip()
-                        
-                        if text:
-                            # Add timestamp as heading
-                            story.append(Paragraph(
-                                f"<b>{timestamp}</b>",
-                                heading_style
-                            ))
-                            # Add text
-                            story.append(Paragraph(text, normal_style))
-                            story.append(Spacer(1, 0.1*inch))
-                else:
-                    # Regular paragraph
-                    if line and not line.startswith('Total') and not line.startswith('Duration'):
-                        story.append(Paragraph(line, normal_style))
-                        story.append(Spacer(1, 0.1*inch))
+            for timestamp, text in self._transcript_entries(transcript_file_path):
+                if timestamp:
+                    # Add timestamp as heading
+                    story.append(Paragraph(
+                        f"<b>[{timestamp}]</b>",
+                        heading_style
+                    ))
+                # Add text
+                story.append(Paragraph(text, normal_style))
+                story.append(Spacer(1, 0.1*inch))
             
             # Build PDF
-            doc.build(story)
+            with span('pdf.transcript'):
+                doc.build(story)
             
             return pdf_path
             
@@ -148,6 +121,54 @@ class PDFGenerator:
             print(f"Error creating transcript PDF: {e}")
             raise
     
+    def _transcript_entries(self, transcript_file_path):
+        """
+        Yield (timestamp, text) pairs of a transcript
+        
+        Reads the structured sidecar when the transcript has one; older
+        transcripts are parsed from the .txt (timestamp is None for
+        untimed paragraphs).
+        """
+        sidecar = load_sidecar(transcript_file_path)
+        if sidecar is not None:
+            for segment in sidecar.segments(words=False):
+                yield segment['timestamp'], segment['text']
+            return
+        
+        with open(transcript_file_path, 'r', encoding='utf-8') as f:
+            transcript_content = f.read()
+        
+        lines = transcript_content.split('\n')
+        in_content = False
+        
+        for line in lines:
+            line = line.strip()
+            
+            if not line:
+                continue
+            
+            # Skip header/footer markers
+            if line.startswith('=') or line.startswith('Transcript:'):
+                if 'Transcript:' in line:
+                    in_content = True
+                continue
+            
+            if not in_content:
+                continue
+            
+            # Check if line is a timestamp segment
+            if line.startswith('[') and ']' in line:
+                # Extract timestamp and text
+                parts = line.split(']', 1)
+                if len(parts) == 2:
+                    text = parts[1].strip()
+                    if text:
+                        yield parts[0][1:], text
+            else:
+                # Regular paragraph
+                if not line.startswith('Total') and not line.startswith('Duration'):
+                    yield None, line
+    
     def create_summary_pdf(self, summary_file_path, session_name):
         """Create PDF from summary file"""
         try:
@@ -239,7 +260,8 @@ class PDFGenerator:
                     story.append(Spacer(1, 0.1*inch))
             
             # Build PDF
-            doc.build(story)
+            with span('pdf.summary'):
+                doc.build(story)
             
             return pdf_path
             
@@ -0,0 +1,138 @@
+"""
+Profiling
+On-demand cProfile capture of decode jobs, requested at runtime for one
+session or for the next N jobs, with dumps written into the session folder
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import threading
+from contextlib import contextmanager
+
+from timezone_utils import now_ist
+
+
+PROFILE_SUFFIX = '.prof'
+REPORT_SUFFIX = '.prof.txt'
+
+
+class ProfileRequests:
+    """Pending profiling requests (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = set()
+        self._next_jobs = 0
+
+    def request_session(self, session_id):
+        """Profile the next decode job of a session"""
+        with self._lock:
+            self._sessions.add(session_id)
+
+    def request_next(self, count):
+        """Profile the next count decode jobs of any session"""
+        with self._lock:
+            self._next_jobs = max(0, int(count))
+
+    def discard(self, session_id):
+        """Drop a session's pending request (e.g. once the session has finished)"""
+        with self._lock:
+            self._sessions.discard(session_id)
+
+    def cancel(self):
+        """Drop every pending request"""
+        with self._lock:
+            self._sessions.clear()
+            self._next_jobs = 0
+
+    def claim(self, session_id):
+        """
+        Consume a request for a job that is about to run
+
+        Args:
+            session_id: Session the job decodes
+
+        Returns:
+            bool: True if the job should be profiled
+        """
+        with self._lock:
+            if session_id in self._sessions:
+                self._sessions.discard(session_id)
+                return True
+            if self._next_jobs > 0:
+                self._next_jobs -= 1
+                return True
+            return False
+
+    def get_status(self):
+        """
+        Returns:
+            dict: sessions waiting to be profiled and jobs left in the next-N count
+        """
+        with self._lock:
+            return {'sessions': sorted(self._sessions), 'next_jobs': self._next_jobs}
+
+
+@contextmanager
+def profiled(session_folder, session_name, label):
+    """
+    Profile the calling thread for the duration of the block
+
+    cProfile only sees the thread that enabled it, which is the decode
+    thread here. Writes <session>_<label>_<time>.prof (for pstats /
+    snakeviz) and a .prof.txt report of the top functions.
+
+    Args:
+        session_folder: Folder the dumps are written to
+        session_name: Session name for file naming
+        label: What was profiled (e.g. 'decode')
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        stamp = now_ist().strftime("%Y-%m-%d_%H-%M-%S")
+        base = os.path.join(session_folder, f"{session_name}_{label}_{stamp}")
+        try:
+            profiler.dump_stats(base + PROFILE_SUFFIX)
+
+            report = io.StringIO()
+            stats = pstats.Stats(profiler, stream=report)
+            stats.sort_stats('cumulative').print_stats(40)
+            stats.sort_stats('tottime').print_stats(20)
+            with open(base + REPORT_SUFFIX, 'w', encoding='utf-8') as f:
+                f.write(report.getvalue())
+
+            print(f"[Profiling] Wrote {base + PROFILE_SUFFIX}")
+        except Exception as e:
+            print(f"[Profiling] Could not write profile {base}: {e}")
+
+
+def list_profiles(session_folder):
+    """
+    List profile dumps in a session folder
+
+    Args:
+        session_folder: Session folder
+
+    Returns:
+        list: Dictionaries with filename, size and modified time, newest first
+    """
+    if not os.path.isdir(session_folder):
+        return []
+
+    profiles = []
+    for filename in os.listdir(session_folder):
+        if filename.endswith(PROFILE_SUFFIX) or filename.endswith(REPORT_SUFFIX):
+            path = os.path.join(session_folder, filename)
+            stat = os.stat(path)
+            profiles.append({
+                'filename': filename,
+                'size': stat.st_size,
+                'modified': stat.st_mtime
+            })
+    return sorted(profiles, key=lambda p: p['modified'], reverse=True)
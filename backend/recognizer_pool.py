@@ -0,0 +1,177 @@
+"""
+Recognizer Pool
+Shares a bounded set of Vosk recognizers and decode threads between sessions
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+from stt_engine import VoskSTTEngine
+
+
+class RecognizerPool:
+    def __init__(self, model_path, sample_rate, workers=2, preloaded_model=None, vad_factory=None):
+        """
+        Initialize recognizer pool
+
+        Args:
+            model_path: Path to Vosk model directory
+            sample_rate: Sample rate recognizers are created for
+            workers: Maximum number of concurrent decode jobs / recognizers
+            preloaded_model: Optional preloaded Vosk Model shared by all recognizers
+            vad_factory: Optional callable returning a VoiceActivityDetector
+                         for each engine
+        """
+        self.model_path = model_path
+        self.sample_rate = sample_rate
+        self.workers = max(1, int(workers))
+        self.preloaded_model = preloaded_model
+        self.vad_factory = vad_factory
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix='stt-worker'
+        )
+
+        self._condition = threading.Condition()
+        self._idle = []          # engines ready for reuse
+        self._created = 0        # engines created so far (<= workers)
+        self._in_use = 0         # engines currently checked out
+        self._queued = 0         # jobs submitted but not started
+        self._running = 0        # jobs currently running
+        self._completed = 0      # jobs finished (success or failure)
+
+    def _create_engine(self):
+        """Create a new engine sharing the pool's model"""
+        engine = VoskSTTEngine(
+            self.model_path,
+            self.sample_rate,
+            preloaded_model=self.preloaded_model,
+            vad=self.vad_factory() if self.vad_factory else None
+        )
+        # Share whichever model the first engine ended up loading
+        if self.preloaded_model is None:
+            self.preloaded_model = engine.model
+        return engine
+
+    def acquire(self, timeout=None):
+        """
+        Check out an engine, waiting until one is free
+
+        Args:
+            timeout: Seconds to wait (None = wait indefinitely)
+
+        Returns:
+            VoskSTTEngine: Engine with a clean recognizer, or None on timeout
+        """
+        with self._condition:
+            available = self._condition.wait_for(
+                lambda: self._idle or self._created < self.workers,
+                timeout
+            )
+            if not available:
+                return None
+
+            if self._idle:
+                engine = self._idle.pop()
+            else:
+                self._created += 1
+                engine = None
+            self._in_use += 1
+
+        if engine is None:
+            try:
+                engine = self._create_engine()
+            except Exception:
+                with self._condition:
+                    self._created -= 1
+                    self._in_use -= 1
+                    self._condition.notify()
+                raise
+
+        return engine
+
+    def release(self, engine):
+        """
+        Return an engine to the pool
+
+        Args:
+            engine: Engine previously returned by acquire()
+        """
+        try:
+            engine.reset()
+        except Exception as e:
+            print(f"[RecognizerPool] Discarding engine after failed reset: {e}")
+            engine = None
+
+        with self._condition:
+            self._in_use -= 1
+            if engine is not None:
+                self._idle.append(engine)
+            else:
+                self._created -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def engine(self):
+        """Context manager around acquire()/release()"""
+        engine = self.acquire()
+        try:
+            yield engine
+        finally:
+            self.release(engine)
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Queue a decode job; runs as soon as a worker thread is free
+
+        Args:
+            fn: Callable to run
+            *args, **kwargs: Passed to fn
+
+        Returns:
+            concurrent.futures.Future: Future for the job
+        """
+        with self._condition:
+            self._queued += 1
+
+        def run():
+            with self._condition:
+                self._queued -= 1
+                self._running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._condition:
+                    self._running -= 1
+                    self._completed += 1
+
+        return self._executor.submit(run)
+
+    def get_status(self):
+        """
+        Get pool occupancy
+
+        Returns:
+            dict: Worker, engine and job counters
+        """
+        with self._condition:
+            return {
+                'workers': self.workers,
+                'running_jobs': self._running,
+                'queued_jobs': self._queued,
+                'completed_jobs': self._completed,
+                'engines_created': self._created,
+                'engines_in_use': self._in_use,
+                'engines_idle': len(self._idle)
+            }
+
+    def shutdown(self):
+        """Stop accepting jobs and wait for running ones"""
+        self._executor.shutdown(wait=True)
@@ -7,6 +7,9 @@ import os
 import sys
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 import json
@@ -21,23 +24,136 @@ from timezone_utils import now_ist, format_ist
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
 
 from recorder import AudioRecorder
-from stt_engine import VoskSTTEngine
 from transcript_aggregator import TranscriptAggregator
+from transcript_sidecar import sidecar_path
 from summarizer import Summarizer
+from summary_cache import SummaryCache
+from http_client import CircuitBreaker, HttpClient
 from logger import SessionLogger
+from chunked_transcriber import ParallelTranscriber, transcribe_range
+from decode_progress import DecodeProgress
+from vad import VoiceActivityDetector, vad_options_from_config
 
 from database import db, Recording
+from recognizer_pool import RecognizerPool
+from streaming_decoder import StreamingDecoder
+from wav_source import WavSource
+from audio_format import is_wav_header, probe_wav, convert_to_wav
+from job_queue import JobQueue
+from instrumentation import Timings, count_error, observe, span
+import tracing
+from tracing import trace_span
+from profiling import ProfileRequests, list_profiles, profiled
+from memory_watchdog import MemoryWatchdog
+
+
+# Finalization pipeline stages, in order (see RecordingService._finalize_session)
+FINALIZE_STAGES = ('audio', 'transcription', 'transcript', 'summary', 'pdfs', 'metadata', 'database')
 
 
 class RecordingService:
-    def __init__(self):
-        """Initialize recording service"""
+    def __init__(self, database_uri=None, pdf_generator=None):
+        """
+        Initialize recording service
+        
+        Args:
+            database_uri: Application database URI, used for the durable
+                          transcription job queue when job_queue_enabled is set
+            pdf_generator: PDFGenerator used when finalizing stopped sessions
+        """
         self.active_sessions = {}  # session_id -> session_data
+        self.pdf_generator = pdf_generator
+        
+        # Stopped sessions being finalized in the background
+        self.finalizations = {}    # session_id -> pipeline status
+        self._finalize_lock = threading.Lock()
         self.config = self._load_config()
         self.preloaded_model = None  # Preloaded Vosk model
         
+        # Chrome trace-event file for inspecting slow sessions after the fact
+        if self.config.get('trace_enabled', True):
+            max_mb = self.config.get('trace_max_mb', 50)
+            tracing.configure(
+                self._trace_path(),
+                max_bytes=int(max_mb * 1024 * 1024) if max_mb else None,
+                backups=self.config.get('trace_backups', 3)
+            )
+        
         # Preload Vosk model into RAM
         self._preload_vosk_model()
+        
+        # Shared recognizers + bounded decode threads for all sessions
+        self.recognizer_pool = RecognizerPool(
+            self.config['model_path'],
+            self.config['sample_rate'],
+            workers=self.config.get('recognizer_workers', 2),
+            preloaded_model=self.preloaded_model,
+            vad_factory=self._make_stream_vad if self._vad_options() is not None else None
+        )
+        
+        # Optional multi-process decoding of uploaded recordings
+        self.parallel_transcriber = None
+        if self.config.get('parallel_transcription', False):
+            self.parallel_transcriber = ParallelTranscriber(
+                self.config['model_path'],
+                workers=self.config.get('parallel_workers') or None,
+                chunk_seconds=self.config.get('parallel_chunk_seconds', 120),
+                min_duration_seconds=self.config.get('parallel_min_duration_seconds', 180),
+                vad_options=self._vad_options()
+            )
+        
+        # Pending on-demand cProfile captures of decode jobs (admin API)
+        self.profile_requests = ProfileRequests()
+        
+        # Summaries of unchanged transcripts/chunks are reused (retries, reprocessing)
+        self.summary_cache = None
+        if self.config.get('summary_cache_enabled', True):
+            self.summary_cache = SummaryCache(
+                self.config.get('summary_cache_path') or os.path.join(
+                    os.path.dirname(__file__), '..', 'iot-meeting-minutes', 'recordings',
+                    'summary_cache.db'
+                ),
+                max_bytes=self.config.get('summary_cache_max_mb', 50) * 1024 * 1024
+            )
+        
+        # One keep-alive pool (and circuit breaker) for every session's summary requests
+        self.summary_client = HttpClient(
+            pool_size=self.config.get('summary_http_pool_size', 8),
+            read_timeout=self.config.get('summary_timeout', 30),
+            deadline=self.config.get('summary_deadline', 90),
+            max_attempts=self.config.get('summary_max_attempts', 4),
+            breaker=CircuitBreaker(
+                failure_threshold=self.config.get('summary_circuit_failures', 5),
+                reset_seconds=self.config.get('summary_circuit_reset', 30)
+            )
+        )
+        
+        # Started by start_memory_watchdog() once the Flask app exists
+        self.memory_watchdog = None
+        
+        # Bounded threads for stop-time finalization (summary, PDFs, ...)
+        self.finalize_executor = ThreadPoolExecutor(
+            max_workers=self.config.get('finalize_workers', 2),
+            thread_name_prefix='finalize'
+        )
+        
+        # Durable job queue: uploads are decoded by transcription_worker.py processes
+        self.job_queue = None
+        if self.config.get('job_queue_enabled', False) and database_uri:
+            self.job_queue = JobQueue(
+                database_uri,
+                stale_seconds=self.config.get('job_stale_seconds', 60),
+                max_attempts=self.config.get('job_max_attempts', 3)
+            )
+            threading.Thread(target=self._watch_jobs, daemon=True).start()
+    
+    def _trace_path(self):
+        """Trace file for this process (one per process, named by start time)"""
+        trace_dir = self.config.get('trace_dir') or os.path.join(
+            os.path.dirname(__file__), '..', 'iot-meeting-minutes', 'recordings', 'traces'
+        )
+        started = now_ist().strftime("%Y-%m-%d_%H-%M-%S")
+        return os.path.join(trace_dir, f"trace_{started}_{os.getpid()}.json")
     
     def _preload_vosk_model(self):
         """Preload Vosk model into RAM on startup"""
@@ -58,6 +174,21 @@ class RecordingService:
             print("   Model will be loaded on first recording start")
             self.preloaded_model = None
         
+    def _vad_options(self):
+        """VoiceActivityDetector settings from config (None when VAD is off)"""
+        return vad_options_from_config(self.config)
+    
+    def _make_vad(self, sample_rate):
+        """Create a VAD for one decode pass, or None when disabled"""
+        options = self._vad_options()
+        if options is None:
+            return None
+        return VoiceActivityDetector(sample_rate, **options)
+    
+    def _make_stream_vad(self):
+        """VAD factory for pooled streaming engines"""
+        return self._make_vad(self.config['sample_rate'])
+    
     def _load_config(self):
         """Load configuration"""
         config_path = os.path.join(
@@ -83,22 +214,24 @@ class RecordingService:
                 'extractive_sentences': 5
             }
     
-    def start_session(self, user_id, title):
-        """Start a new recording session (laptop will upload audio)"""
-        session_timestamp = now_ist().strftime("%Y-%m-%d_%H-%M-%S")
-        session_id = f"session_{user_id}_{session_timestamp}"
-        
-        # Create user-specific recording directory
-        user_recordings_dir = os.path.join(
+    def session_folder(self, user_id, session_id):
+        """Folder holding a session's audio, transcript and other outputs"""
+        return os.path.join(
             os.path.dirname(__file__),
             '..',
             'iot-meeting-minutes',
             'recordings',
-            f'user_{user_id}'
+            f'user_{user_id}',
+            session_id
         )
-        os.makedirs(user_recordings_dir, exist_ok=True)
+    
+    def start_session(self, user_id, title):
+        """Start a new recording session (laptop will upload audio)"""
+        session_timestamp = now_ist().strftime("%Y-%m-%d_%H-%M-%S")
+        session_id = f"session_{user_id}_{session_timestamp}"
         
-        session_folder = os.path.join(user_recordings_dir, session_id)
+        # Create user-specific recording directory
+        session_folder = self.session_folder(user_id, session_id)
         os.makedirs(session_folder, exist_ok=True)
         
         # Create database record
@@ -112,46 +245,20 @@ class RecordingService:
         db.session.commit()
         
         try:
-            # Initialize components (no recorder needed - laptop records)
-            stt_engine = VoskSTTEngine(
-                self.config['model_path'],
-                self.config['sample_rate'],
-                preloaded_model=self.preloaded_model
-            )
-            
+            # Initialize components (no recorder needed - laptop records).
+            # Recognizers come from the shared pool when audio is decoded.
             aggregator = TranscriptAggregator(
                 session_folder,
-                session_id
+                session_id,
+                sample_rate=self.config['sample_rate'],
+                fsync_interval=self.config.get('transcript_fsync_seconds', 5)
             )
             
-            # Get OpenRouter model from config if available
-            openrouter_model = self.config.get('openrouter_model', 'qwen/qwen-2.5-1.5b-instruct')
-            os.environ['OPENROUTER_MODEL'] = openrouter_model
-            
-            summarizer = Summarizer(
-                self.config['summarizer'],
-                self.config['extractive_sentences']
-            )
-            
-            logger = SessionLogger(session_folder, session_id)
-            
             # Store session data (no recorder, no processing thread)
-            self.active_sessions[session_id] = {
-                'user_id': user_id,
-                'recording_id': recording.id,
-                'session_folder': session_folder,
-                'session_name': session_id,
-                'stt_engine': stt_engine,
-                'aggregator': aggregator,
-                'summarizer': summarizer,
-                'logger': logger,
-                'start_time': time.time(),
-                'running': True,
-                'transcript': [],
-                'audio_uploaded': False
-            }
+            session = self._new_session(user_id, recording.id, session_folder, session_id, aggregator)
+            self.active_sessions[session_id] = session
             
-            logger.log("Session started - waiting for audio upload from laptop")
+            session['logger'].log("Session started - waiting for audio upload from laptop")
             
             return session_id
             
@@ -161,6 +268,48 @@ class RecordingService:
             db.session.commit()
             raise Exception(f"Failed to start recording: {str(e)}")
     
+    def _new_session(self, user_id, recording_id, session_folder, session_id, aggregator):
+        """
+        Build the in-memory state of a session
+        
+        Returns:
+            dict: Session data (not yet registered in active_sessions)
+        """
+        # Get OpenRouter model from config if available
+        openrouter_model = self.config.get('openrouter_model', 'qwen/qwen-2.5-1.5b-instruct')
+        os.environ['OPENROUTER_MODEL'] = openrouter_model
+        
+        summarizer = Summarizer(
+            self.config['summarizer'],
+            self.config['extractive_sentences'],
+            chunk_tokens=self.config.get('summary_chunk_tokens', 3000),
+            workers=self.config.get('summary_workers', 4),
+            map_reduce=self.config.get('summary_map_reduce', True),
+            cache=self.summary_cache,
+            client=self.summary_client
+        )
+        summarizer.prewarm()
+        
+        return {
+            'user_id': user_id,
+            'recording_id': recording_id,
+            'session_folder': session_folder,
+            'session_name': session_id,
+            'aggregator': aggregator,
+            'summarizer': summarizer,
+            'logger': SessionLogger(session_folder, session_id),
+            'start_time': time.time(),
+            'last_activity': time.time(),
+            'running': True,
+            'transcript': self._recent_results(),
+            'audio_uploaded': False,
+            'stream_decoder': None,
+            'stream_engine': None,
+            'next_chunk_sequence': 0,
+            'stream_lock': threading.Lock(),
+            'timings': Timings()
+        }
+    
     def process_uploaded_audio(self, session_id, user_id, audio_file):
         """Process audio file uploaded from laptop"""
         session = self.active_sessions.get(session_id)
@@ -168,34 +317,72 @@ class RecordingService:
         if not session or session['user_id'] != user_id:
             return None
         
+        session['last_activity'] = time.time()
+        
         try:
             print(f"[RecordingService] Received audio file from laptop for session: {session_id}")
             
-            # Save uploaded audio file
-            audio_path = os.path.join(session['session_folder'], f"{session['session_name']}_uploaded.webm")
-            audio_file.save(audio_path)
-            
-            print(f"[RecordingService] Audio saved: {audio_path}")
+            # A full upload replaces anything the live stream decoded
+            if session.get('stream_decoder'):
+                self._discard_stream(session)
             
-            # Convert webm to wav for Vosk
             wav_path = os.path.join(session['session_folder'], f"{session['session_name']}.wav")
-            self._convert_to_wav(audio_path, wav_path)
+            wav_format = self._probe_upload(audio_file)
+            
+            if wav_format and self._is_recognizer_format(wav_format):
+                # Already what Vosk wants - keep the upload as the session WAV
+                with session['timings'].span('upload.save'):
+                    audio_file.save(wav_path)
+                print(f"[RecordingService] Audio saved as-is (PCM WAV, {wav_format['sample_rate']} Hz): {wav_path}")
+                
+                session['audio_uploaded'] = True
+                session['processing_complete'] = False
+                if self.job_queue:
+                    self._enqueue_transcription(session_id, wav_path, wav_path)
+                else:
+                    self._submit_decode(session, self._process_uploaded_wav, wav_path)
+                return True
             
-            print(f"[RecordingService] Audio converted to WAV: {wav_path}")
+            # Save uploaded audio file
+            extension = 'wav' if wav_format else 'webm'
+            audio_path = os.path.join(session['session_folder'], f"{session['session_name']}_uploaded.{extension}")
+            with session['timings'].span('upload.save'):
+                audio_file.save(audio_path)
             
-            # Mark as uploaded
-            session['audio_uploaded'] = True
-            session['processing_complete'] = False
+            print(f"[RecordingService] Audio saved: {audio_path}")
             
-            # Start processing in background thread
-            processing_thread = threading.Thread(
-                target=self._process_uploaded_wav,
-                args=(session_id, wav_path),
-                daemon=True
-            )
-            processing_thread.start()
+            if self.job_queue:
+                # Conversion and decoding both happen in a transcription worker
+                session['audio_uploaded'] = True
+                session['processing_complete'] = False
+                self._enqueue_transcription(session_id, audio_path, wav_path)
+                return True
+            elif wav_format:
+                # 16-bit PCM at another rate/layout - resample in-process, no ffmpeg
+                session['audio_uploaded'] = True
+                session['processing_complete'] = False
+                self._submit_decode(session, self._resample_uploaded_wav, audio_path, wav_path)
+            elif self.parallel_transcriber is None and self.config.get('stream_upload_decode', True):
+                # Decode straight from ffmpeg's output; the WAV is written alongside
+                session['audio_uploaded'] = True
+                session['processing_complete'] = False
+                self._submit_decode(session, self._stream_decode_upload, audio_path, wav_path)
+            else:
+                # Parallel decoding needs a seekable WAV to split
+                with session['timings'].activate():
+                    self._convert_to_wav(audio_path, wav_path)
+                print(f"[RecordingService] Audio converted to WAV: {wav_path}")
+                
+                # Mark as uploaded
+                session['audio_uploaded'] = True
+                session['processing_complete'] = False
+                
+                # Queue processing on the shared decode pool
+                self._submit_decode(session, self._process_uploaded_wav, wav_path)
             
-            print(f"[RecordingService] Processing thread started for session: {session_id}")
+            pool_status = self.recognizer_pool.get_status()
+            print(f"[RecordingService] Processing queued for session: {session_id} "
+                  f"({pool_status['running_jobs']} running, {pool_status['queued_jobs']} queued)")
             
             return True
             
@@ -205,36 +392,325 @@ class RecordingService:
             traceback.print_exc()
             return False
     
-    def _convert_to_wav(self, input_path, output_path):
-        """Convert audio file to WAV format for Vosk"""
+    def _submit_decode(self, session, fn, *args):
+        """
+        Queue a decode job for a session on the shared pool
+        
+        The job runs with the session's timings and the caller's trace,
+        and under cProfile if profiling was requested for it.
+        
+        Args:
+            session: Session the job decodes
+            fn: Method taking (session_id, *args)
+            *args: Further arguments for fn
+        """
+        session_id = session['session_name']
+        
+        def job():
+            if not self.profile_requests.claim(session_id):
+                return fn(session_id, *args)
+            
+            session['logger'].log(f"Profiling {fn.__name__}")
+            with profiled(session['session_folder'], session_id, 'decode'):
+                return fn(session_id, *args)
+        
+        self.recognizer_pool.submit(session['timings'].wrap(job))
+    
+    def _enqueue_transcription(self, session_id, audio_path, wav_path):
+        """Hand an upload to the durable job queue"""
+        session = self.active_sessions[session_id]
+        session['job_id'] = self.job_queue.enqueue(
+            session['recording_id'],
+            session_id,
+            audio_path,
+            wav_path
+        )
+        session['logger'].log(f"Transcription job {session['job_id']} queued")
+        print(f"[RecordingService] Transcription job {session['job_id']} queued for session: {session_id}")
+    
+    def _watch_jobs(self):
+        """Collect results of queued jobs for sessions that are still active"""
+        poll_seconds = self.config.get('job_poll_seconds', 1)
+        
+        while True:
+            time.sleep(poll_seconds)
+            
+            for session_id, session in list(self.active_sessions.items()):
+                job_id = session.get('job_id')
+                if job_id is None or session.get('processing_complete'):
+                    continue
+                
+                try:
+                    job = self.job_queue.get(job_id)
+                    if not job:
+                        continue
+                    
+                    if job.get('progress'):
+                        session['progress'] = json.loads(job['progress'])
+                    
+                    if job['status'] == 'completed':
+                        self._load_job_result(session, job)
+                        session['processing_complete'] = True
+                        print(f"[RecordingService] Transcription complete for {session_id} (job {job_id})")
+                    elif job['status'] == 'failed':
+                        session['processing_error'] = job['error']
+                        count_error('transcription')
+                        session['processing_complete'] = True
+                        print(f"[RecordingService] Transcription job {job_id} failed: {job['error']}")
+                except Exception as e:
+                    print(f"[RecordingService] Error checking job {job_id}: {e}")
+    
+    def _load_job_result(self, session, job):
+        """Load a worker's decoded segments into the session transcript"""
+        with open(job['result_path'], 'r', encoding='utf-8') as f:
+            result = json.load(f)
+        
+        self._collect_results(session, result['segments'])
+        self._record_vad_stats(session, result.get('vad'))
+        session['timings'].merge(result.get('timings'))
+    
+    def _probe_upload(self, audio_file):
+        """
+        Peek at an uploaded file's header without consuming the stream
+        
+        Returns:
+            dict: Format from probe_wav() for 16-bit PCM WAV uploads, else None
+        """
         try:
-            import subprocess
-            
-            # Use ffmpeg to convert
-            cmd = [
-                'ffmpeg', '-i', input_path,
-                '-ar', '16000',  # 16kHz sample rate
-                '-ac', '1',       # Mono
-                '-f', 'wav',      # WAV format
-                '-y',             # Overwrite
-                output_path
-            ]
+            stream = audio_file.stream
+            position = stream.tell()
+            header = stream.read(4096)
+            stream.seek(position)
+        except Exception:
+            return None
+        
+        if not is_wav_header(header):
+            return None
+        
+        wav_format = probe_wav(header)
+        if not wav_format or wav_format['sample_width'] != 2:
+            return None
+        return wav_format
+    
+    def _is_recognizer_format(self, wav_format):
+        """Check whether a probed WAV can be fed to the recognizers unchanged"""
+        return (wav_format['sample_rate'] == self.config['sample_rate'] and
+                wav_format['channels'] == 1)
+    
+    def _resample_uploaded_wav(self, session_id, input_path, wav_path):
+        """Convert a PCM WAV upload to the recognizer format, then decode it"""
+        session = self.active_sessions.get(session_id)
+        if not session:
+            return
+        
+        try:
+            self._convert_to_wav(input_path, wav_path)
+        except Exception as e:
+            session['processing_complete'] = True
+            session['processing_error'] = str(e)
+            count_error('conversion')
+            return
+        
+        self._process_uploaded_wav(session_id, wav_path)
+    
+    def _stream_decode_upload(self, session_id, input_path, wav_path):
+        """
+        Pipe an uploaded file through ffmpeg into a pooled recognizer
+        
+        Decoding starts with the first PCM ffmpeg produces, and the archival
+        WAV is teed from the same stream instead of being written and then
+        read back. Falls back to convert-then-decode if streaming fails.
+        """
+        session = self.active_sessions.get(session_id)
+        if not session:
+            return
+        
+        try:
+            print(f"[RecordingService] Stream-decoding uploaded audio: {input_path}")
+            
+            with span('stt.decode'), self.recognizer_pool.engine() as engine:
+                # Compressed input: the total length is unknown until ffmpeg finishes
+                progress = DecodeProgress(None, engine.sample_rate)
+                session['progress'] = progress
+                decoder = StreamingDecoder(
+                    engine,
+                    wav_path,
+                    lambda result: self._handle_stream_result(session, result),
+                    sample_rate=engine.sample_rate,
+                    progress=progress
+                )
+                try:
+                    with open(input_path, 'rb') as f:
+                        while True:
+                            data = f.read(64 * 1024)
+                            if not data:
+                                break
+                            decoder.feed(data)
+                except RuntimeError:
+                    pass  # decoder.error is reported by finish()
+                
+                ok = decoder.finish(timeout=None)
+                self._record_vad_stats(session, engine.get_stats().get('vad'))
             
-            subprocess.run(cmd, check=True, capture_output=True)
-            print(f"[RecordingService] Converted {input_path} to {output_path}")
+            if not ok:
+                raise RuntimeError(decoder.error)
+            
+            progress.finish()
+            self._log_progress(session, progress)
+            print(f"[RecordingService] Transcription complete for {session_id}")
+            session['processing_complete'] = True
             
         except Exception as e:
-            print(f"[RecordingService] FFmpeg conversion failed: {e}")
-            # Fallback: try with pydub
+            print(f"[RecordingService] Streaming decode failed ({e}), converting to WAV instead")
+            session['aggregator'].clear()
+            session['transcript'] = self._recent_results()
+            
             try:
-                from pydub import AudioSegment
-                audio = AudioSegment.from_file(input_path)
-                audio = audio.set_frame_rate(16000).set_channels(1)
-                audio.export(output_path, format='wav')
-                print(f"[RecordingService] Converted using pydub")
+                self._convert_to_wav(input_path, wav_path)
             except Exception as e2:
-                print(f"[RecordingService] Pydub conversion also failed: {e2}")
-                raise
+                session['processing_complete'] = True
+                session['processing_error'] = str(e2)
+                count_error('conversion')
+                return
+            
+            self._process_uploaded_wav(session_id, wav_path)
+    
+    def append_audio_chunk(self, session_id, user_id, data, sequence):
+        """
+        Feed a timesliced audio chunk from the laptop into the live decoder
+        
+        Chunks must arrive in order; a repeated sequence number (client retry)
+        is acknowledged without being decoded twice.
+        
+        Returns:
+            dict: Stream status, or None if the session is unknown
+        
+        Raises:
+            ValueError: If a chunk is missing before this one
+            RuntimeError: If live decoding is unavailable (client should
+                          fall back to a full upload)
+        """
+        session = self.active_sessions.get(session_id)
+        
+        if not session or session['user_id'] != user_id:
+            return None
+        
+        session['last_activity'] = time.time()
+        
+        with session['stream_lock']:
+            if not session.get('running'):
+                raise RuntimeError("Session is stopping")
+            
+            expected = session['next_chunk_sequence']
+            if sequence < expected:
+                return self._stream_status(session, accepted=False)
+            if sequence > expected:
+                raise ValueError(f"Expected chunk {expected}, got {sequence}")
+            
+            decoder = session['stream_decoder']
+            if decoder is None:
+                decoder = self._start_stream(session)
+            
+            decoder.feed(data)
+            session['next_chunk_sequence'] = expected + 1
+            
+            return self._stream_status(session, accepted=True)
+    
+    def _start_stream(self, session):
+        """Check out a recognizer and start the session's live decoder"""
+        engine = self.recognizer_pool.acquire(timeout=self.config.get('stream_acquire_timeout', 2))
+        if engine is None:
+            raise RuntimeError("No recognizer free for live decoding")
+        
+        wav_path = os.path.join(session['session_folder'], f"{session['session_name']}.wav")
+        
+        # The whole live decode (up to the tail drained at stop) is one job
+        profile = None
+        if self.profile_requests.claim(session['session_name']):
+            session['logger'].log("Profiling live stream decode")
+            profile = lambda: profiled(session['session_folder'], session['session_name'], 'stream')
+        
+        try:
+            decoder = StreamingDecoder(
+                engine,
+                wav_path,
+                lambda result: self._handle_stream_result(session, result),
+                sample_rate=engine.sample_rate,
+                profile=profile
+            )
+        except Exception:
+            self.recognizer_pool.release(engine)
+            raise
+        
+        session['stream_engine'] = engine
+        session['stream_decoder'] = decoder
+        session['logger'].log("Live chunk decoding started")
+        print(f"[RecordingService] Live decoding started for {session['session_name']}")
+        return decoder
+    
+    def _stream_status(self, session, accepted):
+        """Summarize live decoding progress for the chunk endpoint"""
+        decoder = session['stream_decoder']
+        return {
+            'accepted': accepted,
+            'next_sequence': session['next_chunk_sequence'],
+            'bytes_received': decoder.bytes_in if decoder else 0,
+            'seconds_decoded': round(decoder.seconds_decoded, 2) if decoder else 0.0
+        }
+    
+    def _finish_stream(self, session):
+        """
+        Decode the tail of the live stream and release its recognizer
+        
+        Returns:
+            bool: True if the stream produced a complete transcript and WAV,
+                  or None if it was already finished or discarded
+        """
+        # Take the stream over so a concurrent discard (or a second finish)
+        # cannot release the same engine again
+        with session['stream_lock']:
+            decoder = session['stream_decoder']
+            engine = session['stream_engine']
+            session['stream_decoder'] = None
+            session['stream_engine'] = None
+        
+        if decoder is None or engine is None:
+            return None
+        
+        try:
+            ok = decoder.finish(timeout=self.config.get('stream_finish_timeout', 60))
+            if ok:
+                print(f"[RecordingService] Live stream finished "
+                      f"({decoder.seconds_decoded:.1f}s decoded)")
+            else:
+                print(f"[RecordingService] Live stream failed: {decoder.error}")
+                session['logger'].log(f"Live decoding failed: {decoder.error}", level="ERROR")
+            return ok
+        finally:
+            self._record_vad_stats(session, engine.get_stats().get('vad'))
+            self.recognizer_pool.release(engine)
+    
+    def _discard_stream(self, session):
+        """Abort a live stream whose results are being replaced by a full upload"""
+        with session['stream_lock']:
+            decoder = session['stream_decoder']
+            engine = session['stream_engine']
+            session['stream_decoder'] = None
+            session['stream_engine'] = None
+        
+        if decoder:
+            decoder.abort()
+        if engine:
+            self.recognizer_pool.release(engine)
+        
+        session['aggregator'].clear()
+        session['transcript'] = self._recent_results()
+        session['logger'].log("Live decoding discarded in favour of full upload")
+    
+    def _convert_to_wav(self, input_path, output_path):
+        """Convert audio file to WAV format for Vosk"""
+        with span('audio.convert'):
+            convert_to_wav(input_path, output_path, self.config['sample_rate'])
     
     def _process_uploaded_wav(self, session_id, wav_path):
         """Process the uploaded WAV file with Vosk"""
@@ -245,41 +721,25 @@ class RecordingService:
         try:
             print(f"[RecordingService] Processing uploaded audio: {wav_path}")
             
-            import wave
-            from vosk import KaldiRecognizer
+            progress = self._start_progress(session, wav_path)
             
-            wf = wave.open(wav_path, "rb")
-            recognizer = KaldiRecognizer(session['stt_engine'].model, wf.getframerate())
-            recognizer.SetWords(True)
+            if self.parallel_transcriber and self.parallel_transcriber.should_split(wav_path):
+                print(f"[RecordingService] Decoding in parallel "
+                      f"({self.parallel_transcriber.workers} workers)")
+                vad_stats = {} if self.parallel_transcriber.vad_options is not None else None
+                with span('stt.decode'):
+                    results = self.parallel_transcriber.transcribe(wav_path, vad_stats=vad_stats, progress=progress)
+                    self._collect_results(session, results)
+            else:
+                with span('stt.decode'), self.recognizer_pool.engine() as engine:
+                    recognizer = self._recognizer_for_wav(engine, wav_path)
+                    vad = self._make_vad(self._wav_rate(wav_path))
+                    self._collect_results(session, transcribe_range(recognizer, wav_path, vad=vad, progress=progress))
+                    vad_stats = vad.get_stats() if vad is not None else None
             
-            while True:
-                data = wf.readframes(4000)
-                if len(data) == 0:
-                    break
-                    
-                if recognizer.AcceptWaveform(data):
-                    result = json.loads(recognizer.Result())
-                    if result.get('text'):
-                        text = result['text']
-                        session['aggregator'].add_segment(text, result.get('result', []))
-                        session['transcript'].append({
-                            'text': text,
-                            'timestamp': datetime.now().isoformat(),
-                            'type': 'final'
-                        })
-                        print(f"[STT][final] {text}")
-            
-            # Get final result
-            final = json.loads(recognizer.FinalResult())
-            if final.get('text'):
-                text = final['text']
-                session['aggregator'].add_segment(text, final.get('result', []))
-                session['transcript'].append({
-                    'text': text,
-                    'timestamp': datetime.now().isoformat(),
-                    'type': 'final'
-                })
-                print(f"[STT][final] {text}")
+            progress.finish()
+            self._log_progress(session, progress)
+            self._record_vad_stats(session, vad_stats)
             
             print(f"[RecordingService] Transcription complete for {session_id}")
             
@@ -292,6 +752,142 @@ class RecordingService:
             traceback.print_exc()
             session['processing_complete'] = True
             session['processing_error'] = str(e)
+            count_error('transcription')
+    
+    def _wav_rate(self, wav_path):
+        """Read the sample rate from a WAV header"""
+        with wave.open(wav_path, "rb") as wf:
+            return wf.getframerate()
+    
+    def _recognizer_for_wav(self, engine, wav_path):
+        """Return the pooled recognizer, or a one-off one if the WAV rate differs"""
+        sample_rate = self._wav_rate(wav_path)
+        
+        if sample_rate == engine.sample_rate:
+            return engine.recognizer
+        
+        from vosk import KaldiRecognizer
+        recognizer = KaldiRecognizer(engine.model, sample_rate)
+        recognizer.SetWords(True)
+        return recognizer
+    
+    def _start_progress(self, session, wav_path):
+        """Attach a fresh DecodeProgress for a WAV decode to the session"""
+        with WavSource(wav_path) as source:
+            progress = DecodeProgress(source.frames, source.sample_rate)
+        session['progress'] = progress
+        return progress
+    
+    def _log_progress(self, session, progress):
+        """Log how fast a finished decode ran"""
+        snapshot = progress.snapshot()
+        if snapshot['real_time_factor'] is None:
+            return
+        
+        message = (f"Decoded {snapshot['audio_seconds_done']:.1f}s audio in "
+                   f"{snapshot['elapsed_seconds']:.1f}s (RTF {snapshot['real_time_factor']:.2f})")
+        print(f"[RecordingService] {message}")
+        session['logger'].log(message)
+    
+    def _progress_snapshot(self, session):
+        """
+        Get decode progress for a session
+        
+        Returns:
+            dict: DecodeProgress snapshot (local or reported by a worker),
+                  or None if decoding has not started
+        """
+        progress = session.get('progress')
+        if progress is None:
+            return None
+        if isinstance(progress, dict):
+            return dict(progress)
+        return progress.snapshot()
+    
+    def _real_time_factor(self, session):
+        """Decode seconds per second of audio for the session, if it was decoded"""
+        progress = self._progress_snapshot(session)
+        return progress.get('real_time_factor') if progress else None
+    
+    def _poll_interval(self, progress):
+        """Suggest how long a client should wait before polling again"""
+        if not progress or progress.get('eta_seconds') is None:
+            return 2.0
+        # Roughly ten updates over the remaining time, within 1-10 seconds
+        return round(min(10.0, max(1.0, progress['eta_seconds'] / 10.0)), 1)
+    
+    def _record_vad_stats(self, session, vad_stats):
+        """Keep VAD statistics on the session and log how much audio was skipped"""
+        if not vad_stats:
+            return
+        
+        session['vad_stats'] = vad_stats
+        message = (f"VAD skipped {vad_stats['skipped_seconds']:.1f}s of "
+                   f"{vad_stats['audio_seconds']:.1f}s audio "
+                   f"({vad_stats['skipped_ratio'] * 100:.0f}%)")
+        print(f"[RecordingService] {message}")
+        session['logger'].log(message)
+    
+    def _collect_results(self, session, results):
+        """
+        Add decoded final results to the session transcript
+        
+        Result times are offsets into the session's own WAV file (chunked
+        decodes add their chunk offset), so they are already relative to the
+        session's first sample.
+        """
+        for result in results:
+            if session.get('transcription_abandoned'):
+                # Finalization gave up on this decode; stop reading its results
+                break
+            text = result['text']
+            session['aggregator'].add_segment(text, result['words'], audio_time=result['start'])
+            session['transcript'].append({
+                'text': text,
+                'timestamp': datetime.now().isoformat(),
+                'type': 'final'
+            })
+            print(f"[STT][final] {text}")
+    
+    def _handle_stream_result(self, session, result):
+        """Apply a partial or final result from a streaming engine to the session"""
+        if session.get('transcription_abandoned'):
+            return
+        
+        if result['type'] == 'partial':
+            # Just for debugging – you can comment this if noisy
+            print(f"[STT][partial] {result['text']}")
+            
+            # Update partial results for real-time display
+            session['aggregator'].set_partial(result['text'])
+            if session['transcript'] and session['transcript'][-1].get('type') == 'partial':
+                session['transcript'][-1]['text'] = result['text']
+            else:
+                session['transcript'].append({
+                    'text': result['text'],
+                    'timestamp': datetime.now().isoformat(),
+                    'type': 'partial'
+                })
+        elif result['type'] == 'final':
+            print(f"[STT][final] {result['text']}")
+            # Add to transcript, placed by the first word's audio time. Engines
+            # get a fresh recognizer whenever they return to the pool
+            # (VoskSTTEngine.reset), so word times count from the session's
+            # first sample rather than from an earlier session's audio
+            words = result.get('words') or []
+            audio_time = words[0].get('start') if words else None
+            session['aggregator'].add_segment(result['text'], words, audio_time=audio_time)
+            # Remove any matching partial and add final
+            session['transcript'] = self._recent_results(
+                t for t in session['transcript']
+                if not (t.get('type') == 'partial' and t.get('text') == result['text'])
+            )
+            session['transcript'].append({
+                'text': result['text'],
+                'timestamp': datetime.now().isoformat(),
+                'type': 'final'
+            })
+            session['logger'].log(f"Transcribed: {result['text'][:50]}...")
     
     def _process_audio_stream(self, session_id):
         """Process audio stream in background thread"""
@@ -299,6 +895,8 @@ class RecordingService:
         if not session:
             return
         
+        engine = self.recognizer_pool.acquire()
+        
         try:
             while session['running']:
                 # Get audio block
@@ -308,49 +906,17 @@ class RecordingService:
                     continue
                 
                 # Process with STT
-                result = session['stt_engine'].process_audio(audio_block)
+                result = engine.process_audio(audio_block)
                 
                 if result:
-                    if result['type'] == 'partial':
-                        # Just for debugging – you can comment this if noisy
-                        print(f"[STT][partial] {result['text']}")
-                        
-                        # Update partial results for real-time display
-                        if session['transcript']:
-                            last_item = session['transcript'][-1]
-                            if last_item.get('type') == 'partial':
-                                last_item['text'] = result['text']
-                            else:
-                                session['transcript'].append({
-                                    'text': result['text'],
-                                    'timestamp': datetime.now().isoformat(),
-                                    'type': 'partial'
-                                })
-                        else:
-                            session['transcript'].append({
-                                'text': result['text'],
-                                'timestamp': datetime.now().isoformat(),
-                                'type': 'partial'
-                            })
-                    elif result['type'] == 'final':
-                        print(f"[STT][final] {result['text']}")
-                        # Add to transcript
-                        session['aggregator'].add_segment(result['text'], result.get('words'))
-                        # Remove any matching partial and add final
-                        session['transcript'] = [
-                            t for t in session['transcript']
-                            if not (t.get('type') == 'partial' and t.get('text') == result['text'])
-                        ]
-                        session['transcript'].append({
-                            'text': result['text'],
-                            'timestamp': datetime.now().isoformat(),
-                            'type': 'final'
-                        })
-                        session['logger'].log(f"Transcribed: {result['text'][:50]}...")
+                    self._handle_stream_result(session, result)
                 
         except Exception as e:
             print(f"[RecordingService] Error during streaming STT: {e}")
             session['logger'].log(f"Error during processing: {e}", level="ERROR")
+        finally:
+            self._record_vad_stats(session, engine.get_stats().get('vad'))
+            self.recognizer_pool.release(engine)
     
     def _offline_transcribe_from_wav(self, session):
         """
@@ -369,32 +935,38 @@ class RecordingService:
         print(f"[RecordingService] Running offline transcription on {wav_path} ...")
         
         try:
-            wf = wave.open(wav_path, "rb")
-            
-            # Sanity check – Vosk expects mono 16k 16-bit, but will usually cope if close
-            from vosk import KaldiRecognizer
-            recognizer = KaldiRecognizer(session['stt_engine'].model, wf.getframerate())
-            
-            while True:
-                data = wf.readframes(4000)
-                if len(data) == 0:
-                    break
-                if recognizer.AcceptWaveform(data):
-                    res = json.loads(recognizer.Result())
-                    if res.get('text'):
-                        session['aggregator'].add_segment(res['text'], res.get('result', []))
-                        print(f"[STT][offline-final] {res['text']}")
+            # Vosk expects mono 16k 16-bit, but will usually cope if close
+            progress = self._start_progress(session, wav_path)
+            with self.recognizer_pool.engine() as engine:
+                recognizer = self._recognizer_for_wav(engine, wav_path)
+                vad = self._make_vad(self._wav_rate(wav_path))
+                for res in transcribe_range(recognizer, wav_path, vad=vad, progress=progress):
+                    session['aggregator'].add_segment(res['text'], res['words'], audio_time=res['start'])
+                    print(f"[STT][offline-final] {res['text']}")
+            progress.finish()
             
-            final = json.loads(recognizer.FinalResult())
-            if final.get('text'):
-                session['aggregator'].add_segment(final['text'], final.get('result', []))
-                print(f"[STT][offline-final] {final['text']}")
+            self._record_vad_stats(session, vad.get_stats() if vad is not None else None)
             
         except Exception as e:
             print(f"[RecordingService] Offline transcription failed: {e}")
     
-    def stop_session(self, session_id, user_id):
-        """Stop recording session and process"""
+    def stop_session(self, session_id, user_id, app):
+        """
+        Stop a recording session and queue its finalization
+        
+        Returns as soon as the session is marked stopped; waiting for the
+        audio, saving the transcript, summarizing, writing metadata and
+        generating PDFs run in a background pipeline (see _finalize_session).
+        
+        Args:
+            session_id: Session to stop
+            user_id: Owner of the session
+            app: Flask application (the pipeline needs its app context)
+        
+        Returns:
+            dict: Finalization status (see get_finalization_status), or None
+                  if the session is unknown, already stopped or not owned
+        """
         if session_id not in self.active_sessions:
             print(f"Warning: Session {session_id} not found or already stopped")
             return None
@@ -409,121 +981,566 @@ class RecordingService:
             print(f"Warning: Session {session_id} already stopped")
             return None
         
-        try:
-            session['running'] = False
-            
-            # Stop recorder (if exists - old flow)
-            if 'recorder' in session:
-                session['recorder'].stop()
-            
-            # Wait for audio upload to complete (if not already)
-            if not session.get('audio_uploaded'):
-                print("[RecordingService] Waiting for audio upload...")
-                # Wait up to 30 seconds for upload
-                for i in range(30):
-                    if session.get('audio_uploaded'):
-                        break
-                    time.sleep(1)
-            
-            # Wait for processing to complete
-            if session.get('audio_uploaded'):
-                print("[RecordingService] Waiting for processing to complete...")
-                # Wait up to 60 seconds for processing
-                for i in range(60):
-                    if session.get('processing_complete'):
-                        print("[RecordingService] Processing complete!")
-                        break
-                    time.sleep(1)
-                    if i % 5 == 0:
-                        print(f"[RecordingService] Still processing... ({i}s)")
-            
-            # Get transcript
-            transcript_text = session['aggregator'].get_full_transcript()
-            if not transcript_text.strip():
-                print("[RecordingService] No transcript generated")
-            else:
-                print(f"[RecordingService] Transcript generated: {len(transcript_text)} characters")
-            
-            # Save transcript (whatever we have)
-            transcript_file = session['aggregator'].save_transcript()
-            
-            # Generate summary
-            transcript_text = session['aggregator'].get_full_transcript()
-            summary = None
-            summary_file = None
-            
-            if transcript_text.strip():
-                try:
-                    print("[RecordingService] Generating summary...")
-                    summary = session['summarizer'].generate_summary(transcript_text)
-                    summary_file = session['summarizer'].save_summary(
-                        summary,
-                        session['session_folder'],
-                        session['session_name']
-                    )
-                    print("[RecordingService] Summary generated successfully")
-                except Exception as e:
-                    print(f"[RecordingService] Summary generation failed: {e}")
-                    # Continue without summary - don't crash
-                    summary = "Summary generation failed."
-                    summary_file = None
-            else:
-                print("[RecordingService] Transcript still empty – skipping summary generation.")
+        session['running'] = False
+        session['duration'] = time.time() - session['start_time']
+        
+        # Stop recorder (if exists - old flow)
+        if 'recorder' in session:
+            session['recorder'].stop()
+        
+        recording = Recording.query.filter_by(id=session['recording_id']).first()
+        if recording:
+            recording.status = 'processing'
+            db.session.commit()
+        
+        self._queue_finalization(session_id, user_id, app)
+        
+        return self.get_finalization_status(session_id, user_id)
+    
+    def _queue_finalization(self, session_id, user_id, app):
+        """Register a stopped session's finalization and hand it to the executor"""
+        session = self.active_sessions[session_id]
+        self._prune_finalizations()
+        with self._finalize_lock:
+            self.finalizations[session_id] = {
+                'session_id': session_id,
+                'recording_id': session['recording_id'],
+                'user_id': user_id,
+                'status': 'queued',
+                'stage': None,
+                'stages': [{'name': name, 'status': 'pending'} for name in FINALIZE_STAGES],
+                'created_at': time.time(),
+                'finished_at': None,
+                'error': None,
+                'result': None
+            }
+        
+        self.finalize_executor.submit(tracing.bind(self._finalize_session), session_id, app)
+        print(f"[RecordingService] Finalization queued for session: {session_id}")
+    
+    def _finalize_session(self, session_id, app):
+        """Background pipeline: audio -> transcript -> summary -> metadata -> PDFs -> database"""
+        session = self.active_sessions.get(session_id)
+        if not session:
+            return
+        
+        with app.app_context(), session['timings'].activate(), trace_span('finalize'):
+            self._set_finalization(session_id, status='running')
             
-            # Save metadata
-            duration = time.time() - session['start_time']
-            self._save_metadata(session, duration)
+            try:
+                with self._stage(session_id, 'audio'):
+                    self._wait_for_audio(session)
+                
+                with self._stage(session_id, 'transcription'):
+                    self._wait_for_transcription(session)
+                    if session.get('resumed'):
+                        # Restart lost the recording clock; the decoded WAV knows
+                        session['duration'] = self._wav_seconds(session) or session['duration']
+                
+                # Connection is ready by the time the summary stage needs it
+                session['summarizer'].prewarm()
+                
+                with self._stage(session_id, 'transcript'):
+                    transcript_text = session['aggregator'].get_full_transcript()
+                    if not transcript_text.strip():
+                        print("[RecordingService] No transcript generated")
+                    else:
+                        print(f"[RecordingService] Transcript generated: {len(transcript_text)} characters")
+                    
+                    # Save transcript (whatever we have)
+                    transcript_file = session['aggregator'].save_transcript()
+                
+                with self._stage(session_id, 'summary'):
+                    summary_file = self._generate_summary(session, transcript_text)
+                
+                with self._stage(session_id, 'pdfs'):
+                    transcript_pdf, summary_pdf = self._generate_pdfs(session, transcript_file, summary_file)
+                
+                with self._stage(session_id, 'metadata'):
+                    self._save_metadata(session, session['duration'])
+                    
+                    # Close logger (safely)
+                    try:
+                        if 'logger' in session and session['logger']:
+                            session['logger'].close()
+                    except Exception as e:
+                        print(f"[RecordingService] Error closing logger: {e}")
+                
+                with self._stage(session_id, 'database'):
+                    recording = Recording.query.filter_by(id=session['recording_id']).first()
+                    if recording:
+                        recording.status = 'completed'
+                        recording.duration = session['duration']
+                        recording.audio_file_path = os.path.join(
+                            session['session_folder'],
+                            f"{session['session_name']}.wav"
+                        )
+                        recording.transcript_file_path = transcript_file
+                        recording.summary_file_path = summary_file
+                        recording.metadata_file_path = os.path.join(
+                            session['session_folder'],
+                            f"{session['session_name']}_meta.json"
+                        )
+                        if transcript_pdf:
+                            recording.transcript_pdf_path = transcript_pdf
+                        if summary_pdf:
+                            recording.summary_pdf_path = summary_pdf
+                        recording.stage_timings = json.dumps(session['timings'].as_dict())
+                        recording.real_time_factor = self._real_time_factor(session)
+                        db.session.commit()
+                
+                real_time_factor = self._real_time_factor(session)
+                if real_time_factor is not None:
+                    observe('stt.real_time_factor', real_time_factor)
+                
+                self._set_finalization(
+                    session_id,
+                    status='completed',
+                    stage=None,
+                    finished_at=time.time(),
+                    result={
+                        'session_name': session['session_name'],
+                        'transcript_file': transcript_file,
+                        'summary_file': summary_file,
+                        'transcript_pdf': transcript_pdf,
+                        'summary_pdf': summary_pdf,
+                        'has_transcript': transcript_file is not None,
+                        'has_summary': summary_file is not None,
+                        'duration': session['duration'],
+                        'progress': self._progress_snapshot(session)
+                    }
+                )
+                print(f"[RecordingService] Finalization complete for {session_id}")
+                
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                print(f"[RecordingService] Finalization failed for {session_id}: {e}")
+                count_error('finalization')
+                
+                # Update status to failed
+                db.session.rollback()
+                recording = Recording.query.filter_by(id=session['recording_id']).first()
+                if recording:
+                    recording.status = 'failed'
+                    db.session.commit()
+                
+                self._set_finalization(session_id, status='failed', finished_at=time.time(), error=str(e))
             
-            # Close logger (safely)
+            finally:
+                # Remove from active sessions
+                session['aggregator'].close_subscribers()
+                self.profile_requests.discard(session_id)
+                if session_id in self.active_sessions:
+                    del self.active_sessions[session_id]
+    
+    def _wait_for_audio(self, session):
+        """Finish the live stream, or wait for the laptop's upload"""
+        # Live chunked upload: only the last few seconds are left to decode
+        with session['stream_lock']:
+            streaming = session['stream_decoder'] is not None and session['stream_engine'] is not None
+        if streaming and not session.get('audio_uploaded'):
+            print("[RecordingService] Finishing live stream...")
+            # No full upload follows a live stream, so keep whatever it decoded
+            # (None: a full upload discarded the stream and takes over)
+            if self._finish_stream(session) is not None:
+                session['audio_uploaded'] = True
+                session['processing_complete'] = True
+        
+        # Wait for audio upload to complete (if not already)
+        if not session.get('audio_uploaded'):
+            print("[RecordingService] Waiting for audio upload...")
+            # Wait up to 30 seconds for upload
+            for i in range(30):
+                if session.get('audio_uploaded'):
+                    break
+                time.sleep(1)
+    
+    def _wait_for_transcription(self, session):
+        """Wait for the uploaded audio to be decoded"""
+        if not session.get('audio_uploaded'):
+            return
+        
+        print("[RecordingService] Waiting for processing to complete...")
+        timeout = self.config.get('finalize_transcription_timeout', 600)
+        waited = 0
+        while not session.get('processing_complete') and waited < timeout:
+            time.sleep(1)
+            waited += 1
+            if waited % 5 == 0:
+                print(f"[RecordingService] Still processing... ({waited}s)")
+        
+        if session.get('processing_complete'):
+            print("[RecordingService] Processing complete!")
+            return
+        
+        # Never save or summarize a transcript the decode is still changing
+        print(f"[RecordingService] Gave up waiting for transcription after {timeout}s")
+        self._abandon_transcription(session)
+        raise TimeoutError(f"Transcription did not finish within {timeout}s")
+    
+    def _abandon_transcription(self, session):
+        """Stop a decode that overran finalization from adding to the transcript"""
+        session['transcription_abandoned'] = True
+        
+        job_id = session.get('job_id')
+        if job_id is not None and self.job_queue is not None:
             try:
-                if 'logger' in session and session['logger']:
-                    session['logger'].close()
+                self.job_queue.cancel(job_id, "Abandoned after finalize timeout")
             except Exception as e:
-                print(f"[RecordingService] Error closing logger: {e}")
-            
-            # Update database
-            recording = Recording.query.filter_by(id=session['recording_id']).first()
-            if recording:
-                recording.status = 'completed'
-                recording.duration = duration
-                recording.audio_file_path = os.path.join(
-                    session['session_folder'],
-                    f"{session['session_name']}.wav"
+                print(f"[RecordingService] Could not cancel job {job_id}: {e}")
+        
+        session['logger'].log("Transcription abandoned after finalize timeout", level="ERROR")
+    
+    def _generate_summary(self, session, transcript_text):
+        """
+        Summarize the transcript and save it next to the recording
+        
+        Returns:
+            str: Summary file path, or None if there was nothing to summarize
+        """
+        if not transcript_text.strip():
+            print("[RecordingService] Transcript still empty – skipping summary generation.")
+            return None
+        
+        try:
+            print("[RecordingService] Generating summary...")
+            summary = session['summarizer'].generate_summary(
+                transcript_text,
+                segments=session['aggregator'].get_segment_texts()
+            )
+            summary_file = session['summarizer'].save_summary(
+                summary,
+                session['session_folder'],
+                session['session_name']
+            )
+            print("[RecordingService] Summary generated successfully")
+            return summary_file
+        except Exception as e:
+            print(f"[RecordingService] Summary generation failed: {e}")
+            count_error('summary')
+            # Continue without summary - don't crash
+            return None
+    
+    def _generate_pdfs(self, session, transcript_file, summary_file):
+        """
+        Render transcript and summary PDFs
+        
+        Returns:
+            tuple: (transcript_pdf, summary_pdf) paths, None where not created
+        """
+        transcript_pdf = None
+        summary_pdf = None
+        if self.pdf_generator is None:
+            return transcript_pdf, summary_pdf
+        
+        # Create transcript PDF if transcript file exists
+        if transcript_file and os.path.exists(transcript_file):
+            try:
+                transcript_pdf = self.pdf_generator.create_transcript_pdf(
+                    transcript_file, session['session_name']
                 )
-                recording.transcript_file_path = transcript_file
-                recording.summary_file_path = summary_file
-                recording.metadata_file_path = os.path.join(
-                    session['session_folder'],
-                    f"{session['session_name']}_meta.json"
+            except Exception as e:
+                print("[TRANSCRIPT PDF ERROR]", e)
+                count_error('pdf')
+        
+        # Create summary PDF if summary file exists
+        if summary_file and os.path.exists(summary_file):
+            try:
+                summary_pdf = self.pdf_generator.create_summary_pdf(
+                    summary_file, session['session_name']
                 )
-                db.session.commit()
-            
-            # Build result before removing from active sessions
-            result = {
-                'session_id': session_id,
-                'session_name': session['session_name'],
-                'transcript_file': transcript_file,
-                'summary_file': summary_file,
-                'duration': duration
-            }
-            
-            # Remove from active sessions
-            if session_id in self.active_sessions:
-                del self.active_sessions[session_id]
+            except Exception as e:
+                print("[SUMMARY PDF ERROR]", e)
+                count_error('pdf')
+        
+        return transcript_pdf, summary_pdf
+    
+    @contextmanager
+    def _stage(self, session_id, name):
+        """Mark a finalization stage running, then completed or failed (and time it)"""
+        with self._finalize_lock:
+            state = self.finalizations[session_id]
+            stage = next(s for s in state['stages'] if s['name'] == name)
+            state['stage'] = name
+            stage['status'] = 'running'
+            stage['started_at'] = time.time()
+        
+        try:
+            with span(f'finalize.{name}'):
+                yield
+        except Exception:
+            with self._finalize_lock:
+                stage['status'] = 'failed'
+                stage['finished_at'] = time.time()
+            raise
+        
+        with self._finalize_lock:
+            stage['status'] = 'completed'
+            stage['finished_at'] = time.time()
+    
+    def _set_finalization(self, session_id, **fields):
+        """Update a finalization status record"""
+        with self._finalize_lock:
+            self.finalizations[session_id].update(fields)
+    
+    def _prune_finalizations(self):
+        """Forget finished finalizations older than finalize_status_ttl"""
+        cutoff = time.time() - self.config.get('finalize_status_ttl', 3600)
+        with self._finalize_lock:
+            for session_id in [
+                sid for sid, state in self.finalizations.items()
+                if state['finished_at'] and state['finished_at'] < cutoff
+            ]:
+                del self.finalizations[session_id]
+    
+    def get_finalization_status(self, session_id, user_id):
+        """
+        Get progress of a stopped session's finalization pipeline
+        
+        Returns:
+            dict: status (queued/running/completed/failed), current stage,
+                  per-stage status and timings, result paths when completed;
+                  None if no finalization is known for this user's session
+        """
+        with self._finalize_lock:
+            state = self.finalizations.get(session_id)
+            if not state or state['user_id'] != user_id:
+                return None
             
-            return result
+            status = {key: value for key, value in state.items() if key != 'user_id'}
+            status['stages'] = [dict(stage) for stage in state['stages']]
+            status['result'] = dict(state['result']) if state['result'] else None
+        
+        now = time.time()
+        for stage in status['stages']:
+            if 'started_at' in stage:
+                stage['seconds'] = round((stage.get('finished_at') or now) - stage['started_at'], 3)
+        
+        session = self.active_sessions.get(session_id)
+        if session:
+            status['progress'] = self._progress_snapshot(session)
+        else:
+            status['progress'] = (status['result'] or {}).get('progress')
+        
+        if status['status'] in ('queued', 'running'):
+            status['poll_after_seconds'] = self._poll_interval(status['progress'])
+        else:
+            status['poll_after_seconds'] = None
+        return status
+    
+    def get_session_status(self, session_id, user_id):
+        """
+        Get status of a session that has not been stopped yet
+        
+        Returns:
+            dict: Same shape as get_finalization_status (status 'recording'),
+                  or None if the session is not active for this user
+        """
+        session = self.active_sessions.get(session_id)
+        if not session or session['user_id'] != user_id:
+            return None
+        
+        session['last_activity'] = time.time()
+        progress = self._progress_snapshot(session)
+        return {
+            'session_id': session_id,
+            'recording_id': session['recording_id'],
+            'status': 'recording',
+            'stage': None,
+            'stages': [],
+            'error': session.get('processing_error'),
+            'result': None,
+            'audio_uploaded': bool(session.get('audio_uploaded')),
+            'processing_complete': bool(session.get('processing_complete')),
+            'progress': progress,
+            'poll_after_seconds': self._poll_interval(progress)
+        }
+    
+    def recover_interrupted_sessions(self, app=None):
+        """
+        Rebuild transcripts of sessions cut off by a crash or restart
+        
+        Recordings still marked 'recording' or 'processing' at startup
+        whose upload is in the durable job queue (queued, running or
+        already decoded by a worker) are resumed: the job is watched again
+        and the session finalized as if it had been stopped. The others can
+        never finish; whatever their transcript journal holds is compacted
+        into the .txt and the recording is marked failed. Must be called
+        inside an application context.
+        
+        Args:
+            app: Flask application (resumed sessions are finalized with it)
+        
+        Returns:
+            int: Number of sessions resumed or transcripts recovered
+        """
+        recovered = 0
+        interrupted = Recording.query.filter(
+            Recording.status.in_(['recording', 'processing'])
+        ).all()
+        
+        for recording in interrupted:
+            session_folder = self.session_folder(recording.user_id, recording.session_id)
             
-        except Exception as e:
-            # Update status to failed
-            recording = Recording.query.filter_by(id=session['recording_id']).first()
-            if recording:
-                recording.status = 'failed'
-                db.session.commit()
+            job = None
+            if self.job_queue is not None and app is not None:
+                job = self.job_queue.latest_for_session(recording.session_id)
+            if job and job['status'] in ('queued', 'running', 'completed'):
+                try:
+                    self._resume_job(recording, session_folder, job, app)
+                    recovered += 1
+                    continue
+                except Exception as e:
+                    print(f"[RecordingService] Could not resume {recording.session_id}: {e}")
             
-            if session_id in self.active_sessions:
-                del self.active_sessions[session_id]
+            try:
+                aggregator = TranscriptAggregator.recover(
+                    session_folder,
+                    recording.session_id,
+                    sample_rate=self.config['sample_rate']
+                )
+                if aggregator is not None:
+                    recording.transcript_file_path = aggregator.save_transcript()
+                    recovered += 1
+                    print(f"[RecordingService] Recovered {len(aggregator.segments)} segments "
+                          f"for interrupted session {recording.session_id}")
+            except Exception as e:
+                print(f"[RecordingService] Could not recover {recording.session_id}: {e}")
             
-            raise Exception(f"Failed to stop recording: {str(e)}")
+            recording.status = 'failed'
+        
+        if interrupted:
+            db.session.commit()
+        return recovered
+    
+    def _resume_job(self, recording, session_folder, job, app):
+        """
+        Rebuild a session whose decode is in the job queue and finalize it
+        
+        Args:
+            recording: Recording row of the interrupted session
+            session_folder: Session folder
+            job: Latest job row of the session
+            app: Flask application
+        """
+        session_id = recording.session_id
+        aggregator = TranscriptAggregator(
+            session_folder,
+            session_id,
+            sample_rate=self.config['sample_rate'],
+            fsync_interval=self.config.get('transcript_fsync_seconds', 5)
+        )
+        # The job result is authoritative; replaying an old journal on top
+        # of it would duplicate segments
+        if os.path.exists(aggregator.journal_file):
+            os.remove(aggregator.journal_file)
+        
+        session = self._new_session(
+            recording.user_id, recording.id, session_folder, session_id, aggregator
+        )
+        if recording.created_at:
+            session['start_time'] = recording.created_at.timestamp()
+        session.update({
+            'running': False,
+            'audio_uploaded': True,
+            'job_id': job['id'],
+            'duration': recording.duration or 0.0,
+            'resumed': True
+        })
+        self.active_sessions[session_id] = session
+        
+        recording.status = 'processing'
+        db.session.commit()
+        
+        session['logger'].log(f"Resumed after restart - transcription job {job['id']} is {job['status']}")
+        print(f"[RecordingService] Resuming {session_id} (job {job['id']} {job['status']})")
+        self._queue_finalization(session_id, recording.user_id, app)
+    
+    def _wav_seconds(self, session):
+        """Length of the session's decoded WAV in seconds, or None"""
+        wav_path = os.path.join(session['session_folder'], f"{session['session_name']}.wav")
+        if not os.path.exists(wav_path):
+            return None
+        wav_format = probe_wav(wav_path)
+        if not wav_format:
+            return None
+        return wav_format['frames'] / float(wav_format['sample_rate'])
+    
+    def _recent_results(self, results=()):
+        """
+        Bounded list of the latest partial/final results of a session
+        
+        The full transcript lives in the aggregator; this only keeps the
+        tail, so a session left open for hours does not grow without limit.
+        """
+        return deque(results, maxlen=self.config.get('session_recent_results', 200))
+    
+    def session_idle_seconds(self, session):
+        """
+        Seconds since a session last saw audio or a client request
+        
+        Args:
+            session: Session dictionary
+        
+        Returns:
+            float: Idle time in seconds
+        """
+        return time.time() - session.get('last_activity', session['start_time'])
+    
+    def start_memory_watchdog(self, app):
+        """
+        Start the background memory watchdog (if enabled in config)
+        
+        Args:
+            app: Flask application, needed to finalize idle sessions
+        """
+        if not self.config.get('memory_watchdog_enabled', True) or self.memory_watchdog:
+            return
+        self.memory_watchdog = MemoryWatchdog(self, app, self.config)
+        self.memory_watchdog.start()
+    
+    def get_memory_report(self, include_growth=False):
+        """
+        Get process and per-session memory figures
+        
+        Args:
+            include_growth: Also report tracemalloc growth since the last report
+        
+        Returns:
+            dict: Memory report, or None if the watchdog is not running
+        """
+        if self.memory_watchdog is None:
+            return None
+        return self.memory_watchdog.get_report(include_growth)
+    
+    def request_profile(self, session_id):
+        """
+        Profile the next decode job of an active session
+        
+        Raises:
+            ValueError: If the session will not start another decode job
+                        (not active, or already decoding its live stream)
+        """
+        session = self.active_sessions.get(session_id)
+        if session is None or not session.get('running', True):
+            raise ValueError("Session is not recording")
+        if session.get('stream_decoder') is not None:
+            raise ValueError("Session is already decoding its live stream")
+        self.profile_requests.request_session(session_id)
+    
+    def get_profiles(self, recording):
+        """
+        List profile dumps of a recording
+        
+        Args:
+            recording: Recording row
+        
+        Returns:
+            tuple: (session folder, list of profile file details)
+        """
+        session_folder = self.session_folder(recording.user_id, recording.session_id)
+        return session_folder, list_profiles(session_folder)
     
     def _save_metadata(self, session, duration):
         """Save session metadata"""
@@ -552,25 +1569,93 @@ class RecordingService:
             'timezone': 'IST (UTC+5:30)'
         }
         
+        if session.get('vad_stats'):
+            metadata['vad'] = session['vad_stats']
+        
+        # Where the time went (stages finished so far; see instrumentation.py)
+        metadata['timings'] = session['timings'].as_dict()
+        metadata['real_time_factor'] = self._real_time_factor(session)
+        
         with open(meta_file, 'w') as f:
             json.dump(metadata, f, indent=2)
     
-    def get_transcript(self, session_id, user_id):
-        """Get current transcript for a session"""
+    def get_pool_status(self):
+        """Get recognizer pool occupancy"""
+        status = self.recognizer_pool.get_status()
+        status['active_sessions'] = len(self.active_sessions)
+        
+        # Per-session decode speed, to spot uploads falling behind
+        status['decoding'] = []
+        for session_id, session in list(self.active_sessions.items()):
+            progress = self._progress_snapshot(session)
+            if progress and progress['state'] == 'decoding':
+                status['decoding'].append({
+                    'session_id': session_id,
+                    'percent': progress['percent'],
+                    'real_time_factor': progress['real_time_factor'],
+                    'eta_seconds': progress['eta_seconds']
+                })
+        if self.job_queue:
+            status['transcription_jobs'] = self.job_queue.get_status()
+        return status
+    
+    def subscribe_transcript(self, session_id, user_id):
+        """
+        Register a live listener on a session's transcript
+        
+        Returns:
+            tuple: (aggregator, listener queue), or None if not found
+        """
         session = self.active_sessions.get(session_id)
         
         if not session or session['user_id'] != user_id:
             return None
         
+        session['last_activity'] = time.time()
+        aggregator = session['aggregator']
+        return aggregator, aggregator.subscribe()
+    
+    def get_transcript(self, session_id, user_id, since=None):
+        """
+        Get current transcript for a session
+        
+        Args:
+            session_id: Session to read
+            user_id: Owner of the session
+            since: Optional cursor from a previous response; only segments
+                   appended after it are returned (no full text)
+        """
+        session = self.active_sessions.get(session_id)
+        
+        if not session or session['user_id'] != user_id:
+            return None
+        
+        session['last_activity'] = time.time()
+        aggregator = session['aggregator']
+        
+        if since is not None:
+            segments, cursor, reset = aggregator.get_segments_since(since)
+            return {
+                'cursor': cursor,
+                'reset': reset,
+                'segments': segments,
+                'partial': aggregator.partial_text,
+                'word_count': aggregator.get_word_count(),
+                'char_count': aggregator.get_char_count(),
+                'segment_count': aggregator.get_segment_count()
+            }
+        
         # Get full transcript
-        full_text = session['aggregator'].get_full_transcript()
-        timestamped = session['aggregator'].get_timestamped_transcript()
+        full_text = aggregator.get_full_transcript()
+        timestamped = aggregator.get_timestamped_transcript()
         
         return {
+            'cursor': aggregator.version,
             'full_text': full_text,
             'segments': timestamped,
-            'word_count': session['aggregator'].get_word_count(),
-            'segment_count': session['aggregator'].get_segment_count()
+            'word_count': aggregator.get_word_count(),
+            'char_count': aggregator.get_char_count(),
+            'segment_count': aggregator.get_segment_count()
         }
     
     def delete_recording_files(self, recording):
@@ -579,6 +1664,7 @@ class RecordingService:
             files_to_delete = [
                 recording.audio_file_path,
                 recording.transcript_file_path,
+                sidecar_path(recording.transcript_file_path) if recording.transcript_file_path else None,
                 recording.summary_file_path,
                 recording.transcript_pdf_path,
                 recording.summary_pdf_path,
@@ -0,0 +1,179 @@
+"""
+Streaming Decoder
+Pipes compressed audio through a long-running ffmpeg process straight into
+a Vosk engine while the meeting is still being recorded
+"""
+
+import subprocess
+import threading
+import wave
+
+
+class StreamingDecoder:
+    # Bytes read from ffmpeg per recognizer call (4000 frames of 16-bit mono)
+    READ_SIZE = 8000
+
+    def __init__(self, engine, wav_path, on_result, sample_rate=16000, progress=None,
+                 profile=None):
+        """
+        Initialize streaming decoder and start ffmpeg
+
+        Args:
+            engine: VoskSTTEngine checked out for this stream
+            wav_path: Path of the archival WAV written from the decoded PCM
+            on_result: Callback receiving each engine result dict
+            sample_rate: Output sample rate (must match the engine)
+            progress: Optional DecodeProgress advanced as PCM is decoded
+            profile: Optional context manager factory wrapped around the
+                     decode thread (e.g. cProfile capture)
+        """
+        self.engine = engine
+        self.wav_path = wav_path
+        self.on_result = on_result
+        self.sample_rate = sample_rate
+        self.progress = progress
+        self.profile = profile
+
+        self.bytes_in = 0
+        self.frames_decoded = 0
+        self.error = None
+        self._closed = False
+
+        self._wav = wave.open(wav_path, 'wb')
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(sample_rate)
+
+        # ffmpeg sniffs the container from the stream itself
+        self._process = subprocess.Popen(
+            [
+                'ffmpeg', '-loglevel', 'error',
+                '-i', 'pipe:0',
+                '-ar', str(sample_rate),
+                '-ac', '1',
+                '-f', 's16le',
+                'pipe:1'
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+
+        self._reader = threading.Thread(target=self._run, daemon=True)
+        self._reader.start()
+
+    @property
+    def seconds_decoded(self):
+        """Seconds of audio decoded so far"""
+        return self.frames_decoded / float(self.sample_rate)
+
+    def feed(self, data):
+        """
+        Append compressed audio (e.g. a MediaRecorder timeslice)
+
+        Args:
+            data: Raw bytes continuing the same container stream
+        """
+        if self._closed:
+            raise RuntimeError("Streaming decoder already finished")
+        if self.error:
+            raise RuntimeError(f"Streaming decoder failed: {self.error}")
+
+        try:
+            self._process.stdin.write(data)
+            self._process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            self.error = f"ffmpeg stopped accepting input: {e}"
+            raise RuntimeError(self.error)
+
+        self.bytes_in += len(data)
+
+    def _run(self):
+        """Decode thread body"""
+        if self.profile is None:
+            self._read_loop()
+            return
+        with self.profile():
+            self._read_loop()
+
+    def _read_loop(self):
+        """Read PCM from ffmpeg, archive it and feed it to the recognizer"""
+        try:
+            pending = b''
+            while True:
+                data = self._process.stdout.read(self.READ_SIZE)
+                if not data:
+                    break
+
+                # Keep whole 16-bit samples together
+                data = pending + data
+                usable = len(data) - len(data) % 2
+                pending = data[usable:]
+                data = data[:usable]
+                if not data:
+                    continue
+
+                self._wav.writeframes(data)
+                self.frames_decoded += len(data) // 2
+
+                result = self.engine.process_audio(data)
+                if result:
+                    self.on_result(result)
+
+                if self.progress is not None:
+                    self.progress.advance(len(data) // 2)
+
+            self._process.wait()
+            if self._process.returncode not in (0, None) and not self.error:
+                stderr = self._process.stderr.read().decode('utf-8', errors='replace').strip()
+                self.error = f"ffmpeg exited with {self._process.returncode}: {stderr[-300:]}"
+        except Exception as e:
+            self.error = str(e)
+
+    def finish(self, timeout=60):
+        """
+        Close the input and drain whatever ffmpeg still has buffered
+
+        Args:
+            timeout: Seconds to wait for the tail to be decoded
+
+        Returns:
+            bool: True if the stream decoded cleanly
+        """
+        if not self._closed:
+            self._closed = True
+            try:
+                self._process.stdin.close()
+            except Exception:
+                pass
+
+        self._reader.join(timeout)
+        if self._reader.is_alive():
+            self.error = self.error or "Timed out decoding the end of the stream"
+            self._process.kill()
+            self._reader.join(5)
+
+        if not self.error:
+            final = self.engine.get_final_result()
+            if final:
+                self.on_result(final)
+
+        try:
+            self._wav.close()
+        except Exception:
+            pass
+
+        return self.error is None
+
+    def abort(self):
+        """Stop decoding immediately and discard the remainder"""
+        self._closed = True
+        try:
+            self._process.kill()
+        except Exception:
+            pass
+        self._reader.join(5)
+        try:
+            self._wav.close()
+        except Exception:
+            pass
@@ -0,0 +1,44 @@
+"""
+Tests for the in-process PolyphaseResampler
+"""
+
+import numpy as np
+import pytest
+
+from audio_format import PolyphaseResampler
+
+RATES = [(44100, 16000), (48000, 16000), (22050, 16000), (8000, 16000)]
+
+
+def _resample(in_rate, out_rate, samples, block=4096):
+    resampler = PolyphaseResampler(in_rate, out_rate)
+    parts = [resampler.process(samples[i:i + block]) for i in range(0, len(samples), block)]
+    parts.append(resampler.flush())
+    return np.concatenate(parts)
+
+
+@pytest.mark.parametrize('in_rate, out_rate', RATES)
+def test_dc_gain_is_unity(in_rate, out_rate):
+    out = _resample(in_rate, out_rate, np.full(in_rate, 1000.0))
+
+    settled = out[len(out) // 4:-len(out) // 4]
+    assert np.allclose(settled, 1000.0, rtol=0.01)
+
+
+@pytest.mark.parametrize('in_rate, out_rate', RATES)
+def test_tone_amplitude_and_length_are_kept(in_rate, out_rate):
+    t = np.arange(in_rate) / in_rate
+    out = _resample(in_rate, out_rate, 10000.0 * np.sin(2 * np.pi * 440 * t))
+
+    assert len(out) == out_rate
+    settled = out[len(out) // 4:-len(out) // 4]
+    assert np.max(np.abs(settled)) == pytest.approx(10000.0, rel=0.02)
+
+
+def test_block_size_does_not_change_output():
+    samples = np.random.default_rng(0).integers(-20000, 20000, 44100).astype(np.int16)
+
+    one_shot = _resample(44100, 16000, samples, block=len(samples))
+    streamed = _resample(44100, 16000, samples, block=333)
+
+    assert np.allclose(one_shot, streamed, atol=1e-2)
@@ -0,0 +1,122 @@
+"""
+Tests for the summarizer's CircuitBreaker and HttpClient retries
+"""
+
+import pytest
+import requests
+
+from http_client import CircuitBreaker, CircuitOpenError, HttpClient
+
+
+def _open(breaker):
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow()
+        breaker.record_failure()
+
+
+def _expire(breaker):
+    breaker.opened_at -= breaker.reset_seconds + 1
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # resets the streak
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+
+def test_half_open_lets_one_trial_through():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    _open(breaker)
+    _expire(breaker)
+
+    assert breaker.allow()
+    assert breaker.state == 'half_open'
+    assert not breaker.allow()  # trial still running
+
+
+def test_successful_trial_closes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    _open(breaker)
+    _expire(breaker)
+    breaker.allow()
+
+    breaker.record_success()
+
+    assert breaker.get_status() == {'state': 'closed', 'consecutive_failures': 0}
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_trial_reopens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    _open(breaker)
+    _expire(breaker)
+    breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+
+class FakeSession:
+    """Returns the given status codes (or raises the given exceptions) in turn"""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def post(self, url, timeout=None, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        response = requests.Response()
+        response.status_code = outcome
+        return response
+
+
+def _client(outcomes, breaker=None):
+    client = HttpClient(max_attempts=3, backoff_base=0, backoff_max=0, breaker=breaker)
+    client.session = FakeSession(outcomes)
+    return client
+
+
+def test_retries_count_as_one_breaker_outcome():
+    breaker = CircuitBreaker(failure_threshold=2)
+    client = _client([503, requests.exceptions.ConnectionError(), 200], breaker)
+
+    assert client.post('http://llm').status_code == 200
+    assert client.session.calls == 3
+    assert breaker.get_status() == {'state': 'closed', 'consecutive_failures': 0}
+
+
+def test_client_errors_are_not_retried_and_keep_the_circuit_closed():
+    breaker = CircuitBreaker(failure_threshold=1)
+    client = _client([400], breaker)
+
+    assert client.post('http://llm').status_code == 400
+    assert client.session.calls == 1
+    assert breaker.state == 'closed'
+
+
+def test_open_circuit_refuses_without_sending():
+    breaker = CircuitBreaker(failure_threshold=1)
+    client = _client([requests.exceptions.ConnectionError()] * 3, breaker)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.post('http://llm')
+    assert breaker.state == 'open'
+
+    calls = client.session.calls
+    with pytest.raises(CircuitOpenError):
+        client.post('http://llm')
+    assert client.session.calls == calls
@@ -0,0 +1,100 @@
+"""
+Tests for the durable transcription JobQueue
+"""
+
+import pytest
+
+from job_queue import JobQueue
+
+
+@pytest.fixture
+def job_queue(tmp_path):
+    return JobQueue(f"sqlite:///{tmp_path / 'jobs.db'}", stale_seconds=60, max_attempts=2)
+
+
+def _enqueue(job_queue, session_id='session'):
+    return job_queue.enqueue(1, session_id, '/tmp/in.webm', '/tmp/in.wav')
+
+
+def test_cancel_rejects_the_workers_heartbeat(job_queue):
+    job_id = _enqueue(job_queue)
+    job_queue.claim('worker-a')
+
+    assert job_queue.cancel(job_id, 'timed out')
+
+    assert not job_queue.heartbeat(job_id, 'worker-a')
+    assert not job_queue.complete(job_id, 'worker-a', '/tmp/result.json')
+    job = job_queue.get(job_id)
+    assert job['status'] == 'failed'
+    assert job['error'] == 'timed out'
+
+
+def test_cancel_leaves_finished_jobs_alone(job_queue):
+    job_id = _enqueue(job_queue)
+    job_queue.claim('worker-a')
+    job_queue.complete(job_id, 'worker-a', '/tmp/result.json')
+
+    assert not job_queue.cancel(job_id, 'timed out')
+    assert job_queue.get(job_id)['status'] == 'completed'
+
+
+def test_claim_takes_each_job_once(job_queue):
+    first = _enqueue(job_queue, 'one')
+    second = _enqueue(job_queue, 'two')
+
+    job_a = job_queue.claim('worker-a')
+    job_b = job_queue.claim('worker-b')
+
+    assert (job_a['id'], job_b['id']) == (first, second)
+    assert job_a['status'] == 'running' and job_a['attempts'] == 1
+    assert job_queue.claim('worker-c') is None
+
+
+def test_stale_job_is_reclaimed(job_queue):
+    job_id = _enqueue(job_queue)
+    job_queue.claim('worker-a')
+    job_queue.stale_seconds = -1  # every heartbeat is now too old
+
+    job = job_queue.claim('worker-b')
+
+    assert job['id'] == job_id
+    assert job['worker_id'] == 'worker-b'
+    assert job['attempts'] == 2
+    # The dead worker's claim is gone
+    assert not job_queue.heartbeat(job_id, 'worker-a')
+    assert job_queue.heartbeat(job_id, 'worker-b')
+
+
+def test_stale_job_out_of_attempts_fails(job_queue):
+    job_id = _enqueue(job_queue)
+    job_queue.claim('worker-a')
+    job_queue.stale_seconds = -1
+    job_queue.claim('worker-b')
+
+    assert job_queue.claim('worker-c') is None
+    job = job_queue.get(job_id)
+    assert job['status'] == 'failed'
+    assert job['error'] == 'Worker stopped responding'
+
+
+def test_fail_requeues_until_max_attempts(job_queue):
+    job_id = _enqueue(job_queue)
+
+    job_queue.claim('worker-a')
+    assert job_queue.fail(job_id, 'worker-a', 'boom') == 'queued'
+
+    job_queue.claim('worker-b')
+    assert job_queue.fail(job_id, 'worker-b', 'boom again') == 'failed'
+
+    job = job_queue.get(job_id)
+    assert job['error'] == 'boom again'
+    assert job['finished_at'] is not None
+    assert job_queue.claim('worker-c') is None
+
+
+def test_fail_from_a_lost_claim_is_ignored(job_queue):
+    job_id = _enqueue(job_queue)
+    job_queue.claim('worker-a')
+
+    assert job_queue.fail(job_id, 'worker-b', 'not mine') is None
+    assert job_queue.get(job_id)['status'] == 'running'
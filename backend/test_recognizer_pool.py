@@ -0,0 +1,107 @@
+"""
+Tests for RecognizerPool engine reuse
+"""
+
+import json
+import os
+import wave
+
+import pytest
+
+vosk = pytest.importorskip('vosk')
+if not hasattr(vosk, 'Model'):
+    # The repo's vosk/ scripts folder, not the Vosk package
+    pytest.skip('Vosk not installed', allow_module_level=True)
+
+import stt_engine
+from recognizer_pool import RecognizerPool
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+MODEL_PATH = os.path.join(REPO_DIR, 'vosk-model-small-en-in-0.4')
+SAMPLE_WAV = os.path.join(REPO_DIR, 'vosk', 'iot1.wav')
+
+
+class FakeRecognizer:
+    """
+    Stands in for KaldiRecognizer: one word per block, timed from a running
+    sample offset that Reset() keeps (as Vosk's does)
+    """
+
+    def __init__(self, model, sample_rate):
+        self.sample_rate = sample_rate
+        self.samples = 0
+        self.words = []
+
+    def SetWords(self, enabled):
+        pass
+
+    def AcceptWaveform(self, data):
+        start = self.samples / self.sample_rate
+        self.samples += len(data) // 2
+        self.words = [{'word': 'hello', 'start': start,
+                       'end': self.samples / self.sample_rate, 'conf': 1.0}]
+        return True
+
+    def Result(self):
+        return json.dumps({'text': 'hello', 'result': self.words})
+
+    def PartialResult(self):
+        return json.dumps({'partial': ''})
+
+    def FinalResult(self):
+        return json.dumps({'text': ''})
+
+    def Reset(self):
+        self.words = []
+
+
+def _decode(pool, audio):
+    engine = pool.acquire()
+    try:
+        result = engine.process_audio(audio)
+        return engine, result
+    finally:
+        pool.release(engine)
+
+
+def test_reused_engine_restarts_word_times(monkeypatch):
+    monkeypatch.setattr(stt_engine, 'KaldiRecognizer', FakeRecognizer)
+    pool = RecognizerPool(None, 16000, workers=1, preloaded_model=object())
+    one_second = b'\x00\x00' * 16000
+
+    first_engine, first = _decode(pool, one_second)
+    second_engine, second = _decode(pool, one_second)
+
+    assert second_engine is first_engine
+    assert first['words'][0]['start'] == 0.0
+    assert second['words'][0]['start'] == 0.0
+
+
+@pytest.mark.skipif(not os.path.isdir(MODEL_PATH), reason='Vosk model not present')
+def test_reused_engine_with_model():
+    with wave.open(SAMPLE_WAV, 'rb') as wf:
+        sample_rate = wf.getframerate()
+        audio = wf.readframes(wf.getnframes())
+
+    pool = RecognizerPool(MODEL_PATH, sample_rate, workers=1)
+
+    def first_word_start():
+        engine = pool.acquire()
+        try:
+            words = []
+            for i in range(0, len(audio), 8000):
+                result = engine.process_audio(audio[i:i + 8000])
+                if result and result['type'] == 'final':
+                    words.extend(result['words'])
+            final = engine.get_final_result()
+            if final:
+                words.extend(final.get('words', []))
+            return words[0]['start']
+        finally:
+            pool.release(engine)
+
+    first = first_word_start()
+    second = first_word_start()
+
+    assert pool.get_status()['engines_created'] == 1
+    assert abs(second - first) < 0.5
@@ -0,0 +1,94 @@
+"""
+Tests for the map-reduce summarizer's final prompt budget
+"""
+
+import threading
+
+from summarizer import OpenRouterSummarizer, estimate_tokens
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=''):
+        self.status_code = status_code
+        self._content = content
+
+    def json(self):
+        return {'choices': [{'message': {'content': self._content}}]}
+
+
+class FakeClient:
+    """Answers every chat request with reply(user message) and records the requests"""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def post(self, url, headers=None, json=None):
+        user_content = json['messages'][1]['content']
+        with self._lock:
+            self.requests.append(user_content)
+        content = self.reply(user_content)
+        return FakeResponse(500) if content is None else FakeResponse(200, content)
+
+    def prewarm(self, url):
+        pass
+
+
+def _partials(count, words=120):
+    return [' '.join(f'point{i}-{w}' for w in range(words)) for i in range(count)]
+
+
+def _summarizer(reply, chunk_tokens=400):
+    return OpenRouterSummarizer(chunk_tokens=chunk_tokens, workers=2, client=FakeClient(reply))
+
+
+def _joined_tokens(summarizer, partials):
+    return estimate_tokens(summarizer._join_partials(partials))
+
+
+def test_partials_are_combined_until_they_fit():
+    summarizer = _summarizer(lambda text: 'combined points')
+
+    reduced = summarizer._reduce_to_budget(_partials(30))
+
+    assert _joined_tokens(summarizer, reduced) <= summarizer.chunk_tokens
+    assert all(partial == 'combined points' for partial in reduced)
+
+
+def test_failing_api_still_trims_to_budget():
+    summarizer = _summarizer(lambda text: None)
+
+    reduced = summarizer._reduce_to_budget(_partials(30))
+
+    assert len(reduced) == 30
+    assert _joined_tokens(summarizer, reduced) <= summarizer.chunk_tokens
+
+
+def test_combine_that_does_not_shrink_is_trimmed():
+    # The model echoes its input, so no round makes progress
+    summarizer = _summarizer(lambda text: text)
+
+    reduced = summarizer._reduce_to_budget(_partials(12))
+
+    assert _joined_tokens(summarizer, reduced) <= summarizer.chunk_tokens
+
+
+def test_partials_within_budget_are_not_sent_again():
+    summarizer = _summarizer(lambda text: 'unused')
+    partials = ['short one', 'short two']
+
+    assert summarizer._reduce_to_budget(partials) == partials
+    assert summarizer.client.requests == []
+
+
+def test_final_request_of_long_transcript_fits_budget():
+    summarizer = _summarizer(lambda text: ' '.join(['summary'] * 60), chunk_tokens=300)
+    segments = _partials(40, words=40)
+
+    summarizer.generate_summary('\n'.join(segments), segments=segments)
+
+    final_request = summarizer.client.requests[-1]
+    partials_text = final_request.split('Partial summaries in order:\n\n', 1)[1]
+    partials_text = partials_text.rsplit('\n\nPlease combine', 1)[0]
+    assert estimate_tokens(partials_text) <= summarizer.chunk_tokens
@@ -0,0 +1,29 @@
+"""
+Tests for trace file rotation
+"""
+
+import json
+import os
+
+from tracing import TraceWriter
+
+
+def _event(i):
+    return {'name': f'span-{i}', 'ph': 'X', 'pid': 1, 'tid': 1, 'ts': i, 'dur': 1}
+
+
+def test_trace_file_rotates_and_keeps_backups(tmp_path):
+    path = str(tmp_path / 'trace.json')
+    writer = TraceWriter(path, max_bytes=500, backups=2)
+
+    for i in range(100):
+        writer.write(_event(i))
+
+    assert sorted(os.listdir(tmp_path)) == ['trace.1.json', 'trace.2.json', 'trace.json']
+    for name in os.listdir(tmp_path):
+        with open(tmp_path / name, encoding='utf-8') as f:
+            text = f.read()
+        assert os.path.getsize(tmp_path / name) < 500 + 200
+        # Each file is a loadable trace that names its thread
+        events = json.loads(text.rstrip().rstrip(',') + ']')
+        assert events[0]['name'] == 'thread_name'
@@ -0,0 +1,121 @@
+"""
+Tests for TranscriptAggregator ordering, delta reads and journal recovery
+"""
+
+import os
+
+from transcript_aggregator import TranscriptAggregator
+
+
+def _words(start, end):
+    return [{'word': 'w', 'start': start, 'end': end, 'conf': 1.0}]
+
+
+def test_out_of_order_segments_are_placed_by_audio_time(tmp_path):
+    aggregator = TranscriptAggregator(str(tmp_path), 'session', journal=False)
+
+    aggregator.add_segment('third', _words(20.0, 21.0), audio_time=20.0)
+    aggregator.add_segment('first', _words(1.0, 2.0), audio_time=1.0)
+    aggregator.add_segment('second', _words(10.0, 11.0), audio_time=10.0)
+
+    assert aggregator.get_segment_texts() == ['first', 'second', 'third']
+    assert aggregator.get_full_transcript() == 'first second third'
+    assert [s['timestamp'] for s in aggregator.segments] == ['00:00:01', '00:00:10', '00:00:20']
+
+
+def test_insert_inside_cached_text_rebuilds_it(tmp_path):
+    aggregator = TranscriptAggregator(str(tmp_path), 'session', journal=False)
+
+    aggregator.add_segment('late', audio_time=30.0)
+    assert aggregator.get_full_transcript() == 'late'
+
+    aggregator.add_segment('early', audio_time=5.0)
+
+    assert aggregator.get_full_transcript() == 'early late'
+    assert aggregator.get_char_count() == len('early late')
+    assert aggregator.get_word_count() == 2
+
+
+def test_segment_placed_by_first_word_time(tmp_path):
+    aggregator = TranscriptAggregator(str(tmp_path), 'session', journal=False)
+
+    aggregator.add_segment('hello there', _words(75.5, 76.0))
+
+    segment = aggregator.segments[0]
+    assert segment['elapsed_seconds'] == 75.5
+    assert segment['timestamp'] == '00:01:15'
+
+
+def test_delta_cursor_returns_new_segments_in_arrival_order(tmp_path):
+    aggregator = TranscriptAggregator(str(tmp_path), 'session', journal=False)
+    aggregator.add_segment('a', audio_time=10.0)
+
+    segments, cursor, reset = aggregator.get_segments_since(0)
+    assert [s['text'] for s in segments] == ['a'] and not reset
+
+    aggregator.add_segment('b', audio_time=20.0)
+    aggregator.add_segment('earlier', audio_time=5.0)
+
+    segments, new_cursor, reset = aggregator.get_segments_since(cursor)
+    assert [s['text'] for s in segments] == ['b', 'earlier']
+    assert not reset
+    assert aggregator.get_segments_since(new_cursor)[0] == []
+
+
+def test_delta_cursor_from_before_clear_resets(tmp_path):
+    aggregator = TranscriptAggregator(str(tmp_path), 'session', journal=False)
+    aggregator.add_segment('old', audio_time=1.0)
+    _, cursor, _ = aggregator.get_segments_since(0)
+
+    aggregator.clear()
+    aggregator.add_segment('new', audio_time=1.0)
+
+    segments, _, reset = aggregator.get_segments_since(cursor)
+    assert reset
+    assert [s['text'] for s in segments] == ['new']
+    # A cursor from the future (another process) also starts over
+    assert aggregator.get_segments_since(cursor + 100)[2]
+
+
+def test_recover_replays_journal_and_drops_torn_tail(tmp_path):
+    aggregator = TranscriptAggregator(str(tmp_path), 'session')
+    aggregator.add_segment('second', _words(12.0, 13.0), audio_time=12.0)
+    aggregator.add_segment('first', _words(2.0, 3.0), audio_time=2.0)
+    aggregator.sync()
+    # Crash in the middle of the next append
+    with open(aggregator.journal_file, 'a', encoding='utf-8') as f:
+        f.write('{"type": "segment", "text": "tor')
+
+    recovered = TranscriptAggregator.recover(str(tmp_path), 'session')
+
+    assert recovered.get_segment_texts() == ['first', 'second']
+    assert recovered.get_words(recovered.segments[0])[0]['start'] == 2.0
+    assert recovered.start_time == aggregator.start_time
+
+    # Appends continue on a clean line and survive another recovery
+    recovered.add_segment('third', audio_time=20.0)
+    recovered.sync()
+    again = TranscriptAggregator.recover(str(tmp_path), 'session')
+    assert again.get_segment_texts() == ['first', 'second', 'third']
+
+
+def test_recover_applies_clear(tmp_path):
+    aggregator = TranscriptAggregator(str(tmp_path), 'session')
+    aggregator.add_segment('discarded', audio_time=1.0)
+    aggregator.clear()
+    aggregator.add_segment('kept', audio_time=1.0)
+
+    recovered = TranscriptAggregator.recover(str(tmp_path), 'session')
+
+    assert recovered.get_segment_texts() == ['kept']
+
+
+def test_save_compacts_the_journal(tmp_path):
+    aggregator = TranscriptAggregator(str(tmp_path), 'session')
+    aggregator.add_segment('hello', audio_time=1.0)
+
+    transcript_file = aggregator.save_transcript()
+
+    assert os.path.exists(transcript_file)
+    assert not os.path.exists(aggregator.journal_file)
+    assert TranscriptAggregator.recover(str(tmp_path), 'session') is None
@@ -0,0 +1,206 @@
+"""
+Tracing
+Request/pipeline traces written as Chrome trace events (one per line) so
+a slow session can be opened after the fact in chrome://tracing or
+Perfetto. The trace context lives in a contextvar and is carried into
+background threads with bind().
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+
+# (trace_id, span_id, args inherited by child spans) of the running span
+_trace_context = contextvars.ContextVar('trace_context', default=None)
+
+_tracer = None
+
+
+class TraceWriter:
+    """Appends trace events to a file in Chrome's JSON array format"""
+
+    def __init__(self, path, max_bytes=None, backups=3):
+        """
+        Args:
+            path: Trace file; the array is left open (allowed by the
+                  format) so every event is a single appended line
+            max_bytes: Size at which the file is rotated (None = never)
+            backups: Rotated files kept (trace.1.json is the newest)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file = None
+        self._lock = threading.Lock()
+        self._named_threads = set()
+
+    def write(self, event):
+        """Append one event"""
+        line = json.dumps(event, separators=(',', ':'))
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')
+                if self._file.tell() == 0:
+                    self._file.write('[\n')
+
+            tid = event['tid']
+            if tid not in self._named_threads:
+                self._named_threads.add(tid)
+                self._file.write(json.dumps({
+                    'name': 'thread_name', 'ph': 'M', 'pid': event['pid'], 'tid': tid,
+                    'args': {'name': threading.current_thread().name}
+                }) + ',\n')
+
+            self._file.write(line + ',\n')
+            self._file.flush()
+
+            if self.max_bytes and self._file.tell() >= self.max_bytes:
+                self._rotate()
+
+    def _rotated_path(self, index):
+        root, ext = os.path.splitext(self.path)
+        return f"{root}.{index}{ext}"
+
+    def _rotate(self):
+        """Shift trace.json -> trace.1.json -> ... (call with _lock held)"""
+        self._file.close()
+        self._file = None
+        # Thread names are written again at the top of the new file
+        self._named_threads = set()
+
+        try:
+            if self.backups > 0:
+                for index in range(self.backups - 1, 0, -1):
+                    if os.path.exists(self._rotated_path(index)):
+                        os.replace(self._rotated_path(index), self._rotated_path(index + 1))
+                os.replace(self.path, self._rotated_path(1))
+            else:
+                os.remove(self.path)
+        except OSError as e:
+            print(f"[Tracing] Could not rotate {self.path}: {e}")
+
+
+def configure(path, max_bytes=None, backups=3):
+    """
+    Start writing traces
+
+    Args:
+        path: Trace file (None disables tracing)
+        max_bytes: Size at which the file is rotated (None = never)
+        backups: Rotated files kept
+    """
+    global _tracer
+    _tracer = TraceWriter(path, max_bytes, backups) if path else None
+    if _tracer:
+        print(f"[Tracing] Writing traces to {path}")
+
+
+def current_trace_id():
+    """
+    Returns:
+        str: Id of the trace running in this context, or None
+    """
+    context = _trace_context.get()
+    return context[0] if context else None
+
+
+@contextmanager
+def trace_span(name, root=False, **args):
+    """
+    Record a span of the current trace
+
+    Outside a trace (and when tracing is off) this does nothing, unless
+    root is set, which starts a new trace.
+
+    Args:
+        name: Span name
+        root: Start a new trace instead of joining the current one
+        **args: Attributes shown on the span; inherited by child spans
+    """
+    parent = _trace_context.get()
+    if _tracer is None or (parent is None and not root):
+        yield
+        return
+
+    if root or parent is None:
+        trace_id, parent_id, inherited = uuid.uuid4().hex[:16], None, {}
+    else:
+        trace_id, parent_id, inherited = parent
+
+    span_id = uuid.uuid4().hex[:8]
+    span_args = dict(inherited, **args)
+    token = _trace_context.set((trace_id, span_id, span_args))
+    start = time.monotonic_ns()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        end = time.monotonic_ns()
+        _trace_context.reset(token)
+
+        event_args = dict(span_args, trace_id=trace_id, span_id=span_id)
+        if parent_id:
+            event_args['parent_id'] = parent_id
+        if error:
+            event_args['error'] = error
+        try:
+            _tracer.write({
+                'name': name,
+                'cat': name.split('.', 1)[0],
+                'ph': 'X',
+                'ts': start // 1000,
+                'dur': (end - start) // 1000,
+                'pid': os.getpid(),
+                'tid': threading.get_native_id(),
+                'args': event_args
+            })
+        except Exception as e:
+            print(f"[Tracing] Could not write span {name}: {e}")
+
+
+def traced(name):
+    """
+    Decorator that starts a new trace for each call (used on routes)
+
+    A session_id keyword argument (the route's URL variable) is attached
+    to every span of the trace.
+
+    Args:
+        name: Root span name
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            attributes = {'session_id': kwargs['session_id']} if 'session_id' in kwargs else {}
+            with trace_span(name, root=True, **attributes):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def bind(fn):
+    """
+    Carry the caller's context (trace, active timings) into another thread
+
+    Args:
+        fn: Callable to run later, e.g. in an executor
+
+    Returns:
+        callable: Wrapped function
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return wrapper
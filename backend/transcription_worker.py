@@ -0,0 +1,259 @@
+"""
+Transcription Worker
+Claims decode jobs from the database queue and runs Vosk outside the web
+process. Start alongside app.py (with job_queue_enabled: true):
+
+    python transcription_worker.py --processes 2
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+
+import yaml
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+from job_queue import JobQueue
+from audio_format import convert_to_wav
+from chunked_transcriber import transcribe_range
+from decode_progress import DecodeProgress
+from instrumentation import Timings
+from transcript_aggregator import TranscriptAggregator
+from vad import VoiceActivityDetector, vad_options_from_config
+from wav_source import WavSource
+
+
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'meeting_transcriber.db')
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes', 'configs', 'recorder_config.yml')
+
+
+def load_config():
+    """Load recorder_config.yml (shared with the web process)"""
+    with open(CONFIG_PATH, 'r') as f:
+        return yaml.safe_load(f)
+
+
+def make_job_queue(config):
+    """Create the queue with the same settings the web process uses"""
+    return JobQueue(
+        f"sqlite:///{DB_PATH}",
+        stale_seconds=config.get('job_stale_seconds', 60),
+        max_attempts=config.get('job_max_attempts', 3)
+    )
+
+
+class JobLost(Exception):
+    """Raised when another worker has reclaimed the job being processed"""
+
+
+class TranscriptionWorker:
+    def __init__(self, job_queue, config, worker_id):
+        """
+        Initialize transcription worker
+
+        Args:
+            job_queue: JobQueue to claim from
+            config: Recorder configuration dictionary
+            worker_id: Unique id recorded on claimed jobs
+        """
+        self.job_queue = job_queue
+        self.config = config
+        self.worker_id = worker_id
+        self.poll_seconds = config.get('job_poll_seconds', 1)
+        self.heartbeat_seconds = config.get('job_heartbeat_seconds', 10)
+        self.model = None
+        self.progress = None  # DecodeProgress of the job being decoded
+
+    def _load_model(self):
+        """Load the Vosk model once per worker process"""
+        if self.model is None:
+            from vosk import Model
+            print(f"[TranscriptionWorker {self.worker_id}] Loading model: {self.config['model_path']}")
+            self.model = Model(self.config['model_path'])
+        return self.model
+
+    def run(self, stop_event=None):
+        """
+        Claim and process jobs until stop_event is set
+
+        Args:
+            stop_event: Optional threading/multiprocessing Event
+        """
+        self._load_model()
+        print(f"[TranscriptionWorker {self.worker_id}] Waiting for jobs")
+
+        while stop_event is None or not stop_event.is_set():
+            try:
+                job = self.job_queue.claim(self.worker_id)
+            except Exception as e:
+                print(f"[TranscriptionWorker {self.worker_id}] Could not claim job: {e}")
+                job = None
+
+            if job is None:
+                time.sleep(self.poll_seconds)
+                continue
+
+            self.process(job)
+
+    def process(self, job):
+        """
+        Run one claimed job, heartbeating until it finishes
+
+        Args:
+            job: Job row returned by JobQueue.claim()
+        """
+        print(f"[TranscriptionWorker {self.worker_id}] Job {job['id']} "
+              f"(attempt {job['attempts']}/{job['max_attempts']}): {job['session_id']}")
+
+        done = threading.Event()
+        lost = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop,
+            args=(job['id'], done, lost),
+            daemon=True
+        )
+        heartbeat.start()
+
+        self.progress = None
+        try:
+            result_path = self._transcribe(job, lost)
+            progress = self.progress.snapshot() if self.progress else None
+            if self.job_queue.complete(job['id'], self.worker_id, result_path, progress):
+                print(f"[TranscriptionWorker {self.worker_id}] Job {job['id']} completed")
+            else:
+                print(f"[TranscriptionWorker {self.worker_id}] Job {job['id']} was reclaimed; result discarded")
+        except JobLost:
+            print(f"[TranscriptionWorker {self.worker_id}] Job {job['id']} was reclaimed; stopped")
+        except Exception as e:
+            status = self.job_queue.fail(job['id'], self.worker_id, e)
+            print(f"[TranscriptionWorker {self.worker_id}] Job {job['id']} failed ({e}); now {status}")
+        finally:
+            done.set()
+            heartbeat.join()
+
+    def _heartbeat_loop(self, job_id, done, lost):
+        """Refresh the job's heartbeat until done; flag lost if reclaimed"""
+        while not done.wait(self.heartbeat_seconds):
+            try:
+                progress = self.progress.snapshot() if self.progress else None
+                if not self.job_queue.heartbeat(job_id, self.worker_id, progress):
+                    lost.set()
+                    return
+            except Exception as e:
+                print(f"[TranscriptionWorker {self.worker_id}] Heartbeat failed: {e}")
+
+    def _transcribe(self, job, lost):
+        """
+        Convert (if needed) and decode a job's audio
+
+        Returns:
+            str: Path of the JSON result file
+        """
+        from vosk import KaldiRecognizer
+
+        timings = Timings()
+        audio_path, wav_path = job['audio_path'], job['wav_path']
+        if audio_path != wav_path:
+            with timings.span('audio.convert'):
+                convert_to_wav(audio_path, wav_path, self.config['sample_rate'])
+
+        with WavSource(wav_path) as source:
+            sample_rate = source.sample_rate
+            self.progress = DecodeProgress(source.frames, sample_rate)
+
+        recognizer = KaldiRecognizer(self._load_model(), sample_rate)
+        recognizer.SetWords(True)
+
+        vad_options = vad_options_from_config(self.config)
+        vad = VoiceActivityDetector(sample_rate, **vad_options) if vad_options is not None else None
+
+        segments = []
+        with timings.span('stt.decode'):
+            for result in transcribe_range(recognizer, wav_path, vad=vad, progress=self.progress):
+                if lost.is_set():
+                    raise JobLost()
+                segments.append(result)
+        self.progress.finish()
+
+        session_folder = os.path.dirname(wav_path)
+        session_name = job['session_id']
+
+        result_path = os.path.join(session_folder, f"{session_name}_segments.json")
+        with open(result_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'job_id': job['id'],
+                'segments': segments,
+                'vad': vad.get_stats() if vad is not None else None,
+                'timings': timings.as_dict()
+            }, f)
+
+        # Keep the Recording usable even if the web process never collects it
+        # (no journal: the segments are already in memory, and the web
+        # process may hold its own journal for this session)
+        aggregator = TranscriptAggregator(session_folder, session_name,
+                                          sample_rate=sample_rate, journal=False)
+        for segment in segments:
+            aggregator.add_segment(segment['text'], segment['words'], audio_time=segment['start'])
+        transcript_file = aggregator.save_transcript()
+
+        self.job_queue.update_recording(
+            job['recording_id'],
+            audio_file_path=wav_path,
+            transcript_file_path=transcript_file
+        )
+
+        return result_path
+
+
+def run_worker(index):
+    """Process entry point: one model, one job at a time"""
+    config = load_config()
+    worker_id = f"{socket.gethostname()}-{os.getpid()}-{index}"
+    worker = TranscriptionWorker(make_job_queue(config), config, worker_id)
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run transcription workers for the job queue")
+    parser.add_argument('--processes', type=int, default=1,
+                        help="Worker processes (each loads its own Vosk model)")
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        run_worker(0)
+        return
+
+    # Supervise the workers and replace any that die; their jobs are
+    # reclaimed by the others once the heartbeat goes stale
+    processes = {}
+    try:
+        while True:
+            for index in range(args.processes):
+                process = processes.get(index)
+                if process is None or not process.is_alive():
+                    if process is not None:
+                        print(f"[TranscriptionWorker] Worker {index} exited ({process.exitcode}); restarting")
+                    process = multiprocessing.Process(target=run_worker, args=(index,), daemon=True)
+                    process.start()
+                    processes[index] = process
+            time.sleep(5)
+    except KeyboardInterrupt:
+        print("[TranscriptionWorker] Shutting down")
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.join(10)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,9 @@ import { useAuth } from '../contexts/AuthContext'
 import axios from 'axios'
 import { Mic, Square, ArrowLeft, Loader, Moon, Sun, Activity, AlertCircle } from 'lucide-react'
 
+// Order transcript segments by their position in the audio
+const bySegmentTime = (a, b) => a.elapsed_seconds - b.elapsed_seconds || a.seq - b.seq
+
 const Recording = () => {
   const { user } = useAuth()
   const navigate = useNavigate()
@@ -13,10 +16,14 @@ const Recording = () => {
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState('')
   const [recordingTime, setRecordingTime] = useState(0)
+  const [processingStage, setProcessingStage] = useState(null)
   const [darkMode, setDarkMode] = useState(() => {
     return localStorage.getItem('darkMode') === 'true'
   })
   const transcriptIntervalRef = useRef(null)
+  const transcriptSourceRef = useRef(null)
+  const transcriptCursorRef = useRef(0)
+  const transcriptSegmentsRef = useRef([])
   const timerIntervalRef = useRef(null)
 
   useEffect(() => {
@@ -34,10 +41,7 @@ const Recording = () => {
 
   useEffect(() => {
     return () => {
-      if (transcriptIntervalRef.current) {
-        clearInterval(transcriptIntervalRef.current)
-        transcriptIntervalRef.current = null
-      }
+      stopTranscriptUpdates()
       if (timerIntervalRef.current) {
         clearInterval(timerIntervalRef.current)
         timerIntervalRef.current = null
@@ -89,12 +93,6 @@ const Recording = () => {
 
       const audioChunks = []
 
-      mediaRecorder.ondataavailable = (event) => {
-        if (event.data.size > 0) {
-          audioChunks.push(event.data)
-        }
-      }
-
       // Start backend session FIRST
       const response = await axios.post('/api/recordings/start', {
         title: `Recording ${new Date().toLocaleString()}`
@@ -103,10 +101,52 @@ const Recording = () => {
       const newSessionId = response.data.session_id
       setSessionId(newSessionId)
 
+      // Stream each timeslice to the backend while recording, so only the
+      // last few seconds are left to transcribe when we stop
+      let chunkSequence = 0
+      let streamingOk = true
+      let chunkUploads = Promise.resolve()
+
+      mediaRecorder.ondataavailable = (event) => {
+        if (event.data.size > 0) {
+          audioChunks.push(event.data)
+
+          const sequence = chunkSequence++
+          const chunk = event.data
+          chunkUploads = chunkUploads.then(async () => {
+            if (!streamingOk) return
+            try {
+              await axios.post(`/api/recordings/${newSessionId}/chunk?seq=${sequence}`, chunk, {
+                headers: {
+                  'Content-Type': 'application/octet-stream'
+                },
+                timeout: 30000
+              })
+            } catch (error) {
+              // Fall back to uploading the whole recording on stop
+              streamingOk = false
+              console.warn('Live chunk upload failed, will upload full recording:', error.response?.data?.error || error.message)
+            }
+          })
+        }
+      }
+
+      let resolveUpload
+      const uploadDone = new Promise(resolve => { resolveUpload = resolve })
+
       mediaRecorder.onstop = async () => {
         // Stop all tracks
         stream.getTracks().forEach(track => track.stop())
 
+        // Wait for the final timeslice to reach the backend
+        await chunkUploads
+
+        if (streamingOk && chunkSequence > 0) {
+          console.log('✓ Audio streamed live, nothing left to upload')
+          resolveUpload()
+          return
+        }
+
         // Create audio blob
         const audioBlob = new Blob(audioChunks, { type: 'audio/webm' })
         
@@ -129,28 +169,30 @@ const Recording = () => {
           console.error('Failed to upload audio:', error)
           setError('Failed to upload audio: ' + (error.response?.data?.error || error.message))
         }
+        resolveUpload()
       }
       
       // Store mediaRecorder for later
       window.currentMediaRecorder = mediaRecorder
       window.currentSessionId = newSessionId
+      window.currentUploadDone = uploadDone
 
       // Start recording
-      mediaRecorder.start(1000) // Capture in 1-second chunks
+      mediaRecorder.start(1000) // Capture in 1-second chunks (streamed live)
 
       setIsRecording(true)
       setLoading(false)
       setRecordingTime(0)
 
-      // Start polling for live transcript
-      transcriptIntervalRef.current = setInterval(fetchTranscript, 2000)
+      // Live transcript pushed from the backend (polls if push is unavailable)
+      startTranscriptStream(newSessionId)
       
       // Start timer
       timerIntervalRef.current = setInterval(() => {
         setRecordingTime(prev => prev + 1)
       }, 1000)
 
-      console.log('✓ Recording started on laptop, will upload to Pi when stopped')
+      console.log('✓ Recording started on laptop, streaming audio to Pi')
     } catch (error) {
       setError(error.response?.data?.error || error.message || 'Failed to start recording')
       setLoading(false)
@@ -163,10 +205,7 @@ const Recording = () => {
     if (loading || !sessionId) return
 
     try {
-      if (transcriptIntervalRef.current) {
-        clearInterval(transcriptIntervalRef.current)
-        transcriptIntervalRef.current = null
-      }
+      stopTranscriptUpdates()
       if (timerIntervalRef.current) {
         clearInterval(timerIntervalRef.current)
         timerIntervalRef.current = null
@@ -175,18 +214,26 @@ const Recording = () => {
       setLoading(true)
       setIsRecording(false)
 
-      // Stop the MediaRecorder (this triggers upload)
+      // Stop the MediaRecorder (this flushes the last chunk / triggers upload)
       if (window.currentMediaRecorder && window.currentMediaRecorder.state !== 'inactive') {
         window.currentMediaRecorder.stop()
       }
 
-      // Wait for upload to complete (increased time)
+      // Wait for the last chunk (or fallback upload) to complete
       console.log('Waiting for upload to complete...')
-      await new Promise(resolve => setTimeout(resolve, 5000))
+      await Promise.race([
+        window.currentUploadDone || Promise.resolve(),
+        new Promise(resolve => setTimeout(resolve, 130000))
+      ])
 
-      // Tell backend to process the uploaded audio
+      // Tell backend to process the uploaded audio; it finalizes in the background
       console.log('Telling backend to process...')
       const response = await axios.post(`/api/recordings/${sessionId}/stop`)
+      const job = await waitForProcessing(response.data.status_url)
+
+      if (job?.status === 'failed') {
+        console.error('Processing failed:', job.error)
+      }
 
       if (response.data.recording?.id) {
         navigate(`/recording/${response.data.recording.id}`)
@@ -201,16 +248,112 @@ const Recording = () => {
     }
   }
 
-  const fetchTranscript = async () => {
-    if (!sessionId) return
+  const waitForProcessing = async (statusUrl) => {
+    // Poll the finalization pipeline (transcript, summary, PDFs) until it settles,
+    // as often as the server suggests based on the decode ETA
+    const deadline = Date.now() + 15 * 60 * 1000
+    let delay = 1500
+    while (statusUrl && Date.now() < deadline) {
+      try {
+        const { data } = await axios.get(statusUrl)
+        const job = data.job
+        const percent = job.progress?.percent
+        setProcessingStage(
+          job.stage === 'transcription' && percent != null
+            ? `transcription ${Math.round(percent)}%`
+            : job.stage
+        )
+        if (job.status === 'completed' || job.status === 'failed') {
+          return job
+        }
+        delay = (job.poll_after_seconds || 1.5) * 1000
+      } catch (error) {
+        console.error('Status poll error:', error)
+      }
+      await new Promise(resolve => setTimeout(resolve, delay))
+    }
+    return null
+  }
+
+  const startTranscriptStream = (sid) => {
+    const token = (localStorage.getItem('token') || '').trim()
+    const url = `${axios.defaults.baseURL || ''}/api/recordings/${sid}/events?jwt=${encodeURIComponent(token)}`
+
+    // Segments by seq; the server only sends what is new or changed, and a
+    // segment may belong earlier in the audio than ones already shown
+    let segments = new Map()
+    let partial = ''
+    const render = () => {
+      const texts = [...segments.values()].sort(bySegmentTime).map(segment => segment.text)
+      setTranscript([...texts, partial].filter(Boolean).join(' '))
+    }
+
+    const source = new EventSource(url)
+    transcriptSourceRef.current = source
+
+    source.addEventListener('snapshot', (event) => {
+      const data = JSON.parse(event.data)
+      segments = new Map()
+      data.segments.forEach(segment => { segments.set(segment.seq, segment) })
+      partial = data.partial || ''
+      render()
+    })
+    source.addEventListener('segment', (event) => {
+      const segment = JSON.parse(event.data)
+      segments.set(segment.seq, segment)
+      partial = ''
+      render()
+    })
+    source.addEventListener('partial', (event) => {
+      partial = JSON.parse(event.data).text
+      render()
+    })
+    source.addEventListener('end', () => {
+      source.close()
+    })
+    source.onerror = () => {
+      // EventSource retries transient drops itself; CLOSED means push is unavailable
+      if (source.readyState === EventSource.CLOSED && transcriptSourceRef.current === source) {
+        console.warn('Live transcript stream unavailable, falling back to polling')
+        transcriptSourceRef.current = null
+        transcriptCursorRef.current = 0
+        transcriptSegmentsRef.current = []
+        transcriptIntervalRef.current = setInterval(() => fetchTranscript(sid), 2000)
+      }
+    }
+  }
+
+  const stopTranscriptUpdates = () => {
+    if (transcriptSourceRef.current) {
+      transcriptSourceRef.current.close()
+      transcriptSourceRef.current = null
+    }
+    if (transcriptIntervalRef.current) {
+      clearInterval(transcriptIntervalRef.current)
+      transcriptIntervalRef.current = null
+    }
+  }
+
+  const fetchTranscript = async (sid = sessionId) => {
+    if (!sid) return
 
     try {
-      const response = await axios.get(`/api/recordings/${sessionId}/transcript`, {
+      // Only ask for segments added since the last poll
+      const response = await axios.get(`/api/recordings/${sid}/transcript`, {
+        params: { since: transcriptCursorRef.current },
         timeout: 5000 // 5 second timeout
       })
-      if (response.data.transcript) {
-        const fullText = response.data.transcript.full_text || ''
-        setTranscript(fullText)
+      const delta = response.data.transcript
+      if (delta) {
+        if (delta.reset) {
+          transcriptSegmentsRef.current = []
+        }
+        // New segments can belong anywhere in the audio - keep them in audio order
+        transcriptSegmentsRef.current = [...transcriptSegmentsRef.current, ...delta.segments]
+          .sort(bySegmentTime)
+        transcriptCursorRef.current = delta.cursor
+        const texts = transcriptSegmentsRef.current.map(segment => segment.text)
+        setTranscript([...texts, delta.partial].filter(Boolean).join(' '))
       }
     } catch (error) {
       // Silently handle errors during polling - backend might be processing
@@ -300,7 +443,7 @@ const Recording = () => {
                 {loading ? (
                   <>
                     <Loader className="w-5 h-5 animate-spin" />
-                    <span>Starting...</span>
+                    <span>{processingStage ? `Processing (${processingStage})...` : 'Starting...'}</span>
                   </>
                 ) : (
                   <>
@@ -126,7 +126,8 @@ cat > start_backend.sh << 'EOF'
 cd "$(dirname "$0")/backend"
 source venv/bin/activate
 echo "Starting backend server on http://0.0.0.0:5000"
-gunicorn -w 1 -b 0.0.0.0:5000 --timeout 120 app:app
+# Single process (sessions live in memory); threads keep live transcript streams from blocking the API
+gunicorn -w 1 -k gthread --threads 8 -b 0.0.0.0:5000 --timeout 120 app:app
 EOF
 chmod +x start_backend.sh
 
@@ -0,0 +1,284 @@
+"""
+Chunked Transcriber Module
+Decodes WAV files with Vosk, either sequentially or split at silence
+points and spread across a pool of worker processes
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from vad import VoiceActivityDetector, merge_vad_stats
+from wav_source import WavSource, accept_waveform
+
+
+# Vosk model loaded once per worker process (see _init_worker)
+_worker_model = None
+
+
+def transcribe_range(recognizer, wav_path, start_frame=0, end_frame=None, block_frames=4000, vad=None,
+                     progress=None):
+    """
+    Decode a frame range of a WAV file with an existing recognizer
+
+    Word timings reported by Vosk are relative to the first frame fed to
+    the recognizer, so they are mapped back through the VAD (if any) and
+    shifted by the range start to give times relative to the file.
+
+    Args:
+        recognizer: KaldiRecognizer (fresh or reset) with SetWords(True)
+        wav_path: Path to a 16-bit PCM WAV file (memory-mapped)
+        start_frame: First frame to decode
+        end_frame: Frame to stop at (None = end of file)
+        block_frames: Frames fed to the recognizer per call
+        vad: Optional VoiceActivityDetector (fresh or reset) to skip silence
+        progress: Optional DecodeProgress advanced as blocks are consumed
+
+    Yields:
+        dict: Final results with 'text', 'words', 'start' and 'end' keys
+              (times in seconds of audio)
+    """
+    with WavSource(wav_path) as source:
+        rate = source.sample_rate
+        if end_frame is None:
+            end_frame = source.frames
+
+        offset = start_frame / rate
+        position = start_frame
+        time_map = vad.to_audio_time if vad is not None else None
+
+        for position, data in source.blocks(start_frame, end_frame, block_frames):
+            blocks = vad.filter(data) if vad is not None else (data,)
+            for block in blocks:
+                if accept_waveform(recognizer, block):
+                    result = _build_result(json.loads(recognizer.Result()), offset, position / rate, time_map)
+                    if result:
+                        yield result
+
+            if progress is not None:
+                progress.advance(len(data) // source.frame_size)
+
+        final = _build_result(json.loads(recognizer.FinalResult()), offset, position / rate, time_map)
+        if final:
+            yield final
+
+
+def _build_result(raw, offset, position_seconds, time_map=None):
+    """
+    Convert a raw Vosk result into an audio-relative segment
+
+    Args:
+        raw: Parsed Vosk JSON result
+        offset: Seconds to add to every word timing
+        position_seconds: Current decode position (used when no word timings)
+        time_map: Optional function mapping recognizer time to audio time
+
+    Returns:
+        dict: Segment dictionary or None for empty results
+    """
+    text = raw.get('text', '').strip()
+    if not text:
+        return None
+
+    words = []
+    for word in raw.get('result', []):
+        word = dict(word)
+        start, end = word.get('start', 0.0), word.get('end', 0.0)
+        if time_map is not None:
+            start, end = time_map(start), time_map(end)
+        word['start'] = start + offset
+        word['end'] = end + offset
+        words.append(word)
+
+    if words:
+        start, end = words[0]['start'], words[-1]['end']
+    else:
+        start = end = position_seconds
+
+    return {
+        'text': text,
+        'words': words,
+        'start': start,
+        'end': end
+    }
+
+
+def find_split_points(wav_path, chunk_seconds, search_seconds=5.0, frame_ms=100):
+    """
+    Choose chunk boundaries at the quietest point near each target cut
+
+    Args:
+        wav_path: Path to a 16-bit PCM WAV file
+        chunk_seconds: Target chunk length in seconds
+        search_seconds: Window either side of a target cut to look for silence
+        frame_ms: Energy analysis frame length in milliseconds
+
+    Returns:
+        list: (start_frame, end_frame) tuples covering the whole file
+    """
+    with WavSource(wav_path) as source:
+        rate = source.sample_rate
+        channels = source.channels
+        total_frames = source.frames
+
+        frames_per_window = max(1, int(rate * frame_ms / 1000))
+        chunk_frames = int(chunk_seconds * rate)
+
+        if total_frames <= chunk_frames:
+            return [(0, total_frames)]
+
+        # RMS energy per analysis frame, computed over large zero-copy slices
+        energies = []
+        read_frames = frames_per_window * 600
+        for start in range(0, total_frames, read_frames):
+            samples = source.samples(start, start + read_frames)
+            if channels > 1:
+                samples = samples.reshape(-1, channels).mean(axis=1)
+            usable = len(samples) - len(samples) % frames_per_window
+            if usable == 0:
+                break
+            windows = samples[:usable].astype(np.float32).reshape(-1, frames_per_window)
+            energies.append(np.sqrt(np.mean(windows ** 2, axis=1)))
+
+    energies = np.concatenate(energies) if energies else np.zeros(0, dtype=np.float32)
+    search_windows = max(1, int(search_seconds * 1000 / frame_ms))
+
+    boundaries = [0]
+    target = chunk_frames
+    while target < total_frames - chunk_frames // 2:
+        center = target // frames_per_window
+        lo = max(boundaries[-1] // frames_per_window + 1, center - search_windows)
+        hi = min(len(energies), center + search_windows + 1)
+
+        if lo < hi:
+            quietest = lo + int(np.argmin(energies[lo:hi]))
+            cut = quietest * frames_per_window + frames_per_window // 2
+        else:
+            cut = target
+
+        boundaries.append(cut)
+        target = cut + chunk_frames
+
+    boundaries.append(total_frames)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _init_worker(model_path):
+    """Load the Vosk model once when a worker process starts"""
+    global _worker_model
+    from vosk import Model
+    _worker_model = Model(model_path)
+
+
+def _decode_chunk(wav_path, start_frame, end_frame, sample_rate, vad_options=None):
+    """
+    Decode one chunk inside a worker process
+
+    Returns:
+        tuple: (results, vad_stats) - vad_stats is None without VAD
+    """
+    from vosk import KaldiRecognizer
+    recognizer = KaldiRecognizer(_worker_model, sample_rate)
+    recognizer.SetWords(True)
+
+    vad = VoiceActivityDetector(sample_rate, **vad_options) if vad_options is not None else None
+    results = list(transcribe_range(recognizer, wav_path, start_frame, end_frame, vad=vad))
+    return results, (vad.get_stats() if vad is not None else None)
+
+
+class ParallelTranscriber:
+    """Process pool that decodes silence-split WAV chunks concurrently"""
+
+    def __init__(self, model_path, workers=None, chunk_seconds=120, min_duration_seconds=180,
+                 vad_options=None):
+        """
+        Initialize parallel transcriber
+
+        Args:
+            model_path: Path to Vosk model directory (loaded once per worker)
+            workers: Number of worker processes (None = CPU count)
+            chunk_seconds: Target chunk length in seconds
+            min_duration_seconds: Files shorter than this are not worth splitting
+            vad_options: VoiceActivityDetector keyword arguments (None = no VAD)
+        """
+        self.model_path = model_path
+        self.vad_options = vad_options
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_seconds = chunk_seconds
+        self.min_duration_seconds = min_duration_seconds
+        self._executor = None
+
+    def _get_executor(self):
+        """Start the worker pool on first use"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.model_path,)
+            )
+        return self._executor
+
+    def should_split(self, wav_path):
+        """
+        Check whether a file is long enough to benefit from splitting
+
+        Args:
+            wav_path: Path to WAV file
+
+        Returns:
+            bool: True if the file should be decoded in parallel
+        """
+        with WavSource(wav_path) as source:
+            duration = source.duration
+        return self.workers > 1 and duration >= self.min_duration_seconds
+
+    def transcribe(self, wav_path, vad_stats=None, progress=None):
+        """
+        Decode a WAV file across the worker pool
+
+        Chunks are no longer than chunk_seconds and at least one per worker,
+        so short-ish files still use every core.
+
+        Args:
+            wav_path: Path to a 16-bit PCM WAV file
+            vad_stats: Optional dictionary that per-chunk VAD statistics
+                       are merged into
+            progress: Optional DecodeProgress advanced as chunks finish
+
+        Yields:
+            dict: Final results (see transcribe_range); in audio order
+                  within a chunk, chunks in completion order
+        """
+        with WavSource(wav_path) as source:
+            sample_rate = source.sample_rate
+            duration = source.duration
+
+        chunk_seconds = min(self.chunk_seconds, max(duration / self.workers, 10.0))
+        chunks = find_split_points(wav_path, chunk_seconds)
+
+        executor = self._get_executor()
+        futures = []
+        for start, end in chunks:
+            future = executor.submit(_decode_chunk, wav_path, start, end, sample_rate, self.vad_options)
+            if progress is not None:
+                # Chunks finish out of order; count each as soon as it is done
+                future.add_done_callback(lambda _, frames=end - start: progress.advance(frames))
+            futures.append(future)
+
+        # Hand over chunks as they finish; results carry audio times and the
+        # TranscriptAggregator places them, so an early chunk that is slow
+        # does not hold back the rest
+        for future in as_completed(futures):
+            results, chunk_vad_stats = future.result()
+            if vad_stats is not None and chunk_vad_stats:
+                merge_vad_stats(vad_stats, chunk_vad_stats)
+            for result in results:
+                yield result
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
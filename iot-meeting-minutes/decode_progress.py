@@ -0,0 +1,88 @@
+"""
+Decode Progress Module
+Tracks how much audio a decoder has consumed and how fast, for percent
+complete and ETA reporting
+"""
+
+import threading
+import time
+
+
+class DecodeProgress:
+    def __init__(self, total_frames, sample_rate):
+        """
+        Initialize progress tracker
+
+        Args:
+            total_frames: Frames that will be decoded (None if unknown,
+                          e.g. compressed audio streamed through ffmpeg)
+            sample_rate: Audio sample rate
+        """
+        self.total_frames = total_frames
+        self.sample_rate = sample_rate
+        self.frames_done = 0
+        self.started_at = time.time()
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def advance(self, frames):
+        """
+        Record frames consumed by the recognizer
+
+        Args:
+            frames: Frames decoded since the last call
+        """
+        with self._lock:
+            self.frames_done += frames
+
+    def finish(self):
+        """Mark decoding finished"""
+        with self._lock:
+            if self.total_frames is not None:
+                self.frames_done = self.total_frames
+            self.finished_at = time.time()
+
+    def snapshot(self):
+        """
+        Get current progress
+
+        The real-time factor is processing seconds per second of audio
+        (below 1.0 means faster than real time); the ETA assumes it stays
+        constant for the rest of the file.
+
+        Returns:
+            dict: Frame counts, percent complete, real-time factor and ETA
+        """
+        with self._lock:
+            frames_done = self.frames_done
+            total_frames = self.total_frames
+            finished_at = self.finished_at
+
+        elapsed = (finished_at or time.time()) - self.started_at
+        audio_done = frames_done / float(self.sample_rate)
+        audio_total = total_frames / float(self.sample_rate) if total_frames is not None else None
+        rtf = elapsed / audio_done if audio_done > 0 else None
+
+        percent = None
+        eta = None
+        if audio_total:
+            percent = min(100.0, 100.0 * audio_done / audio_total)
+            if finished_at:
+                eta = 0.0
+            elif rtf is not None:
+                eta = max(0.0, (audio_total - audio_done) * rtf)
+        elif finished_at:
+            percent = 100.0
+            eta = 0.0
+
+        return {
+            'state': 'done' if finished_at else 'decoding',
+            'frames_done': frames_done,
+            'frames_total': total_frames,
+            'audio_seconds_done': round(audio_done, 2),
+            'audio_seconds_total': round(audio_total, 2) if audio_total is not None else None,
+            'percent': round(percent, 1) if percent is not None else None,
+            'elapsed_seconds': round(elapsed, 2),
+            'real_time_factor': round(rtf, 3) if rtf is not None else None,
+            'eta_seconds': round(eta, 1) if eta is not None else None
+        }
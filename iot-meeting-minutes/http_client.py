@@ -0,0 +1,244 @@
+"""
+HTTP Client
+Shared keep-alive connection pool for LLM API calls, with jittered
+exponential retry under a total deadline and a circuit breaker that stops
+sending requests to an endpoint that keeps failing
+"""
+
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Responses worth retrying: rate limiting and server-side failures
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+# Transport failures worth retrying (no usable response was received)
+RETRY_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError
+)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of sending a request while the circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker (thread-safe)
+
+    closed: requests flow. After failure_threshold consecutive failures the
+    circuit opens and requests are refused for reset_seconds. Then a single
+    trial request is let through (half-open); its outcome closes or reopens
+    the circuit.
+    """
+
+    def __init__(self, failure_threshold=5, reset_seconds=30):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Check whether a request may be sent now
+
+        Returns:
+            bool: False while open (or while the half-open trial is running)
+        """
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open':
+                if time.monotonic() - self.opened_at < self.reset_seconds:
+                    return False
+                self.state = 'half_open'
+                self._trial_in_flight = False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != 'closed':
+                print("[HttpClient] Endpoint recovered - circuit closed")
+            self.state = 'closed'
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == 'half_open' or (
+                    self.state == 'closed' and self.failures >= self.failure_threshold):
+                if self.state == 'closed':
+                    print(f"[HttpClient] {self.failures} consecutive failures - "
+                          f"circuit open for {self.reset_seconds}s")
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+    def get_status(self):
+        """
+        Returns:
+            dict: state and consecutive failure count
+        """
+        with self._lock:
+            return {'state': self.state, 'consecutive_failures': self.failures}
+
+
+class HttpClient:
+    """Pooled, retrying HTTP client shared by every summarizer of a process"""
+
+    def __init__(self, pool_size=8, connect_timeout=5, read_timeout=30, deadline=90,
+                 max_attempts=4, backoff_base=0.5, backoff_max=8, breaker=None):
+        """
+        Initialize client
+
+        Args:
+            pool_size: Keep-alive connections kept per host (should cover
+                       concurrent summary requests)
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for a response
+            deadline: Total seconds one call may take, retries included
+            max_attempts: Attempts per call
+            backoff_base: First retry delay cap in seconds (doubles per retry)
+            backoff_max: Largest retry delay cap in seconds
+            breaker: CircuitBreaker (a default one is created if None)
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.deadline = deadline
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+
+        self.session = requests.Session()
+        # Retries are done here (with a deadline), not by urllib3
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._warmed = {}   # url -> monotonic time of last pre-warm
+        self._warm_lock = threading.Lock()
+
+    def prewarm(self, url, min_interval=30):
+        """
+        Open a pooled connection to url's host in the background
+
+        Saves the TCP/TLS handshake on the first real request. Skipped if
+        the host was warmed recently or the circuit is open.
+
+        Args:
+            url: Any URL on the host to warm
+            min_interval: Seconds before the same url is warmed again
+        """
+        now = time.monotonic()
+        with self._warm_lock:
+            if now - self._warmed.get(url, float('-inf')) < min_interval:
+                return
+            self._warmed[url] = now
+
+        if self.breaker.state == 'open':
+            return
+
+        def warm():
+            try:
+                # Any response (even 405) leaves a live connection in the pool
+                self.session.head(url, timeout=(self.connect_timeout, self.connect_timeout))
+            except requests.exceptions.RequestException as e:
+                print(f"[HttpClient] Pre-warm of {url} failed: {e}")
+
+        threading.Thread(target=warm, name='http-prewarm', daemon=True).start()
+
+    def post(self, url, **kwargs):
+        """
+        POST with retries
+
+        Connection errors, timeouts and RETRY_STATUSES responses are retried
+        with full-jitter exponential backoff (honouring Retry-After) until
+        max_attempts or the deadline is reached. The circuit breaker sees
+        one outcome per call, not one per attempt.
+
+        Args:
+            url: Request URL
+            **kwargs: Passed to requests (headers, json, ...)
+
+        Returns:
+            requests.Response: Last response received (may be an error status)
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            requests.exceptions.RequestException: If no response was received
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {url}")
+
+        give_up_at = time.monotonic() + self.deadline
+        attempt = 0
+        healthy = False
+
+        try:
+            while True:
+                attempt += 1
+                remaining = give_up_at - time.monotonic()
+                timeout = (min(self.connect_timeout, remaining), min(self.read_timeout, remaining))
+
+                retry_after = None
+                try:
+                    response = self.session.post(url, timeout=timeout, **kwargs)
+                except RETRY_EXCEPTIONS as e:
+                    error, response = e, None
+                else:
+                    if response.status_code not in RETRY_STATUSES:
+                        # Endpoint answered (4xx errors are the caller's problem)
+                        healthy = True
+                        return response
+                    error = None
+                    retry_after = self._retry_after(response)
+
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+
+                # Stop early if other calls have meanwhile opened the circuit
+                if (attempt >= self.max_attempts or time.monotonic() + delay >= give_up_at - 1
+                        or self.breaker.state == 'open'):
+                    if response is not None:
+                        return response
+                    raise error
+
+                reason = f"status {response.status_code}" if response is not None else type(error).__name__
+                print(f"[HttpClient] Attempt {attempt} failed ({reason}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+        finally:
+            # Also runs for unexpected exceptions, so a half-open trial never stays claimed
+            if healthy:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+
+    @staticmethod
+    def _retry_after(response):
+        """Seconds from a Retry-After header, or None"""
+        try:
+            return float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
+
+    def get_status(self):
+        """
+        Returns:
+            dict: Circuit breaker state
+        """
+        return {'circuit': self.breaker.get_status()}
@@ -17,6 +17,8 @@ from recorder import AudioRecorder
 from stt_engine import VoskSTTEngine
 from transcript_aggregator import TranscriptAggregator
 from summarizer import Summarizer
+from summary_cache import SummaryCache
+from http_client import CircuitBreaker, HttpClient
 from logger import SessionLogger
 
 
@@ -33,6 +35,15 @@ class SessionController:
         self.logger = None
         self.running = False
         
+        # Summaries of unchanged transcripts are reused across runs
+        self.summary_cache = None
+        if self.config.get('summary_cache_enabled', True):
+            self.summary_cache = SummaryCache(
+                self.config.get('summary_cache_path') or
+                os.path.join(self.config['save_dir'], 'summary_cache.db'),
+                max_bytes=self.config.get('summary_cache_max_mb', 50) * 1024 * 1024
+            )
+        
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
@@ -174,7 +185,21 @@ class SessionController:
             print("📊 Initializing summarizer...")
             self.summarizer = Summarizer(
                 self.config['summarizer'],
-                self.config['extractive_sentences']
+                self.config['extractive_sentences'],
+                chunk_tokens=self.config.get('summary_chunk_tokens', 3000),
+                workers=self.config.get('summary_workers', 4),
+                map_reduce=self.config.get('summary_map_reduce', True),
+                cache=self.summary_cache,
+                client=HttpClient(
+                    pool_size=self.config.get('summary_http_pool_size', 8),
+                    read_timeout=self.config.get('summary_timeout', 30),
+                    deadline=self.config.get('summary_deadline', 90),
+                    max_attempts=self.config.get('summary_max_attempts', 4),
+                    breaker=CircuitBreaker(
+                        failure_threshold=self.config.get('summary_circuit_failures', 5),
+                        reset_seconds=self.config.get('summary_circuit_reset', 30)
+                    )
+                )
             )
             
             # Start recording
@@ -274,7 +299,10 @@ class SessionController:
                 transcript_text = self.aggregator.get_full_transcript()
                 
                 if transcript_text.strip():
-                    summary = self.summarizer.generate_summary(transcript_text)
+                    summary = self.summarizer.generate_summary(
+                        transcript_text,
+                        segments=self.aggregator.get_segment_texts()
+                    )
                     summary_file = self.summarizer.save_summary(
                         summary,
                         self.session_folder,
@@ -8,7 +8,7 @@ from vosk import Model, KaldiRecognizer
 
 
 class VoskSTTEngine:
-    def __init__(self, model_path, sample_rate, preloaded_model=None):
+    def __init__(self, model_path, sample_rate, preloaded_model=None, vad=None):
         """
         Initialize Vosk STT engine
         
@@ -16,9 +16,11 @@ class VoskSTTEngine:
             model_path: Path to Vosk model directory
             sample_rate: Audio sample rate (must match recorder)
             preloaded_model: Optional preloaded Vosk Model object (for instant start)
+            vad: Optional VoiceActivityDetector that drops silent blocks
         """
         self.model_path = model_path
         self.sample_rate = sample_rate
+        self.vad = vad
         
         # Use preloaded model if available, otherwise load it
         if preloaded_model is not None:
@@ -33,8 +35,7 @@ class VoskSTTEngine:
                 raise Exception(f"Failed to load Vosk model: {e}")
         
         # Create recognizer
-        self.recognizer = KaldiRecognizer(self.model, sample_rate)
-        self.recognizer.SetWords(True)  # Enable word-level timestamps
+        self.recognizer = self._new_recognizer()
         
         # Stats
         self.partial_count = 0
@@ -56,7 +57,20 @@ class VoskSTTEngine:
         if not audio_data:
             return None
         
-        # Feed audio to recognizer
+        # Skip silence (the VAD may also release a held pre-roll block)
+        blocks = self.vad.filter(audio_data) if self.vad is not None else (audio_data,)
+        
+        output = None
+        for block in blocks:
+            result = self._accept(block)
+            # A final result is never overwritten by a later partial
+            if result and (output is None or output['type'] != 'final'):
+                output = result
+        
+        return output
+    
+    def _accept(self, audio_data):
+        """Feed one block to the recognizer and return its result"""
         if self.recognizer.AcceptWaveform(audio_data):
             # Final result available
             result = json.loads(self.recognizer.Result())
@@ -66,7 +80,7 @@ class VoskSTTEngine:
                 return {
                     'type': 'final',
                     'text': result['text'],
-                    'words': result.get('result', [])
+                    'words': self._map_words(result.get('result', []))
                 }
         else:
             # Partial result
@@ -81,6 +95,16 @@ class VoskSTTEngine:
         
         return None
     
+    def _map_words(self, words):
+        """Map word timings back onto the audio timeline when silence was skipped"""
+        if self.vad is None:
+            return words
+        
+        for word in words:
+            word['start'] = self.vad.to_audio_time(word.get('start', 0.0))
+            word['end'] = self.vad.to_audio_time(word.get('end', 0.0))
+        return words
+    
     def get_final_result(self):
         """
         Get any remaining final result from recognizer
@@ -95,17 +119,34 @@ class VoskSTTEngine:
                 return {
                     'type': 'final',
                     'text': result['text'],
-                    'words': result.get('result', [])
+                    'words': self._map_words(result.get('result', []))
                 }
         except Exception as e:
             print(f"   Warning: Error getting final result: {e}")
         
         return None
     
+    def _new_recognizer(self):
+        """Create a recognizer on the shared model (the graph is not copied)"""
+        recognizer = KaldiRecognizer(self.model, self.sample_rate)
+        recognizer.SetWords(True)  # Enable word-level timestamps
+        return recognizer
+    
     def reset(self):
-        """Reset recognizer state"""
-        self.recognizer = KaldiRecognizer(self.model, self.sample_rate)
-        self.recognizer.SetWords(True)
+        """
+        Reset recognizer state so the engine can be reused
+        
+        A fresh recognizer is built rather than calling Reset(), which keeps
+        Vosk's running sample offset: word times of the next session would
+        start where the previous one ended.
+        """
+        self.recognizer = self._new_recognizer()
+        
+        self.partial_count = 0
+        self.final_count = 0
+        
+        if self.vad is not None:
+            self.vad.reset()
     
     def get_stats(self):
         """
@@ -114,7 +155,12 @@ class VoskSTTEngine:
         Returns:
             dict: Statistics
         """
-        return {
+        stats = {
             'partial_results': self.partial_count,
             'final_results': self.final_count
-        }
\ No newline at end of file
+        }
+        
+        if self.vad is not None:
+            stats['vad'] = self.vad.get_stats()
+        
+        return stats
\ No newline at end of file
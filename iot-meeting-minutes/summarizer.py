@@ -6,6 +6,8 @@ No NLTK, No Ollama, No TextRank - Pure OpenRouter API
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 
 # Load environment variables
@@ -19,54 +21,14 @@ except ImportError:
 backend_path = os.path.join(os.path.dirname(__file__), '..', 'backend')
 sys.path.insert(0, backend_path)
 from timezone_utils import now_ist, format_ist
+from instrumentation import count_error, span
+from tracing import bind
+from summary_cache import cache_key
+from http_client import CircuitOpenError, HttpClient
 
 
-class OpenRouterSummarizer:
-    """OpenRouter API-based summarizer"""
-    
-    def __init__(self, model="qwen/qwen-2.5-7b-instruct"):
-        """
-        Initialize OpenRouter summarizer
-        
-        Args:
-            model: OpenRouter model to use
-        """
-        self.model = model
-        
-        # Get API key from environment or use default
-        self.api_key = os.getenv(
-            'OPENROUTER_API_KEY',
-            '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'
-        )
-        
-        self.api_url = "https://openrouter.ai/api/v1/chat/completions"
-        self.max_chars = 4000  # Limit text length for API
-    
-    def generate_summary(self, text):
-        """
-        Generate summary using OpenRouter API
-        
-        Args:
-            text: Input text to summarize
-            
-        Returns:
-            str: Summary text
-        """
-        if not text or len(text.strip()) < 50:
-            return "Text too short to summarize."
-        
-        # Truncate if too long
-        if len(text) > self.max_chars:
-            text = text[-self.max_chars:]  # Take last 4000 chars
-        
-        try:
-            # Determine transcript length for appropriate summary style
-            word_count = len(text.split())
-            
-            # Create adaptive system prompt based on transcript length
-            if word_count < 100:
-                # Short transcript: concise summary
-                system_prompt = """You are an intelligent meeting summarizer and transcript repair specialist.
+# Concise summary for short transcripts
+SHORT_SUMMARY_PROMPT = """You are an intelligent meeting summarizer and transcript repair specialist.
 
 The transcript you receive is from speech-to-text (Vosk STT) and contains imperfections:
 - Missing words or incomplete phrases
@@ -90,9 +52,8 @@ YOUR TASK (2 steps):
 
 Output only the final summary, not the repair process."""
 
-            else:
-                # Long transcript: structured summary
-                system_prompt = """You are an intelligent meeting summarizer and transcript repair specialist.
+# Structured summary for longer transcripts (also the final reduce step)
+STRUCTURED_SUMMARY_PROMPT = """You are an intelligent meeting summarizer and transcript repair specialist.
 
 The transcript you receive is from speech-to-text (Vosk STT) and contains imperfections:
 - Missing words or incomplete phrases
@@ -119,50 +80,350 @@ Quality: Clear, polished language with proper grammar.
 Accuracy: Only infer what's reasonable from the text - no hallucinations.
 
 Output only the final summary, not the repair process."""
+
+# Map step: one part of a long transcript
+CHUNK_SUMMARY_PROMPT = """You are summarizing one part of a long meeting transcript.
+
+The text is from speech-to-text (Vosk STT) and contains imperfections (missing words,
+grammar errors, abrupt transitions). Mentally repair it, then write concise bullet
+points covering:
+   • Topics discussed in this part
+   • Key points, facts and figures
+   • Decisions reached
+   • Action items, with owners if mentioned
+
+Keep names, numbers and dates exactly as stated. Do not add an introduction or
+conclusion - other parts are summarized separately and combined later.
+Only infer what's reasonable from the text - no hallucinations.
+
+Output only the bullet points."""
+
+# Reduce step: combine partial summaries of consecutive parts
+COMBINE_SUMMARY_PROMPT = """You are combining partial summaries of consecutive parts of one meeting.
+
+Merge them into a single summary of the same bullet-point form:
+   • Merge repeated topics and remove duplicates
+   • Keep every decision and action item
+   • Keep names, numbers and dates exactly as stated
+   • Preserve the order in which things were discussed
+
+Output only the combined bullet points."""
+
+
+def estimate_tokens(text):
+    """
+    Rough token count for budgeting prompts (about 4 characters per token)
+    
+    Args:
+        text: Text to measure
+        
+    Returns:
+        int: Estimated tokens
+    """
+    return len(text) // 4 + 1
+
+
+def split_into_chunks(pieces, max_tokens):
+    """
+    Group consecutive pieces of text into chunks within a token budget
+    
+    Pieces are never split unless a single piece is over the budget, in
+    which case it is cut at word boundaries.
+    
+    Args:
+        pieces: Texts in order (transcript segments or partial summaries)
+        max_tokens: Token budget per chunk
+        
+    Returns:
+        list: Chunk texts
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+    
+    for piece in pieces:
+        piece = piece.strip()
+        if not piece:
+            continue
+        
+        tokens = estimate_tokens(piece)
+        if tokens > max_tokens:
+            # Oversized piece (e.g. the whole transcript as one line)
+            words = piece.split()
+            step = max(1, len(words) * max_tokens // tokens)
+            parts = [' '.join(words[i:i + step]) for i in range(0, len(words), step)]
+        else:
+            parts = [piece]
+        
+        for part in parts:
+            tokens = estimate_tokens(part)
+            if current and current_tokens + tokens > max_tokens:
+                chunks.append('\n'.join(current))
+                current, current_tokens = [], 0
+            current.append(part)
+            current_tokens += tokens
+    
+    if current:
+        chunks.append('\n'.join(current))
+    return chunks
+
+
+class OpenRouterSummarizer:
+    """OpenRouter API-based summarizer"""
+    
+    def __init__(self, model="qwen/qwen-2.5-7b-instruct", chunk_tokens=3000, workers=4,
+                 map_reduce=True, cache=None, client=None):
+        """
+        Initialize OpenRouter summarizer
+        
+        Args:
+            model: OpenRouter model to use
+            chunk_tokens: Transcript token budget per request; longer
+                          transcripts are summarized in chunks (map-reduce)
+            workers: Maximum concurrent chunk requests
+            map_reduce: If False, long transcripts are truncated to their
+                        last max_chars characters instead
+            cache: Optional SummaryCache consulted before every request
+            client: Shared HttpClient (pooled connections, retries, circuit
+                    breaker); a private one is created if None
+        """
+        self.model = model
+        self.cache = cache
+        self.client = client or HttpClient()
+        
+        # Get API key from environment or use default
+        self.api_key = os.getenv(
+            'OPENROUTER_API_KEY',
+            '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'
+        )
+        
+        self.api_url = "https://openrouter.ai/api/v1/chat/completions"
+        self.max_chars = 4000  # Limit text length for API (single-request mode)
+        self.chunk_tokens = chunk_tokens
+        self.workers = max(1, workers)
+        self.map_reduce = map_reduce
+    
+    def generate_summary(self, text, segments=None):
+        """
+        Generate summary using OpenRouter API
+        
+        Transcripts over the chunk budget are split at segment boundaries,
+        the chunks summarized concurrently, and the partial summaries
+        combined into the final summary.
+        
+        Args:
+            text: Input text to summarize
+            segments: Optional transcript segment texts (split points for chunking)
             
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "HTTP-Referer": "http://localhost",
-                "X-Title": "RaspberryPi-Summarizer",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "model": self.model,
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Raw STT Transcript:\n\n{text}\n\nPlease repair and summarize this transcript."
-                    }
-                ]
-            }
+        Returns:
+            str: Summary text
+        """
+        if not text or len(text.strip()) < 50:
+            return "Text too short to summarize."
+        
+        if self.map_reduce and estimate_tokens(text) > self.chunk_tokens:
+            return self._map_reduce_summary(text, segments)
+        
+        # Truncate if too long
+        if len(text) > self.max_chars and not self.map_reduce:
+            text = text[-self.max_chars:]  # Take last 4000 chars
+        
+        # Create adaptive system prompt based on transcript length
+        if len(text.split()) < 100:
+            system_prompt = SHORT_SUMMARY_PROMPT
+        else:
+            system_prompt = STRUCTURED_SUMMARY_PROMPT
+        
+        summary = self._request(
+            system_prompt,
+            f"Raw STT Transcript:\n\n{text}\n\nPlease repair and summarize this transcript."
+        )
+        if summary is None:
+            return self._fallback_summary(text)
+        
+        print("   ✓ Summary generated (using OpenRouter)")
+        return summary
+    
+    def _map_reduce_summary(self, text, segments):
+        """
+        Summarize a long transcript chunk by chunk, then combine
+        
+        Args:
+            text: Full transcript text
+            segments: Segment texts, or None to split text by lines
             
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=payload,
-                timeout=30
+        Returns:
+            str: Summary text
+        """
+        chunks = split_into_chunks(segments or text.splitlines(), self.chunk_tokens)
+        print(f"   Summarizing {len(chunks)} transcript chunks ({self.workers} at a time)...")
+        
+        # A chunk's request depends only on its own text (no position or
+        # chunk count), so cached summaries of unchanged chunks are reused
+        # when a recording grows or is summarized again
+        with span('summary.map'):
+            partials = self._run_concurrently([
+                (CHUNK_SUMMARY_PROMPT, f"Raw STT Transcript (one part of the meeting):\n\n{chunk}")
+                for chunk in chunks
+            ])
+        
+        # A failed chunk still contributes its opening sentences
+        partials = [
+            partial if partial is not None else self._fallback_summary(chunk)
+            for partial, chunk in zip(partials, chunks)
+        ]
+        
+        with span('summary.reduce'):
+            partials = self._reduce_to_budget(partials)
+            summary = self._request(
+                STRUCTURED_SUMMARY_PROMPT,
+                "The meeting was long, so its transcript was summarized in consecutive parts. "
+                f"Partial summaries in order:\n\n{self._join_partials(partials)}\n\n"
+                "Please combine these into the final meeting summary."
             )
+        
+        if summary is None:
+            # Partial summaries still cover the whole meeting
+            return '\n\n'.join(partials)
+        
+        print(f"   ✓ Summary generated from {len(chunks)} chunks (using OpenRouter)")
+        return summary
+    
+    def _join_partials(self, partials):
+        """Format partial summaries for the final request"""
+        return '\n\n'.join(f"Part {i + 1}:\n{partial}" for i, partial in enumerate(partials))
+    
+    def _reduce_to_budget(self, partials):
+        """
+        Combine partial summaries hierarchically until they fit one request
+        
+        Each round packs the partials into budget-sized groups and
+        summarizes the groups concurrently. If a round stops shrinking the
+        text (e.g. the API keeps failing), the partials are trimmed instead,
+        so the final request never exceeds the budget.
+        
+        Args:
+            partials: Partial summaries in meeting order
+            
+        Returns:
+            list: Partial summaries whose joined text fits chunk_tokens
+        """
+        size = estimate_tokens(self._join_partials(partials))
+        while size > self.chunk_tokens:
+            groups = split_into_chunks(partials, self.chunk_tokens)
+            combined = self._run_concurrently([
+                (COMBINE_SUMMARY_PROMPT, f"Partial summaries:\n\n{group}")
+                for group in groups
+            ])
+            reduced = [c if c is not None else g for c, g in zip(combined, groups)]
+            
+            reduced_size = estimate_tokens(self._join_partials(reduced))
+            if reduced_size >= size:
+                break
+            partials, size = reduced, reduced_size
+        
+        if size <= self.chunk_tokens:
+            return partials
+        
+        # Last resort: keep the start of every partial, in equal shares
+        share = max(1, self.chunk_tokens // len(partials) - 5) * 4
+        print(f"   ⚠️  Partial summaries still over budget - trimming to {share} characters each")
+        return [
+            partial if len(partial) <= share else partial[:share].rsplit(' ', 1)[0] + ' ...'
+            for partial in partials
+        ]
+    
+    def _run_concurrently(self, prompts):
+        """
+        Send requests on a bounded thread pool
+        
+        Args:
+            prompts: List of (system prompt, user message) tuples
+            
+        Returns:
+            list: Responses in input order (None where a request failed)
+        """
+        if len(prompts) == 1:
+            return [self._request(*prompts[0])]
+        
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(prompts))) as executor:
+            # bind() keeps the session's timings/trace for the request spans
+            futures = [executor.submit(bind(self._request), *prompt) for prompt in prompts]
+            return [future.result() for future in futures]
+    
+    def _request(self, system_prompt, user_content):
+        """
+        Send one chat completion request
+        
+        Args:
+            system_prompt: System message
+            user_content: User message
+            
+        Returns:
+            str: Response text, or None if the request failed
+        """
+        # Keyed by model, prompt and (normalized) text, so chunk and
+        # combine requests of a re-run summary are reused too
+        key = None
+        if self.cache is not None:
+            key = cache_key(self.model, system_prompt, user_content)
+            with span('summary.cache'):
+                cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "HTTP-Referer": "http://localhost",
+            "X-Title": "RaspberryPi-Summarizer",
+            "Content-Type": "application/json"
+        }
+        
+        payload = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": user_content
+                }
+            ]
+        }
+        
+        try:
+            with span('summary.request'):
+                response = self.client.post(
+                    self.api_url,
+                    headers=headers,
+                    json=payload
+                )
             
             if response.status_code == 200:
                 result = response.json()
-                summary = result['choices'][0]['message']['content']
-                print("   ✓ Summary generated (using OpenRouter)")
-                return summary.strip()
-            else:
-                print(f"   ⚠️  OpenRouter API error (status {response.status_code})")
-                return self._fallback_summary(text)
+                summary = result['choices'][0]['message']['content'].strip()
+                if key is not None and summary:
+                    self.cache.put(key, self.model, summary)
+                return summary
+            
+            print(f"   ⚠️  OpenRouter API error (status {response.status_code})")
+            count_error('summary')
+            return None
                 
+        except CircuitOpenError:
+            print("   ⚠️  OpenRouter unhealthy (circuit open) - not sending request")
+            count_error('summary')
+            return None
         except requests.exceptions.Timeout:
             print("   ⚠️  OpenRouter request timed out")
-            return self._fallback_summary(text)
+            count_error('summary')
+            return None
         except Exception as e:
             print(f"   ⚠️  OpenRouter failed: {e}")
-            return self._fallback_summary(text)
+            count_error('summary')
+            return None
     
     def _fallback_summary(self, text):
         """
@@ -201,13 +462,19 @@ class Summarizer:
     Maintains compatibility with existing code while using OpenRouter
     """
     
-    def __init__(self, mode='ollama', num_sentences=5):
+    def __init__(self, mode='ollama', num_sentences=5, chunk_tokens=3000, workers=4,
+                 map_reduce=True, cache=None, client=None):
         """
         Initialize summarizer
         
         Args:
             mode: Mode name (kept for compatibility, always uses OpenRouter)
             num_sentences: Not used, kept for compatibility
+            chunk_tokens: Token budget per summary request (see OpenRouterSummarizer)
+            workers: Maximum concurrent summary requests
+            map_reduce: Summarize long transcripts in chunks instead of truncating
+            cache: Optional SummaryCache shared between summarizers
+            client: Optional HttpClient shared between summarizers
         """
         self.mode = mode
         self.num_sentences = num_sentences
@@ -217,22 +484,36 @@ class Summarizer:
         self.model = os.environ.get('OPENROUTER_MODEL', 'qwen/qwen-2.5-7b-instruct')
         
         # Initialize OpenRouter summarizer
-        self.summarizer = OpenRouterSummarizer(model=self.model)
+        self.summarizer = OpenRouterSummarizer(
+            model=self.model,
+            chunk_tokens=chunk_tokens,
+            workers=workers,
+            map_reduce=map_reduce,
+            cache=cache,
+            client=client
+        )
         
         # Print compatibility message
         print(f"   ✓ Summarizer initialized (mode: {mode})")
     
-    def generate_summary(self, text):
+    def generate_summary(self, text, segments=None):
         """
         Generate summary of the text
         
         Args:
             text: Input text to summarize
+            segments: Optional transcript segment texts, used as chunk
+                      boundaries for long transcripts
             
         Returns:
             str: Summary text
         """
-        return self.summarizer.generate_summary(text)
+        with span('summary.generate'):
+            return self.summarizer.generate_summary(text, segments)
+    
+    def prewarm(self):
+        """Open a connection to the summary API ahead of the first request"""
+        self.summarizer.client.prewarm(self.summarizer.api_url)
     
     def save_summary(self, summary, session_folder, session_name):
         """
@@ -0,0 +1,198 @@
+"""
+Summary Cache
+Persistent, content-addressed cache of LLM summary responses in a small
+SQLite file, evicted least-recently-used once it grows past a size limit
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+# Bump to invalidate every cached entry (e.g. after changing normalization)
+CACHE_VERSION = 1
+
+
+def normalize_text(text):
+    """
+    Normalize text for cache keys
+
+    Whitespace differences (line breaks from re-saving a transcript,
+    trailing spaces) should not cause a miss.
+
+    Args:
+        text: Prompt or transcript text
+
+    Returns:
+        str: Text with whitespace runs collapsed to single spaces
+    """
+    return ' '.join(text.split())
+
+
+def cache_key(model, variant, text):
+    """
+    Build the content address of a summary
+
+    Args:
+        model: LLM model name
+        variant: Prompt variant (the system prompt itself, so editing a
+                 prompt invalidates its entries automatically)
+        text: Transcript or chunk text sent with the prompt
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    material = json.dumps(
+        [CACHE_VERSION, model, normalize_text(variant), normalize_text(text)],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class SummaryCache:
+    """SQLite-backed summary cache (safe to share between threads and processes)"""
+
+    def __init__(self, path, max_bytes=50 * 1024 * 1024):
+        """
+        Initialize cache
+
+        Args:
+            path: SQLite file (created if missing)
+            max_bytes: Total size of cached summaries before the least
+                       recently used are evicted
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS summary_cache ("
+                "    key TEXT PRIMARY KEY,"
+                "    model TEXT NOT NULL,"
+                "    summary TEXT NOT NULL,"
+                "    size INTEGER NOT NULL,"
+                "    created_at REAL NOT NULL,"
+                "    last_used REAL NOT NULL,"
+                "    hits INTEGER NOT NULL DEFAULT 0"
+                ")"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_summary_cache_last_used "
+                "ON summary_cache (last_used)"
+            )
+
+    def _connect(self):
+        # A connection per call: cheap for SQLite and safe from any thread
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key):
+        """
+        Look up a cached summary and mark it as recently used
+
+        Args:
+            key: Key from cache_key()
+
+        Returns:
+            str: Cached summary, or None on a miss (or if the cache is unreadable)
+        """
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    row = conn.execute(
+                        "SELECT summary FROM summary_cache WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row:
+                        conn.execute(
+                            "UPDATE summary_cache SET last_used = ?, hits = hits + 1 WHERE key = ?",
+                            (time.time(), key)
+                        )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[SummaryCache] Lookup failed: {e}")
+            return None
+
+        with self._lock:
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return row[0] if row else None
+
+    def put(self, key, model, summary):
+        """
+        Store a summary, then evict least recently used entries over the limit
+
+        Args:
+            key: Key from cache_key()
+            model: Model that produced the summary
+            summary: Summary text (only successful LLM responses belong here)
+        """
+        now = time.time()
+        size = len(summary.encode('utf-8')) + len(key)
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO summary_cache "
+                        "(key, model, summary, size, created_at, last_used, hits) "
+                        "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                        (key, model, summary, size, now, now)
+                    )
+                    # Keep the most recently used entries that fit in max_bytes
+                    conn.execute(
+                        "DELETE FROM summary_cache WHERE key IN ("
+                        "    SELECT key FROM ("
+                        "        SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS total"
+                        "        FROM summary_cache"
+                        "    ) WHERE total > ?"
+                        ")",
+                        (self.max_bytes,)
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[SummaryCache] Store failed: {e}")
+
+    def clear(self):
+        """Remove every entry"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM summary_cache")
+        finally:
+            conn.close()
+
+    def get_stats(self):
+        """
+        Get cache statistics
+
+        Returns:
+            dict: Entries, stored bytes, limit, and hits/misses of this process
+        """
+        conn = self._connect()
+        try:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM summary_cache"
+            ).fetchone()
+        finally:
+            conn.close()
+
+        with self._lock:
+            return {
+                'entries': entries,
+                'bytes': size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
@@ -3,70 +3,279 @@ Transcript Aggregator Module
 Collects and manages transcript segments with timestamps
 """
 
+import json
+import math
 import os
+import queue
 import sys
-from datetime import datetime, timedelta
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime
 
 # Add backend directory to path for timezone_utils
 backend_path = os.path.join(os.path.dirname(__file__), '..', 'backend')
 sys.path.insert(0, backend_path)
 from timezone_utils import now_ist, format_ist
+from transcript_sidecar import sidecar_path, write_sidecar
+from word_store import WordStore
 
 
 class TranscriptAggregator:
-    def __init__(self, session_folder, session_name):
+    def __init__(self, session_folder, session_name, sample_rate=16000, journal=True,
+                 fsync_interval=5.0):
         """
         Initialize transcript aggregator
         
         Args:
             session_folder: Path to session folder
             session_name: Name of session for file naming
+            sample_rate: Audio sample rate, for segments placed by frame offset
+            journal: Append each segment to a crash-recovery journal
+            fsync_interval: Seconds between fsyncs of the journal (appends
+                            are flushed to the OS immediately)
         """
         self.session_folder = session_folder
         self.session_name = session_name
+        self.sample_rate = sample_rate
         
-        # Transcript data
+        # Transcript data, kept ordered by audio time; decoders may deliver
+        # segments out of order (parallel chunks, retries)
         self.segments = []
+        self._sort_keys = []      # (elapsed_seconds, seq) for each entry in segments
         self.start_time = now_ist()
         
+        # Word timings live in columns; each segment keeps its word_range
+        self.words = WordStore()
+        
+        # Version counter for delta reads: every added segment gets the
+        # next sequence number; _arrivals[0] has sequence _first_seq
+        self.version = 0
+        self._first_seq = 0
+        self._arrivals = []
+        
+        # Running totals so status reads don't rescan the transcript;
+        # _text_cache holds the joined text of the first _cached_segments
+        # segments and is extended rather than rebuilt as segments append
+        self._word_count = 0
+        self._char_count = 0
+        self._text_cache = ''
+        self._cached_segments = 0
+        
         # File path
         self.transcript_file = os.path.join(
             session_folder,
             f"{session_name}.txt"
         )
         
-        # Partial save tracking
-        self.last_save_time = now_ist()
-        self.save_interval = timedelta(seconds=30)  # Save every 30 seconds
+        # Structured copy (segments + word timings) for downstream consumers
+        self.sidecar_file = sidecar_path(self.transcript_file)
+        
+        # Append-only journal: one JSON line per segment, compacted into
+        # the .txt by save_transcript() and replayed by recover()
+        self.journal_file = os.path.join(
+            session_folder,
+            f"{session_name}.journal.jsonl"
+        )
+        self.journal_enabled = journal
+        self.fsync_interval = fsync_interval
+        self._journal = None
+        self._journal_lock = threading.Lock()
+        self._last_fsync = time.monotonic()
+        self._unsynced = False
+        
+        # Live listeners (one queue per push-channel connection)
+        self._subscribers = []
+        self._subscribers_lock = threading.Lock()
+        self.partial_text = ''
     
-    def add_segment(self, text, words=None):
+    def add_segment(self, text, words=None, audio_time=None, frame_offset=None):
         """
-        Add a transcript segment
+        Add a transcript segment at its position in the audio
+        
+        The segment's audio offset is taken from, in order: audio_time,
+        frame_offset, the first word's Vosk 'start' time, and finally
+        wall-clock time since the session started (live capture without
+        word timings).
         
         Args:
             text: Transcribed text
             words: Optional list of word dictionaries with timestamps
+            audio_time: Optional offset of the segment in the audio (seconds)
+            frame_offset: Optional offset of the segment in audio frames
         """
         if not text or not text.strip():
             return
         
-        # Calculate elapsed time
-        elapsed = now_ist() - self.start_time
-        timestamp = self._format_timestamp(elapsed.total_seconds())
+        words = words or []
+        
+        # Calculate elapsed (audio) time
+        if audio_time is not None:
+            elapsed_seconds = float(audio_time)
+        elif frame_offset is not None:
+            elapsed_seconds = frame_offset / float(self.sample_rate)
+        elif words and 'start' in words[0]:
+            elapsed_seconds = float(words[0]['start'])
+        else:
+            elapsed_seconds = (now_ist() - self.start_time).total_seconds()
+        timestamp = self._format_timestamp(elapsed_seconds)
+        
+        end_seconds = elapsed_seconds
+        if words and 'end' in words[-1]:
+            end_seconds = max(elapsed_seconds, float(words[-1]['end']))
         
         # Create segment
         segment = {
+            'seq': self.version,
             'timestamp': timestamp,
-            'elapsed_seconds': elapsed.total_seconds(),
+            'elapsed_seconds': elapsed_seconds,
+            'end_seconds': end_seconds,
             'text': text.strip(),
-            'words': words or []
+            'word_range': self.words.append(words)
         }
         
-        self.segments.append(segment)
+        # Binary search for the insert position; in-order arrivals append
+        key = (elapsed_seconds, segment['seq'])
+        index = bisect_right(self._sort_keys, key)
+        self._sort_keys.insert(index, key)
+        self.segments.insert(index, segment)
+        
+        self._word_count += len(segment['text'].split())
+        self._char_count += len(segment['text']) + (1 if len(self.segments) > 1 else 0)
+        if index < self._cached_segments:
+            # Inserted inside the cached prefix - rebuild on next read
+            self._text_cache = ''
+            self._cached_segments = 0
+        
+        self._arrivals.append(segment)
+        self.version += 1
+        self.partial_text = ''
+        
+        self._publish('segment', self._segment_event(index, segment))
+        
+        self._append_journal(dict(self._with_words(segment), type='segment'))
+    
+    def set_partial(self, text):
+        """
+        Update the in-progress (not yet final) text and notify listeners
+        
+        Args:
+            text: Current partial hypothesis from the recognizer
+        """
+        text = (text or '').strip()
+        if text == self.partial_text:
+            return
+        self.partial_text = text
+        self._publish('partial', {'text': text})
+    
+    def subscribe(self, max_pending=500):
+        """
+        Register a listener for new segments and partial results
+        
+        Args:
+            max_pending: Events buffered before a slow listener is told to resync
+            
+        Returns:
+            queue.Queue: Receives (event, data) tuples; None means the session ended
+        """
+        listener = queue.Queue(maxsize=max_pending)
+        with self._subscribers_lock:
+            self._subscribers.append(listener)
+        return listener
+    
+    def unsubscribe(self, listener):
+        """
+        Remove a listener registered with subscribe()
+        
+        Args:
+            listener: Queue returned by subscribe()
+        """
+        with self._subscribers_lock:
+            if listener in self._subscribers:
+                self._subscribers.remove(listener)
+    
+    def subscriber_count(self):
+        """
+        Get number of live listeners
+        
+        Returns:
+            int: Listeners registered with subscribe()
+        """
+        with self._subscribers_lock:
+            return len(self._subscribers)
+    
+    def close_subscribers(self):
+        """Tell every listener the session has ended"""
+        with self._subscribers_lock:
+            subscribers, self._subscribers = self._subscribers, []
+        
+        for listener in subscribers:
+            self._put(listener, None)
+    
+    def _publish(self, event, data):
+        """Send an event to every listener"""
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        
+        for listener in subscribers:
+            self._put(listener, (event, data))
+    
+    def _put(self, listener, item):
+        """Queue an item; a listener that fell behind is reset and told to resync"""
+        try:
+            listener.put_nowait(item)
+        except queue.Full:
+            while True:
+                try:
+                    listener.get_nowait()
+                except queue.Empty:
+                    break
+            listener.put_nowait(('resync', {}) if item is not None else None)
+    
+    def _segment_event(self, index, segment):
+        """
+        Lightweight segment payload for listeners (no word list)
+        
+        'seq' identifies the segment; 'index' is its position in audio
+        order when the event was sent (later out-of-order inserts shift it),
+        so listeners should order by elapsed_seconds.
+        """
+        return {
+            'seq': segment['seq'],
+            'index': index,
+            'timestamp': segment['timestamp'],
+            'elapsed_seconds': segment['elapsed_seconds'],
+            'text': segment['text']
+        }
+    
+    def _with_words(self, segment):
+        """
+        Copy of a segment in the public format (word dictionaries, no word_range)
+        """
+        public = dict(segment)
+        public['words'] = self.words.slice(*public.pop('word_range'))
+        return public
+    
+    def get_words(self, segment):
+        """
+        Get a segment's word timings
+        
+        Args:
+            segment: Segment dictionary from this aggregator
+            
+        Returns:
+            list: Word dictionaries (word, start, end, conf)
+        """
+        return self.words.slice(*segment['word_range'])
+    
+    def get_segment_events(self):
+        """
+        Get every segment as a listener payload (initial snapshot for a new listener)
         
-        # Periodic save
-        if now_ist() - self.last_save_time >= self.save_interval:
-            self._save_partial()
+        Returns:
+            list: Segment payloads without word lists
+        """
+        return [self._segment_event(i, segment) for i, segment in enumerate(self.segments)]
     
     def _format_timestamp(self, seconds):
         """
@@ -84,33 +293,141 @@ class TranscriptAggregator:
         
         return f"{hours:02d}:{minutes:02d}:{secs:02d}"
     
-    def _save_partial(self):
-        """Save partial transcript to disk"""
+    def _append_journal(self, record):
+        """
+        Append one record to the journal
+        
+        The line is flushed to the OS right away (survives a process crash);
+        fsync, which is what costs on an SD card, runs at most once per
+        fsync_interval.
+        """
+        if not self.journal_enabled:
+            return
+        
         try:
-            self._write_transcript(self.transcript_file + '.partial')
-            self.last_save_time = now_ist()
+            with self._journal_lock:
+                if self._journal is None:
+                    self._journal = open(self.journal_file, 'a', encoding='utf-8')
+                    if self._journal.tell() == 0:
+                        self._journal.write(json.dumps({
+                            'type': 'start',
+                            'session_name': self.session_name,
+                            'start_time': self.start_time.isoformat()
+                        }) + '\n')
+                
+                self._journal.write(json.dumps(record) + '\n')
+                self._journal.flush()
+                self._unsynced = True
+                
+                if time.monotonic() - self._last_fsync >= self.fsync_interval:
+                    self._fsync_journal()
         except Exception as e:
-            print(f"   Warning: Could not save partial transcript: {e}")
+            print(f"   Warning: Could not append to transcript journal: {e}")
+    
+    def _fsync_journal(self):
+        """Force journaled segments to disk (call with _journal_lock held)"""
+        if self._journal is not None and self._unsynced:
+            os.fsync(self._journal.fileno())
+            self._unsynced = False
+        self._last_fsync = time.monotonic()
+    
+    def sync(self):
+        """Flush any journaled segments not yet fsynced"""
+        with self._journal_lock:
+            self._fsync_journal()
     
     def save_transcript(self):
         """
         Save final transcript to disk
         
+        Compacts the journal into the .txt layout (written to a temporary
+        file and renamed, so a crash never leaves a half-written transcript)
+        plus the .jsonl sidecar, then removes the journal (if this aggregator
+        writes it).
+        
         Returns:
             str: Path to saved transcript file
         """
-        self._write_transcript(self.transcript_file)
+        temp_file = self.transcript_file + '.tmp'
+        self._write_transcript(temp_file)
+        with open(temp_file, 'rb') as f:
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.transcript_file)
+        
+        try:
+            self._write_sidecar()
+        except Exception as e:
+            print(f"   Warning: Could not write transcript sidecar: {e}")
         
-        # Remove partial file if it exists
-        partial_file = self.transcript_file + '.partial'
-        if os.path.exists(partial_file):
-            try:
-                os.remove(partial_file)
-            except:
-                pass
+        # The compacted transcript supersedes the journal. Only the
+        # journaling aggregator owns it: a journal=False copy (e.g. in a
+        # transcription worker) must not delete the web process's journal.
+        with self._journal_lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            self._unsynced = False
+            if self.journal_enabled and os.path.exists(self.journal_file):
+                try:
+                    os.remove(self.journal_file)
+                except OSError:
+                    pass
         
         return self.transcript_file
     
+    @classmethod
+    def recover(cls, session_folder, session_name, **kwargs):
+        """
+        Rebuild an aggregator from a session's journal after a crash
+        
+        A torn final line (crash mid-write) is ignored. The recovered
+        aggregator keeps appending to the same journal.
+        
+        Args:
+            session_folder: Path to session folder
+            session_name: Name of session for file naming
+            **kwargs: Passed to the constructor
+        
+        Returns:
+            TranscriptAggregator: Aggregator holding the journaled segments,
+                                  or None if there is no journal
+        """
+        aggregator = cls(session_folder, session_name, **kwargs)
+        if not os.path.exists(aggregator.journal_file):
+            return None
+        
+        journal_enabled = aggregator.journal_enabled
+        aggregator.journal_enabled = False
+        
+        valid_length = 0
+        with open(aggregator.journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                valid_length += len(line)
+                
+                kind = record.get('type')
+                if kind == 'start':
+                    aggregator.start_time = datetime.fromisoformat(record['start_time'])
+                elif kind == 'clear':
+                    aggregator.clear()
+                elif kind == 'segment':
+                    aggregator.add_segment(
+                        record['text'],
+                        record.get('words'),
+                        audio_time=record['elapsed_seconds']
+                    )
+        
+        # Drop a torn tail so later appends start on a fresh line
+        if valid_length < os.path.getsize(aggregator.journal_file):
+            with open(aggregator.journal_file, 'r+b') as f:
+                f.truncate(valid_length)
+        
+        aggregator.journal_enabled = journal_enabled
+        return aggregator
+    
     def _write_transcript(self, filepath):
         """
         Write transcript to file
@@ -134,9 +451,38 @@ class TranscriptAggregator:
             f.write(f"Total segments: {len(self.segments)}\n")
             
             if self.segments:
-                total_time = self.segments[-1]['elapsed_seconds']
+                total_time = self.segments[-1]['end_seconds']
                 f.write(f"Duration: {self._format_timestamp(total_time)}\n")
     
+    def _write_sidecar(self):
+        """Write segments and word-timing columns to the .jsonl sidecar"""
+        def column(values, digits=None):
+            return [None if math.isnan(v) else (round(v, digits) if digits else v) for v in values]
+        
+        def sidecar_segments():
+            for segment in self.segments:
+                words = self.words.columns(*segment['word_range'])
+                yield {
+                    'timestamp': segment['timestamp'],
+                    'elapsed_seconds': segment['elapsed_seconds'],
+                    'end_seconds': segment['end_seconds'],
+                    'text': segment['text'],
+                    'words': {
+                        'word': words['word'],
+                        'start': column(words['start']),
+                        'end': column(words['end']),
+                        'conf': column(words['conf'], 6)
+                    }
+                }
+        
+        write_sidecar(self.sidecar_file, {
+            'session_name': self.session_name,
+            'start_time': self.start_time.isoformat(),
+            'segment_count': len(self.segments),
+            'word_count': self._word_count,
+            'duration': self.segments[-1]['end_seconds'] if self.segments else 0.0
+        }, sidecar_segments())
+    
     def get_full_transcript(self):
         """
         Get full transcript as plain text (no timestamps)
@@ -144,16 +490,50 @@ class TranscriptAggregator:
         Returns:
             str: Full transcript text
         """
-        return ' '.join(segment['text'] for segment in self.segments)
+        if self._cached_segments < len(self.segments):
+            tail = ' '.join(segment['text'] for segment in self.segments[self._cached_segments:])
+            self._text_cache = f"{self._text_cache} {tail}" if self._text_cache else tail
+            self._cached_segments = len(self.segments)
+        return self._text_cache
+    
+    def get_segment_texts(self):
+        """
+        Get the text of each segment in order
+        
+        Returns:
+            list: Segment texts (natural split points for summarization)
+        """
+        return [segment['text'] for segment in self.segments]
     
     def get_timestamped_transcript(self):
         """
         Get transcript with timestamps
         
         Returns:
-            list: List of dictionaries with timestamp and text
+            list: List of dictionaries with timestamp, text and words
         """
-        return self.segments.copy()
+        return [self._with_words(segment) for segment in self.segments]
+    
+    def get_segments_since(self, cursor):
+        """
+        Get segments added after a cursor
+        
+        Segments come back in arrival order, so a segment that belongs
+        earlier in the audio than ones the client already has is still
+        delivered; clients place them by elapsed_seconds.
+        
+        Args:
+            cursor: Version returned by a previous call (0 = from the start)
+            
+        Returns:
+            tuple: (segments, new_cursor, reset) - reset is True when the
+                   cursor predates a clear() and the client must start over
+        """
+        start = cursor - self._first_seq
+        reset = start < 0 or cursor > self.version
+        if reset:
+            start = 0
+        return [self._with_words(segment) for segment in self._arrivals[start:]], self.version, reset
     
     def get_segment_count(self):
         """
@@ -171,10 +551,31 @@ class TranscriptAggregator:
         Returns:
             int: Word count
         """
-        text = self.get_full_transcript()
-        return len(text.split())
+        return self._word_count
+    
+    def get_char_count(self):
+        """
+        Get length of the full transcript text
+        
+        Returns:
+            int: Character count
+        """
+        return self._char_count
     
     def clear(self):
         """Clear all segments"""
         self.segments = []
-        self.start_time = now_ist()
\ No newline at end of file
+        self._sort_keys = []
+        self._arrivals = []
+        self.words = WordStore()
+        self._word_count = 0
+        self._char_count = 0
+        self._text_cache = ''
+        self._cached_segments = 0
+        # Skip a version so cursors issued before the clear are detected
+        self.version += 1
+        self._first_seq = self.version
+        self.partial_text = ''
+        self.start_time = now_ist()
+        self._append_journal({'type': 'clear'})
+        self._publish('resync', {})
\ No newline at end of file
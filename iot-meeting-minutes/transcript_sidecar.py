@@ -0,0 +1,157 @@
+"""
+Transcript Sidecar Module
+Structured, versioned JSON-lines copy of a transcript (segments, word
+timings and confidences) written next to the human-readable .txt
+"""
+
+import json
+import mmap
+import os
+
+
+SIDECAR_FORMAT = 'meeting-transcript'
+SIDECAR_VERSION = 1
+
+# Files larger than this are read through a memory map
+MMAP_THRESHOLD = 4 * 1024 * 1024
+
+
+def sidecar_path(transcript_file):
+    """
+    Get the sidecar path for a transcript
+
+    Args:
+        transcript_file: Path of the .txt transcript
+
+    Returns:
+        str: Path of the .jsonl sidecar
+    """
+    base, _ = os.path.splitext(transcript_file)
+    return base + '.jsonl'
+
+
+def write_sidecar(path, header, segments):
+    """
+    Write a sidecar atomically
+
+    The first line is the header (format, version, session details); each
+    following line is one segment in audio order, with its words stored
+    column-wise (word, start, end, conf lists).
+
+    Args:
+        path: Destination path
+        header: Session fields for the header line
+        segments: Iterable of segment dictionaries with a 'words' column dict
+    """
+    temp_file = path + '.tmp'
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(dict(header, format=SIDECAR_FORMAT, version=SIDECAR_VERSION)) + '\n')
+        for segment in segments:
+            f.write(json.dumps(segment, separators=(',', ':')) + '\n')
+    os.replace(temp_file, path)
+
+
+class TranscriptSidecar:
+    """Lazy reader: only the header is parsed until segments are iterated"""
+
+    def __init__(self, path):
+        """
+        Open a sidecar and read its header
+
+        Args:
+            path: Sidecar path
+
+        Raises:
+            ValueError: If the file is not a sidecar of a supported version
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            try:
+                self.header = json.loads(f.readline())
+            except ValueError:
+                raise ValueError(f"Not a transcript sidecar: {path}")
+
+        if self.header.get('format') != SIDECAR_FORMAT:
+            raise ValueError(f"Not a transcript sidecar: {path}")
+        if self.header.get('version', 0) > SIDECAR_VERSION:
+            raise ValueError(f"Unsupported sidecar version {self.header.get('version')}: {path}")
+
+    def _lines(self):
+        """Yield the raw segment lines (after the header)"""
+        with open(self.path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    mapped.readline()
+                    yield from iter(mapped.readline, b'')
+            else:
+                f.readline()
+                yield from f
+
+    def segments(self, words=True):
+        """
+        Iterate over segments in audio order
+
+        Args:
+            words: Include the word-timing columns
+
+        Yields:
+            dict: timestamp, elapsed_seconds, end_seconds, text (and words)
+        """
+        for line in self._lines():
+            if not line.strip():
+                continue
+            segment = json.loads(line)
+            if not words:
+                segment.pop('words', None)
+            yield segment
+
+    def words(self, segment):
+        """
+        Get a segment's words as dictionaries
+
+        Args:
+            segment: Segment from segments()
+
+        Returns:
+            list: Word dictionaries (word, start, end, conf)
+        """
+        columns = segment.get('words') or {}
+        names = list(columns)
+        # Values the recognizer did not report are stored as null; leave them out
+        return [
+            {name: value for name, value in zip(names, values) if value is not None}
+            for values in zip(*(columns[name] for name in names))
+        ]
+
+    def full_text(self):
+        """
+        Get the transcript as plain text (no timestamps)
+
+        Returns:
+            str: Segment texts joined by spaces
+        """
+        return ' '.join(segment['text'] for segment in self.segments(words=False))
+
+
+def load_sidecar(transcript_file):
+    """
+    Open the sidecar of a transcript if it has one
+
+    Args:
+        transcript_file: Path of the .txt transcript
+
+    Returns:
+        TranscriptSidecar: Reader, or None for transcripts without a usable sidecar
+    """
+    if not transcript_file:
+        return None
+
+    path = sidecar_path(transcript_file)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        return TranscriptSidecar(path)
+    except (OSError, ValueError) as e:
+        print(f"   Warning: Ignoring transcript sidecar {path}: {e}")
+        return None
@@ -0,0 +1,208 @@
+"""
+Voice Activity Detection Module
+Gates silent audio blocks before they reach the Vosk recognizer
+"""
+
+from bisect import bisect_right
+
+import numpy as np
+
+
+class VoiceActivityDetector:
+    def __init__(self, sample_rate, frame_ms=30, energy_threshold_db=-50.0,
+                 noise_margin_db=10.0, zcr_threshold=0.25, min_speech_frames=2,
+                 hangover_ms=500):
+        """
+        Initialize voice activity detector
+
+        A block counts as speech when enough of its frames are either loud
+        relative to the tracked noise floor, or slightly quieter but with a
+        high zero-crossing rate (fricatives such as 's' and 'f').
+
+        Args:
+            sample_rate: Audio sample rate (16-bit mono PCM)
+            frame_ms: Analysis frame length in milliseconds
+            energy_threshold_db: Absolute speech threshold in dBFS
+            noise_margin_db: Speech must be this far above the noise floor
+            zcr_threshold: Zero-crossing rate that marks low-energy fricatives
+            min_speech_frames: Speech frames needed to call a block speech
+            hangover_ms: Silence still fed after speech so Vosk can endpoint
+        """
+        self.sample_rate = sample_rate
+        self.frame_len = max(1, int(sample_rate * frame_ms / 1000))
+        self.energy_threshold_db = energy_threshold_db
+        self.noise_margin_db = noise_margin_db
+        self.zcr_threshold = zcr_threshold
+        self.min_speech_frames = min_speech_frames
+        self.hangover_seconds = hangover_ms / 1000.0
+
+        self.reset()
+
+    def reset(self):
+        """Reset detector state and statistics for a new stream"""
+        self.noise_floor_db = self.energy_threshold_db - self.noise_margin_db
+        self._silence_run = 0.0
+        self._pending = None      # last silent block, kept as pre-roll
+
+        # Timeline mapping: recognizer time -> audio time
+        self.fed_seconds = 0.0
+        self.audio_seconds = 0.0
+        self.skipped_seconds = 0.0
+        self._skip_marks = []     # fed_seconds at which audio was dropped
+        self._skip_totals = []    # cumulative skipped seconds at each mark
+
+        self.speech_blocks = 0
+        self.silent_blocks = 0
+        self.skipped_blocks = 0
+
+    def is_speech(self, block):
+        """
+        Classify a block of 16-bit PCM audio
+
+        Args:
+            block: Raw audio bytes
+
+        Returns:
+            bool: True if the block contains speech
+        """
+        samples = np.frombuffer(block, dtype=np.int16)
+        n_frames = len(samples) // self.frame_len
+        if n_frames == 0:
+            return False
+
+        frames = samples[:n_frames * self.frame_len].astype(np.float32).reshape(n_frames, self.frame_len)
+
+        # Per-frame energy (dBFS) and zero-crossing rate
+        power = np.mean(frames ** 2, axis=1)
+        energy_db = 10.0 * np.log10(power + 1e-10) - 90.309  # 20*log10(32768)
+        signs = np.signbit(frames)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+        threshold = max(self.energy_threshold_db, self.noise_floor_db + self.noise_margin_db)
+        speech = (energy_db > threshold) | ((energy_db > threshold - 6.0) & (zcr > self.zcr_threshold))
+
+        # Track the noise floor from the quietest frames of each block
+        quiet = float(np.percentile(energy_db, 10))
+        self.noise_floor_db = 0.95 * self.noise_floor_db + 0.05 * quiet
+
+        return int(np.count_nonzero(speech)) >= self.min_speech_frames
+
+    def filter(self, block):
+        """
+        Decide which audio should be fed to the recognizer
+
+        Silence is passed through for hangover_ms after speech. After that,
+        silent blocks are dropped; the most recent one is held back as
+        pre-roll and fed before the next speech block so word onsets are
+        not clipped.
+
+        Args:
+            block: Raw audio bytes (16-bit mono PCM)
+
+        Returns:
+            list: Blocks to feed to the recognizer, in order (may be empty)
+        """
+        duration = len(block) / (2.0 * self.sample_rate)
+        self.audio_seconds += duration
+
+        if self.is_speech(block):
+            self.speech_blocks += 1
+            self._silence_run = 0.0
+            out = [block]
+            if self._pending is not None:
+                out.insert(0, self._pending)
+                self._pending = None
+        else:
+            self.silent_blocks += 1
+            self._silence_run += duration
+            if self._silence_run <= self.hangover_seconds:
+                out = [block]
+            else:
+                if self._pending is not None:
+                    self._skip(len(self._pending) / (2.0 * self.sample_rate))
+                self._pending = block
+                out = []
+
+        for fed in out:
+            self.fed_seconds += len(fed) / (2.0 * self.sample_rate)
+        return out
+
+    def _skip(self, seconds):
+        """Record dropped audio at the current recognizer position"""
+        self.skipped_blocks += 1
+        self.skipped_seconds += seconds
+
+        if self._skip_marks and self._skip_marks[-1] == self.fed_seconds:
+            self._skip_totals[-1] = self.skipped_seconds
+        else:
+            self._skip_marks.append(self.fed_seconds)
+            self._skip_totals.append(self.skipped_seconds)
+
+    def to_audio_time(self, recognizer_seconds):
+        """
+        Map a time reported by the recognizer back onto the audio timeline
+
+        Args:
+            recognizer_seconds: Time relative to audio fed to the recognizer
+
+        Returns:
+            float: Time relative to the original audio
+        """
+        index = bisect_right(self._skip_marks, recognizer_seconds)
+        if index == 0:
+            return recognizer_seconds
+        return recognizer_seconds + self._skip_totals[index - 1]
+
+    def get_stats(self):
+        """
+        Get gating statistics
+
+        Returns:
+            dict: Audio seen, audio skipped and block counts
+        """
+        # Held pre-roll that never got fed is skipped audio as well
+        pending = len(self._pending) / (2.0 * self.sample_rate) if self._pending is not None else 0.0
+        skipped = self.skipped_seconds + pending
+
+        return {
+            'audio_seconds': round(self.audio_seconds, 3),
+            'skipped_seconds': round(skipped, 3),
+            'skipped_ratio': round(skipped / self.audio_seconds, 4) if self.audio_seconds else 0.0,
+            'speech_blocks': self.speech_blocks,
+            'silent_blocks': self.silent_blocks,
+            'skipped_blocks': self.skipped_blocks + (1 if pending else 0)
+        }
+
+
+def merge_vad_stats(total, stats):
+    """
+    Accumulate VAD statistics from several detectors (e.g. parallel chunks)
+
+    Args:
+        total: Dictionary to update in place
+        stats: Statistics from VoiceActivityDetector.get_stats()
+    """
+    for key in ('audio_seconds', 'skipped_seconds', 'speech_blocks', 'silent_blocks', 'skipped_blocks'):
+        total[key] = round(total.get(key, 0) + stats.get(key, 0), 3)
+
+    audio = total.get('audio_seconds', 0)
+    total['skipped_ratio'] = round(total.get('skipped_seconds', 0) / audio, 4) if audio else 0.0
+
+
+def vad_options_from_config(config):
+    """
+    Build VoiceActivityDetector keyword arguments from recorder_config.yml
+
+    Args:
+        config: Loaded configuration dictionary
+
+    Returns:
+        dict: Detector options, or None when VAD is disabled
+    """
+    if not config.get('vad_enabled', True):
+        return None
+
+    return {
+        'energy_threshold_db': config.get('vad_energy_threshold_db', -50.0),
+        'hangover_ms': config.get('vad_hangover_ms', 500)
+    }
@@ -0,0 +1,195 @@
+"""
+WAV Source Module
+Memory-maps PCM WAV files and hands out zero-copy blocks of audio
+"""
+
+import mmap
+import struct
+
+import numpy as np
+
+try:
+    import vosk
+    # Vosk's cffi handles, used to pass blocks without copying them
+    _vosk_c, _vosk_ffi = vosk._c, vosk._ffi
+except (ImportError, AttributeError, OSError):
+    vosk = _vosk_c = _vosk_ffi = None
+
+
+# Other recognizer types that only accept bytes
+_COPY_REQUIRED = set()
+
+
+class WavSource:
+    """Read-only, memory-mapped view of a PCM WAV file"""
+
+    def __init__(self, path):
+        """
+        Open a WAV file and parse its header
+
+        Args:
+            path: Path to an uncompressed PCM WAV file
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._view = memoryview(self._mmap)
+
+        try:
+            self._parse_header()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse_header(self):
+        """Locate the fmt and data chunks"""
+        if len(self._mmap) < 12 or self._mmap[:4] != b'RIFF' or self._mmap[8:12] != b'WAVE':
+            raise ValueError(f"Not a WAV file: {self.path}")
+
+        fmt = None
+        position = 12
+        while position + 8 <= len(self._mmap):
+            chunk_id = self._mmap[position:position + 4]
+            size = struct.unpack_from('<I', self._mmap, position + 4)[0]
+            body = position + 8
+
+            if chunk_id == b'fmt ':
+                fmt = struct.unpack_from('<HHIIHH', self._mmap, body)
+            elif chunk_id == b'data':
+                if fmt is None:
+                    raise ValueError(f"WAV data chunk before fmt chunk: {self.path}")
+                # Writers that died mid-recording can leave an oversized length
+                self._data_offset = body
+                self._data_size = min(size, len(self._mmap) - body)
+                break
+
+            position = body + size + (size & 1)
+        else:
+            raise ValueError(f"WAV file has no data chunk: {self.path}")
+
+        audio_format, self.channels, self.sample_rate, _, block_align, bits = fmt
+        if audio_format not in (1, 0xFFFE) or bits != 16:
+            raise ValueError(f"Only 16-bit PCM WAV is supported: {self.path}")
+
+        self.sample_width = bits // 8
+        self.frame_size = block_align or self.channels * self.sample_width
+        self.frames = self._data_size // self.frame_size
+
+    @property
+    def duration(self):
+        """Length of the audio in seconds"""
+        return self.frames / float(self.sample_rate)
+
+    def _byte_range(self, start_frame, end_frame):
+        """Clamp a frame range and convert it to absolute byte offsets"""
+        end_frame = self.frames if end_frame is None else min(end_frame, self.frames)
+        start_frame = max(0, min(start_frame, end_frame))
+        return (self._data_offset + start_frame * self.frame_size,
+                self._data_offset + end_frame * self.frame_size)
+
+    def read(self, start_frame=0, end_frame=None):
+        """
+        Get a frame range without copying
+
+        Args:
+            start_frame: First frame
+            end_frame: Frame to stop at (None = end of file)
+
+        Returns:
+            memoryview: Raw PCM bytes of the range
+        """
+        start, end = self._byte_range(start_frame, end_frame)
+        return self._view[start:end]
+
+    def samples(self, start_frame=0, end_frame=None):
+        """
+        Get a frame range as int16 samples without copying
+
+        Args:
+            start_frame: First frame
+            end_frame: Frame to stop at (None = end of file)
+
+        Returns:
+            numpy.ndarray: Read-only interleaved int16 samples
+        """
+        return np.frombuffer(self.read(start_frame, end_frame), dtype='<i2')
+
+    def blocks(self, start_frame=0, end_frame=None, block_frames=4000):
+        """
+        Iterate over a frame range in fixed-size blocks
+
+        Args:
+            start_frame: First frame
+            end_frame: Frame to stop at (None = end of file)
+            block_frames: Frames per block (the last block may be shorter)
+
+        Yields:
+            tuple: (end_frame_of_block, memoryview of the block's bytes)
+        """
+        start, end = self._byte_range(start_frame, end_frame)
+        step = block_frames * self.frame_size
+
+        for offset in range(start, end, step):
+            stop = min(offset + step, end)
+            yield (stop - self._data_offset) // self.frame_size, self._view[offset:stop]
+
+    def close(self):
+        """Unmap the file"""
+        if self._mmap is None:
+            return
+
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Blocks still referenced elsewhere (e.g. VAD pre-roll);
+            # the mapping is released once they are garbage collected
+            pass
+        self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def accept_waveform(recognizer, block):
+    """
+    Feed a block to a recognizer without copying it
+
+    Vosk recognizers are called through cffi with a pointer into the block
+    (KaldiRecognizer.AcceptWaveform only takes bytes). For other recognizers
+    the first TypeError per type switches that type to a bytes() copy for
+    every later block.
+
+    Args:
+        recognizer: Object with an AcceptWaveform(data) method
+        block: bytes or memoryview of PCM audio
+
+    Returns:
+        bool: AcceptWaveform's return value
+    """
+    if _vosk_ffi is not None and isinstance(recognizer, vosk.KaldiRecognizer):
+        result = _vosk_c.vosk_recognizer_accept_waveform(
+            recognizer._handle, _vosk_ffi.from_buffer(block), memoryview(block).nbytes
+        )
+        if result < 0:
+            raise Exception("Failed to process waveform")
+        return result
+
+    if not isinstance(block, bytes):
+        kind = type(recognizer)
+        if kind not in _COPY_REQUIRED:
+            try:
+                return recognizer.AcceptWaveform(block)
+            except TypeError:
+                _COPY_REQUIRED.add(kind)
+        block = bytes(block)
+
+    return recognizer.AcceptWaveform(block)
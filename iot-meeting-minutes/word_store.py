@@ -0,0 +1,105 @@
+"""
+Word Store Module
+Compact columnar storage for word-level timing data (interned vocabulary
+plus typed arrays) instead of one dict per recognized word
+"""
+
+import math
+from array import array
+
+
+class WordStore:
+    """Append-only word timings; segments refer to (begin, end) index ranges"""
+
+    def __init__(self):
+        self._vocab = {}            # word -> id
+        self._words = []            # id -> word
+        self._ids = array('I')      # vocabulary id per word
+        self._start = array('d')    # seconds (NaN if the recognizer gave none)
+        self._end = array('d')
+        self._conf = array('f')
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _intern(self, word):
+        """Get the vocabulary id of a word, adding it if new"""
+        word_id = self._vocab.get(word)
+        if word_id is None:
+            word_id = len(self._words)
+            self._vocab[word] = word_id
+            self._words.append(word)
+        return word_id
+
+    def append(self, words):
+        """
+        Store a segment's words
+
+        Args:
+            words: List of Vosk word dictionaries (word, start, end, conf)
+
+        Returns:
+            tuple: (begin, end) index range of the stored words
+        """
+        begin = len(self._ids)
+        nan = float('nan')
+
+        for word in words or []:
+            self._ids.append(self._intern(word.get('word', '')))
+            self._start.append(float(word.get('start', nan)))
+            self._end.append(float(word.get('end', nan)))
+            self._conf.append(float(word.get('conf', nan)))
+
+        return begin, len(self._ids)
+
+    def slice(self, begin, end):
+        """
+        Rebuild the word dictionaries of a range
+
+        Args:
+            begin: First index
+            end: Index to stop at
+
+        Returns:
+            list: Word dictionaries in the recognizer's format
+        """
+        words = []
+        for i in range(begin, end):
+            word = {'word': self._words[self._ids[i]]}
+            for key, column in (('start', self._start), ('end', self._end), ('conf', self._conf)):
+                value = column[i]
+                if not math.isnan(value):
+                    # conf is stored as float32; trim the float noise
+                    word[key] = round(value, 6) if key == 'conf' else value
+            words.append(word)
+        return words
+
+    def columns(self, begin, end):
+        """
+        Get a range as separate columns
+
+        Args:
+            begin: First index
+            end: Index to stop at
+
+        Returns:
+            dict: word (list), start, end and conf (arrays)
+        """
+        return {
+            'word': [self._words[i] for i in self._ids[begin:end]],
+            'start': self._start[begin:end],
+            'end': self._end[begin:end],
+            'conf': self._conf[begin:end]
+        }
+
+    def memory_bytes(self):
+        """
+        Approximate memory held by the columns and vocabulary
+
+        Returns:
+            int: Bytes
+        """
+        columns = sum(column.itemsize * len(column)
+                      for column in (self._ids, self._start, self._end, self._conf))
+        vocabulary = sum(len(word) for word in self._words)
+        return columns + vocabulary
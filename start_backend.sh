@@ -216,7 +216,11 @@ start_server() {
         # Production mode with gunicorn
         echo -e "${GREEN}Starting with Gunicorn (production mode)...${NC}"
         echo ""
+        # One process (sessions live in memory), threads so open live
+        # transcript streams (SSE) don't block other requests
         gunicorn -w 1 \
+                 -k gthread \
+                 --threads 8 \
                  -b 0.0.0.0:5000 \
                  --timeout 120 \
                  --access-logfile - \